@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+# Testing against these bases is deterministic for every n < 3.3 * 10^24.
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Checks whether n is prime using the Miller-Rabin test.
+
+    Args:
+        n (int): the number to check.
+
+    Returns:
+        True if n is prime, False otherwise.
+
+    Complexity:
+        Best Case Complexity: O(1), when n is divisible by one of the small bases.
+        Worst Case Complexity: O(log(n)^3), when n is prime (each base needs a modular exponentiation).
+    """
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    # Write n - 1 as d * 2^s with d odd
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            # a is a witness that n is composite
+            return False
+    return True
+
+
+def next_prime(n: int) -> int:
+    """
+    Returns the smallest prime greater than or equal to n.
+
+    Args:
+        n (int): the lower bound for the prime.
+
+    Complexity:
+        Best Case Complexity: O(1), when n is small or divisible by a small base.
+        Worst Case Complexity: O(log(n)^4), primes are on average log(n) apart.
+    """
+    if n <= 2:
+        return 2
+    candidate = n if n % 2 == 1 else n + 1
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
@@ -0,0 +1,45 @@
+"""
+Membership test (`key in table`) cost of the open addressing tables, for keys
+that are in the table and for keys that are not.
+
+LinearProbeTable answers a miss by raising and catching a KeyError and walks
+the whole cluster first; CuckooTable looks at no more than its ways and stash.
+All tables use builtin_hash, so that the cost of hashing does not hide that of probing.
+
+Usage: python -m benchmarks.hash_table_membership [--n N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from data_structures.hash_functions import builtin_hash
+from data_structures.hash_table_cuckoo import CuckooTable
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.hash_table_robin_hood import RobinHoodTable
+
+
+def time_lookups(table, keys: list[str]) -> float:
+    """
+    Returns the average time of `key in table` over the keys, in nanoseconds.
+    """
+    start = time.perf_counter_ns()
+    for key in keys:
+        key in table
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000, help="Number of keys in each table.")
+    args = parser.parse_args()
+
+    present = [f"minecraft:block_{i}" for i in range(args.n)]
+    absent = [f"minecraft:item_{i}" for i in range(args.n)]
+    for name, table in (("linear", LinearProbeTable(hash_function=builtin_hash)),
+                        ("robin hood", RobinHoodTable(hash_function=builtin_hash)),
+                        ("cuckoo", CuckooTable(hash_function=builtin_hash)),
+                        ("cuckoo 3-way", CuckooTable(ways=3, max_load_factor=0.85, hash_function=builtin_hash))):
+        for key in present:
+            table[key] = True
+        print(f"{name:<12} hit={time_lookups(table, present):7.0f}ns  miss={time_lookups(table, absent):7.0f}ns")
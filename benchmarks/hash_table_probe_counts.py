@@ -0,0 +1,70 @@
+"""
+Average probe counts of LinearProbeTable under each probe sequence, for a few
+distributions of block names.
+
+Uses the default polynomial_string_hash, whose codes for names sharing a long prefix
+tend to land close together: that is where linear probing builds long clusters and
+quadratic or double hashing pays off. Each table is filled, then every key is looked
+up once and half the keys are deleted; the probes of each kind of operation are
+averaged with track_stats. Deletions use tombstones for every sequence, so that only
+the probing differs.
+
+Usage: python -m benchmarks.hash_table_probe_counts [--n N] [--names FILE]
+"""
+from __future__ import annotations
+
+import argparse
+
+from data_structures.hash_table_linear_probing import LinearProbeTable
+
+MATERIALS = ["oak", "spruce", "birch", "jungle", "acacia", "dark_oak", "mangrove", "cherry",
+             "stone", "cobblestone", "granite", "diorite", "andesite", "deepslate", "sandstone", "brick"]
+SHAPES = ["planks", "log", "wood", "stairs", "slab", "fence", "fence_gate", "door",
+          "trapdoor", "button", "pressure_plate", "wall", "sign", "leaves", "sapling", "block"]
+
+
+def block_names(n: int) -> dict[str, list[str]]:
+    """
+    The name distributions to compare, each of (up to) n distinct names.
+    """
+    variants = [f"minecraft:{material}_{shape}" for material in MATERIALS for shape in SHAPES]
+    return {
+        "sequential": [f"minecraft:block_{i}" for i in range(n)],
+        "material_shape": [f"{variants[i % len(variants)]}_{i // len(variants)}" for i in range(n)],
+        "namespaced": [f"mod{i % 37}:{MATERIALS[i % len(MATERIALS)]}_{i}" for i in range(n)],
+    }
+
+
+def probe_counts(probing: str, keys: list[str]) -> tuple[float, float, float, float]:
+    """
+    Returns the mean probes per set, get and delete, and the mean successful lookup length
+    after the deletions.
+    """
+    table = LinearProbeTable(probing=probing, deletion=LinearProbeTable.DELETE_TOMBSTONE, track_stats=True)
+    for key in keys:
+        table[key] = True
+    for key in keys:
+        table[key]
+    for key in keys[::2]:
+        del table[key]
+    stats = table.stats()
+    return stats.set_probes.mean, stats.get_probes.mean, stats.delete_probes.mean, stats.mean_probe_length
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50_000, help="Number of names in each distribution.")
+    parser.add_argument("--names", help="File of block names, one per line, benchmarked as an extra distribution.")
+    args = parser.parse_args()
+
+    distributions = block_names(args.n)
+    if args.names is not None:
+        with open(args.names) as file:
+            distributions[args.names] = list(dict.fromkeys(line.strip() for line in file if line.strip()))
+
+    for name, keys in distributions.items():
+        print(f"{name} ({len(keys)} keys)")
+        for probing in (LinearProbeTable.PROBE_LINEAR, LinearProbeTable.PROBE_QUADRATIC, LinearProbeTable.PROBE_DOUBLE):
+            set_mean, get_mean, delete_mean, lookup_mean = probe_counts(probing, keys)
+            print(f"  {probing:<10} set={set_mean:5.2f}  get={get_mean:5.2f}  "
+                  f"delete={delete_mean:5.2f}  lookup after deletes={lookup_mean:5.2f}")
@@ -0,0 +1,46 @@
+"""
+Insert latency of LinearProbeTable with and without incremental resizing.
+
+A full rehash moves every item inside the insert that crosses the load factor,
+so that single insert stalls for O(N). Incremental resizing spreads the move
+over the following operations. This reports the median, p99 and maximum
+latency of a single insert for both modes.
+
+Usage: python -m benchmarks.hash_table_resize_latency [--n N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from data_structures.hash_functions import integer_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+
+
+def insert_latencies(table: LinearProbeTable, n: int) -> list[int]:
+    """
+    Inserts n integer keys and returns the time taken by each insert, in nanoseconds.
+    """
+    latencies = []
+    for key in range(n):
+        start = time.perf_counter_ns()
+        table[key] = key
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def report(name: str, latencies: list[int]) -> None:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[int(len(ordered) * 0.99)]
+    print(f"{name:<12} total={sum(ordered) / 1e6:9.1f}ms  p50={p50 / 1e3:7.1f}us  "
+          f"p99={p99 / 1e3:7.1f}us  max={ordered[-1] / 1e3:10.1f}us")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000, help="Number of keys to insert.")
+    args = parser.parse_args()
+
+    report("full", insert_latencies(LinearProbeTable(hash_function=integer_hash), args.n))
+    report("incremental", insert_latencies(LinearProbeTable(hash_function=integer_hash, incremental=True), args.n))
@@ -0,0 +1,60 @@
+"""
+Throughput of ShardedHashTable under a thread pool, for increasing shard counts.
+
+Each worker runs a mix of reads, get_or_insert and update (counter increments)
+on random keys. One shard is the same as guarding a single table with a global
+lock; more shards mean fewer threads waiting on the same lock. How far this
+scales depends on the interpreter: with the GIL the threads still take turns
+running Python code, so expect the largest gains on a free-threaded build.
+
+Usage: python -m benchmarks.hash_table_sharded_throughput [--threads T] [--ops N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_structures.hash_functions import builtin_hash
+from data_structures.hash_table_sharded import ShardedHashTable
+
+KEY_COUNT = 10_000
+SHARD_COUNTS = (1, 4, 16, 64)
+
+
+def worker(table: ShardedHashTable, ops: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(ops):
+        key = f"block_{rng.randrange(KEY_COUNT)}"
+        r = rng.random()
+        if r < 0.6:
+            key in table
+        elif r < 0.8:
+            table.get_or_insert(key, 0)
+        else:
+            table.update(key, lambda count: count + 1, 0)
+
+
+def throughput(shard_count: int, threads: int, ops: int) -> float:
+    """
+    Runs ops operations on each of the threads and returns the operations per second.
+    """
+    table = ShardedHashTable(shard_count, hash_function=builtin_hash)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(worker, table, ops, seed) for seed in range(threads)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return threads * ops / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8, help="Number of worker threads.")
+    parser.add_argument("--ops", type=int, default=50_000, help="Operations per thread.")
+    args = parser.parse_args()
+
+    for shard_count in SHARD_COUNTS:
+        print(f"{shard_count:>3} shards: {throughput(shard_count, args.threads, args.ops):12,.0f} ops/s")
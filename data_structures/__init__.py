@@ -7,9 +7,19 @@ from data_structures.linked_stack import LinkedStack
 from data_structures.circular_queue import CircularQueue
 from data_structures.hash_table_linear_probing import LinearProbeTable
 from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.hash_table_robin_hood import RobinHoodTable
+from data_structures.hash_table_cuckoo import CuckooTable
+from data_structures.hash_table_sharded import ShardedHashTable
+from data_structures.hash_table_static import StaticHashTable
+from data_structures.lru_cache import LRUCache
 from data_structures.array_set import ArraySet
+from data_structures.hash_set import HashSet
+from data_structures.sorted_array_set import SortedArraySet
 from data_structures.bit_vector_set import BitVectorSet
+from data_structures.roaring_bitmap_set import RoaringBitmapSet
 from data_structures.array_sorted_list import ArraySortedList
 from data_structures.node import Node
 from data_structures.bst import BinarySearchTree
+from data_structures.avl_tree import AVLTree
 from data_structures.heap import MaxHeap
+from data_structures.indexed_priority_queue import IndexedPriorityQueue
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Callable, Generic, Iterable, Iterator, Sequence, TypeVar
+from data_structures.hash_functions import polynomial_string_hash
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -25,6 +26,24 @@ class HashTable(ABC, Generic[K, V]):
     def values(self) -> ArrayR[V]:
         pass
 
+    @abstractmethod
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs straight from the table's storage, without copying.
+        :raises RuntimeError: if a key is added or removed while iterating (changing values is allowed).
+        """
+        pass
+
+    def iter_keys(self) -> Iterator[K]:
+        """ Lazily yields the keys, see items. """
+        for key, _ in self.items():
+            yield key
+
+    def iter_values(self) -> Iterator[V]:
+        """ Lazily yields the values, see items. """
+        for _, value in self.items():
+            yield value
+
     @abstractmethod
     def __contains__(self, key: K) -> bool:
         pass
@@ -41,6 +60,71 @@ class HashTable(ABC, Generic[K, V]):
     def __delitem__(self, key: K) -> None:
         pass
 
+    def get_many(self, keys: Sequence[K], default: V = None) -> ArrayR[V]:
+        """
+        Looks up several keys at once.
+        :returns: an array with the value of each key, or default for the missing ones.
+        :complexity: that of len(keys) lookups.
+        """
+        res = ArrayR(len(keys))
+        for i in range(len(keys)):
+            res[i] = self[keys[i]] if keys[i] in self else default
+        return res
+
+    def set_many(self, pairs: Sequence[tuple[K, V]]) -> None:
+        """
+        Sets several (key, value) pairs at once. Tables override this to resize only once.
+        :complexity: that of len(pairs) inserts.
+        """
+        for key, data in pairs:
+            self[key] = data
+
+    def delete_many(self, keys: Iterable[K]) -> int:
+        """
+        Deletes several keys at once, skipping the ones that are missing.
+        :returns: the number of keys deleted.
+        :complexity: that of the deletes.
+        """
+        deleted = 0
+        for key in keys:
+            if key in self:
+                del self[key]
+                deleted += 1
+        return deleted
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[tuple[K, V]], *args, **kwargs) -> HashTable[K, V]:
+        """
+        Creates a table (passing on any other arguments to the constructor) holding the given pairs,
+        sized for all of them from the start.
+        :complexity: that of set_many.
+        """
+        table = cls(*args, **kwargs)
+        table.set_many(pairs)
+        return table
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        """
+        The function mapping keys to hash codes, see hash_functions.
+        polynomial_string_hash unless the table takes a hash_function argument.
+        """
+        return polynomial_string_hash
+
+    def freeze(self, hash_function: Callable[[K], int] = None) -> HashTable[K, V]:
+        """
+        Returns a read-only copy of the table as a StaticHashTable (a minimal perfect hash),
+        which looks at a single slot per lookup and has no empty slots.
+        :param hash_function: the hash function of the copy, see hash_functions.
+            None keeps the hash function of this table.
+        :complexity: O(N) expected where N is len(self).
+        """
+        # Imported here as StaticHashTable is itself a HashTable.
+        from data_structures.hash_table_static import StaticHashTable
+        if hash_function is None:
+            hash_function = self.hash_function
+        return StaticHashTable(self.items(), hash_function)
+
     @abstractmethod
     def is_empty(self) -> bool:
         return len(self) == 0
@@ -0,0 +1,125 @@
+""" AVL Tree.
+    Defines a self-balancing Binary Search Tree: after every insertion and
+    deletion the heights of the two subtrees of any node differ by at most one,
+    so every operation is O(log N).
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import TypeVar
+
+from data_structures.bst import BinarySearchTree
+from data_structures.node import AVLTreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class AVLTree(BinarySearchTree[K, I]):
+    """ Self-balancing binary search tree.
+        Unlike BinarySearchTree, setting an existing key updates its item.
+    """
+
+    def insert_aux(self, current: AVLTreeNode, key: K, item: I, current_depth: int) -> AVLTreeNode:
+        """
+            Inserts (or updates) a key in the subtree rooted at current and rebalances it.
+            Node depths are not maintained, as rotations would invalidate them.
+            :complexity: O(CompK * log(N)) where N is the number of elements in the tree
+        """
+        if current is None:  # base case: at the leaf
+            self.length += 1
+            return AVLTreeNode(key, item)
+        elif key < current.key:
+            current.left = self.insert_aux(current.left, key, item, current_depth + 1)
+        elif key > current.key:
+            current.right = self.insert_aux(current.right, key, item, current_depth + 1)
+        else:  # key == current.key
+            current.item = item
+            return current
+        return self.rebalance(current)
+
+    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
+        """
+            Deletes a key from the subtree rooted at current and rebalances it.
+            :complexity: O(CompK * log(N)) where N is the number of elements in the tree
+            :raises ValueError: if the key is not in the tree.
+        """
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+        elif key < current.key:
+            current.left = self.delete_aux(current.left, key)
+        elif key > current.key:
+            current.right = self.delete_aux(current.right, key)
+        else:  # we found our key => do actual deletion
+            if current.left is None:
+                self.length -= 1
+                return current.right
+            elif current.right is None:
+                self.length -= 1
+                return current.left
+
+            # general case => find a successor
+            succ = self.get_successor(current)
+            current.key = succ.key
+            current.item = succ.item
+            current.right = self.delete_aux(current.right, succ.key)
+
+        return self.rebalance(current)
+
+    @staticmethod
+    def get_height(current: AVLTreeNode) -> int:
+        """ Height of the subtree rooted at current, 0 for an empty one. """
+        if current is None:
+            return 0
+        return current.height
+
+    def get_balance(self, current: AVLTreeNode) -> int:
+        """ Height of the left subtree minus the height of the right subtree. """
+        return self.get_height(current.left) - self.get_height(current.right)
+
+    def update_height(self, current: AVLTreeNode) -> None:
+        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+
+    def rotate_left(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Rotates the subtree left, making the right child its new root.
+            :complexity: O(1)
+        """
+        new_root = current.right
+        current.right = new_root.left
+        new_root.left = current
+        self.update_height(current)
+        self.update_height(new_root)
+        return new_root
+
+    def rotate_right(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Rotates the subtree right, making the left child its new root.
+            :complexity: O(1)
+        """
+        new_root = current.left
+        current.left = new_root.right
+        new_root.right = current
+        self.update_height(current)
+        self.update_height(new_root)
+        return new_root
+
+    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Restores the AVL property at current, assuming both subtrees satisfy it.
+            :returns: the new root of the subtree.
+            :complexity: O(1)
+        """
+        self.update_height(current)
+        balance = self.get_balance(current)
+        if balance > 1:
+            if self.get_balance(current.left) < 0:
+                current.left = self.rotate_left(current.left)
+            return self.rotate_right(current)
+        if balance < -1:
+            if self.get_balance(current.right) > 0:
+                current.right = self.rotate_right(current.right)
+            return self.rotate_left(current)
+        return current
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Iterator
 from data_structures.abstract_set import Set
 from data_structures.referential_array import ArrayR
 
@@ -7,12 +8,30 @@ class BitVectorSet(Set[int]):
     A bit-vector implementation of the set ADT. The set is represented
     as an integer. The element is present in the set if and only if the
     corresponding bit of the integer is 1.
+
+    Bit i stands for element base + i, so the smallest element the set can hold
+    is its base: 1 by default, 0 or a negative number for ids that start there.
+    Sets with different bases can be combined; the result of a union takes the smaller base.
+
+    Sizes and iteration only cost in proportion to the number of elements
+    (plus a small amount per CHUNK_BITS bits of the integer), not to the largest element.
     """
 
-    def __init__(self):
+    # Iteration splits the integer into chunks of this many bits and skips the empty ones.
+    CHUNK_BITS = 1024
+
+    def __init__(self, base: int = 1):
+        """
+        :param base: the smallest element the set can hold.
+        """
         Set.__init__(self)
+        self.__base = base
         self.__elems = 0
 
+    @property
+    def base(self) -> int:
+        return self.__base
+
     def clear(self) -> None:
         """ Makes the set empty. """
         self.__elems = 0
@@ -20,68 +39,151 @@ class BitVectorSet(Set[int]):
     def is_empty(self) -> bool:
         """ True if the set is empty. """
         return self.__elems == 0
-    
+
+    def __bit(self, item: int) -> int:
+        """
+        Position of the bit for an item.
+        :raises TypeError: if the item is not an integer no smaller than the base.
+        """
+        if not isinstance(item, int) or item < self.__base:
+            raise TypeError(f'Set elements should be integers no smaller than {self.__base}.')
+        return item - self.__base
+
     def values(self) -> ArrayR[int]:
         """
-        Returns the elements of the set as an array.
+        Returns the elements of the set as an array, in increasing order.
+        :complexity: see __iter__.
         """
         res = ArrayR(len(self))
         count = 0
-        for item in range(1, int.bit_length(self.__elems) + 1):
-            if item in self:
-                res[count] = item
-                count += 1
+        for item in self:
+            res[count] = item
+            count += 1
         return res
 
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yields the elements of the set in increasing order. The set should not be changed meanwhile.
+        The integer is cut into chunks of CHUNK_BITS bits in one pass; within a
+        non-empty chunk, x & -x isolates the lowest set bit, which is yielded and cleared.
+        :complexity: O(B/CHUNK_BITS + N) where B is the bit length and N the number of elements.
+        """
+        chunk_bytes = self.CHUNK_BITS // 8
+        data = self.__elems.to_bytes((self.__elems.bit_length() + 7) // 8, 'little')
+        for start in range(0, len(data), chunk_bytes):
+            chunk = int.from_bytes(data[start:start + chunk_bytes], 'little')
+            # Bit i of the chunk stands for element offset + i.
+            offset = start * 8 + self.__base
+            while chunk:
+                lowest = chunk & -chunk
+                yield offset + lowest.bit_length() - 1
+                chunk ^= lowest
+
     def __contains__(self, item: int) -> bool:
         """
         True if the set contains the item. False otherwise.
-        :raises TypeError: if the item is not a positive integer.
+        :raises TypeError: if the item is not an integer no smaller than the base.
         """
-        if not isinstance(item, int) or item <= 0:
-            raise TypeError('Set elements should be positive integers.')
-        return (self.__elems >> (item - 1)) & 1 == 1
+        return (self.__elems >> self.__bit(item)) & 1 == 1
 
     def __len__(self) -> int:
         """
-        Size computation. The most expensive operation.
-        Use int.bit_length(your_integer) to calculate the bit length.
+        Size computation, a population count of the integer.
+        :complexity: O(B) where B is the bit length, done in C a machine word at a time.
         """
-        res = 0
-        for item in range(1, int.bit_length(self.__elems) + 1):
-            if item in self:
-                res += 1
-        return res
+        return self.__elems.bit_count()
 
     def add(self, item: int) -> None:
         """
         Adds an element to the set.
-        :raises TypeError: if the item is not a positive integer.
+        :raises TypeError: if the item is not an integer no smaller than the base.
         """
-        if not isinstance(item, int) or item <= 0:
-            raise TypeError('Set elements should be positive integers.')
-        self.__elems |= 1 << (item - 1)
+        self.__elems |= 1 << self.__bit(item)
+
+    def add_all(self, items: ArrayR[int]) -> None:
+        """
+        Adds every element of an array. The new bits are set in a byte buffer and
+        turned into an integer once, rather than rebuilding the integer per element.
+        No element is added if any of them is invalid.
+        :raises TypeError: if an item is not an integer no smaller than the base.
+        :complexity: O(N + B) where N is the number of items and B the largest bit position.
+        """
+        largest = -1
+        for i in range(len(items)):
+            largest = max(largest, self.__bit(items[i]))
+        if largest < 0:
+            return
+        data = bytearray(largest // 8 + 1)
+        for i in range(len(items)):
+            bit = items[i] - self.__base
+            data[bit >> 3] |= 1 << (bit & 7)
+        self.__elems |= int.from_bytes(data, 'little')
 
     def remove(self, item: int) -> None:
         """
         Removes an element from the set.
-        :raises TypeError: if the item is not a positive integer.
+        :raises TypeError: if the item is not an integer no smaller than the base.
         :raises KeyError: if the item is not in the set.
         """
-        if not isinstance(item, int) or item <= 0:
-            raise TypeError('Set elements should be positive integers.')
         if item in self:
-            self.__elems ^= 1 << (item - 1)
+            self.__elems ^= 1 << (item - self.__base)
         else:
             raise KeyError(item)
 
+    def rank(self, item: int) -> int:
+        """
+        Number of elements no larger than item (which need not be in the set, nor be above the base).
+        The mask is only built below the largest element, so it is never wider than the set.
+        :complexity: O(B) where B is the bit length of the set, done in C.
+        """
+        if item < self.__base:
+            return 0
+        bit = item - self.__base
+        if bit >= self.__elems.bit_length():
+            return len(self)
+        return (self.__elems & ((2 << bit) - 1)).bit_count()
+
+    def select(self, index: int) -> int:
+        """
+        The element at index in increasing order, so that select(rank(x) - 1) == x for every element x.
+        Whole chunks are skipped by their population count.
+        :raises IndexError: if index is not in [0, len(self)).
+        :complexity: O(B/CHUNK_BITS + CHUNK_BITS) where B is the bit length.
+        """
+        if index < 0:
+            raise IndexError("Select index out of range.")
+        chunk_bytes = self.CHUNK_BITS // 8
+        data = self.__elems.to_bytes((self.__elems.bit_length() + 7) // 8, 'little')
+        for start in range(0, len(data), chunk_bytes):
+            chunk = int.from_bytes(data[start:start + chunk_bytes], 'little')
+            count = chunk.bit_count()
+            if index < count:
+                for _ in range(index):
+                    chunk &= chunk - 1
+                return start * 8 + self.__base + (chunk & -chunk).bit_length() - 1
+            index -= count
+        raise IndexError("Select index out of range.")
+
+    def __aligned(self, base: int) -> int:
+        """
+        The integer of this set for a set with the given base, dropping the elements below it.
+        """
+        shift = self.__base - base
+        return self.__elems << shift if shift >= 0 else self.__elems >> -shift
+
+    def __rebase(self, base: int) -> None:
+        """ Lowers the base of this set, so that it can hold elements down to base. """
+        if base < self.__base:
+            self.__elems = self.__aligned(base)
+            self.__base = base
+
     def union(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
         """
         Creates the union of the set with another one.
         The result set should contain all elements in self and other.
         """
-        res = BitVectorSet()
-        res.__elems = self.__elems | other.__elems
+        res = BitVectorSet(min(self.__base, other.__base))
+        res.__elems = self.__aligned(res.__base) | other.__aligned(res.__base)
         return res
 
     def intersection(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
@@ -90,8 +192,8 @@ class BitVectorSet(Set[int]):
         The result set should contain the elements that are both in
         self and other.
         """
-        res = BitVectorSet()
-        res.__elems = self.__elems & other.__elems
+        res = BitVectorSet(self.__base)
+        res.__elems = self.__elems & other.__aligned(self.__base)
         return res
 
     def difference(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
@@ -100,18 +202,45 @@ class BitVectorSet(Set[int]):
         The result set should contain the elements that are in self
         but not in the other. I.e. self - other.
         """
-        res = BitVectorSet()
-        res.__elems = self.__elems & ~other.__elems
+        res = BitVectorSet(self.__base)
+        res.__elems = self.__elems & ~other.__aligned(self.__base)
+        return res
+
+    def symmetric_difference(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """
+        Creates the symmetric difference of the set with another one:
+        the elements that are in exactly one of self and other.
+        """
+        res = BitVectorSet(min(self.__base, other.__base))
+        res.__elems = self.__aligned(res.__base) ^ other.__aligned(res.__base)
         return res
 
+    def __xor__(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """ Magic method alias for symmetric_difference """
+        return self.symmetric_difference(other)
+
+    def __ior__(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """ In-place union, lowering the base of self if other has a smaller one. """
+        self.__rebase(other.__base)
+        self.__elems |= other.__aligned(self.__base)
+        return self
+
+    def __iand__(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """ In-place intersection. """
+        self.__elems &= other.__aligned(self.__base)
+        return self
+
+    def __isub__(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """ In-place difference. """
+        self.__elems &= ~other.__aligned(self.__base)
+        return self
+
+    def __ixor__(self, other: BitVectorSet[int]) -> BitVectorSet[int]:
+        """ In-place symmetric difference, lowering the base of self if other has a smaller one. """
+        self.__rebase(other.__base)
+        self.__elems ^= other.__aligned(self.__base)
+        return self
+
     def __str__(self):
         """ Construct a nice string representation. """
-        bit_elems = self.__elems
-        out_elems = []
-        current = 0
-        while bit_elems:
-            if bit_elems & (1 << current):
-                out_elems.append(str(current+1))
-                bit_elems &= ~(1 << current)
-            current += 1
-        return '{' + ', '.join(out_elems) + '}'
+        return '{' + ', '.join(str(item) for item in self) + '}'
@@ -0,0 +1,74 @@
+""" Hash functions (hash strategies) for the hash tables.
+
+Each function maps a key to a non-negative hash code that does not depend on
+any table size; the tables reduce it modulo their own size. Pick one per
+table instance through the table's hash_function argument:
+    - polynomial_string_hash: the original universal hash over the characters of a string, O(len(key)).
+    - builtin_hash:           Python's hash(), for any hashable key. O(1) for ints and (cached) strings.
+    - integer_hash:           mixes the bits of an integer key, O(1).
+    - tuple_hash:             combines the hashes of the elements of a tuple key, O(len(key)).
+
+Note that Python salts hash() of strings per process, so builtin_hash (and tuple_hash
+of tuples containing strings) gives different codes across runs.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+HASH_BASE = 31
+# Mersenne prime 2^61 - 1
+HASH_MODULUS = (1 << 61) - 1
+MASK_64 = (1 << 64) - 1
+TUPLE_MULTIPLIER = 1000003
+
+
+def polynomial_string_hash(key: str) -> int:
+    """
+    Universal polynomial hash over the characters of a string.
+    :complexity: O(len(key))
+    """
+    value = 0
+    a = 31415
+    for char in key:
+        value = (ord(char) + a * value) % HASH_MODULUS
+        a = a * HASH_BASE % (HASH_MODULUS - 1)
+    return value
+
+
+def builtin_hash(key: object) -> int:
+    """
+    Python's built-in hash, made non-negative.
+    :complexity: O(1) for ints and strings (after the first call), see hash() otherwise.
+    """
+    return hash(key) & MASK_64
+
+
+def integer_hash(key: int) -> int:
+    """
+    Mixes the bits of an integer (the splitmix64 finaliser), so that
+    consecutive or strided keys spread over the whole table.
+    :complexity: O(1)
+    """
+    x = key & MASK_64
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & MASK_64
+    return x ^ (x >> 31)
+
+
+def tuple_hash(key: tuple) -> int:
+    """
+    Combines the hashes of the elements of a tuple. Integers are mixed with
+    integer_hash, nested tuples are hashed recursively and anything else
+    uses builtin_hash.
+    :complexity: O(len(key)) for tuples of ints and strings.
+    """
+    value = len(key)
+    for element in key:
+        if isinstance(element, int):
+            element_code = integer_hash(element)
+        elif isinstance(element, tuple):
+            element_code = tuple_hash(element)
+        else:
+            element_code = builtin_hash(element)
+        value = ((value * TUPLE_MULTIPLIER) ^ element_code) & MASK_64
+    return integer_hash(value)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from typing import Callable, Iterator
+from data_structures.abstract_set import Set, T
+from data_structures.hash_functions import builtin_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR
+
+
+class HashSet(Set[T]):
+    """
+    Hash-based implementation of the set ADT.
+    The elements are the keys of a LinearProbeTable (with no meaningful values),
+    so membership is O(1) on average and the set grows as needed instead of
+    having a fixed capacity.
+
+    Unless stated otherwise, all methods have O(1) average complexity,
+    on top of that of the hash function.
+    """
+
+    def __init__(self, hash_function: Callable[[T], int] = builtin_hash) -> None:
+        """
+        :param hash_function: maps an element to a non-negative hash code, see hash_functions.
+            The default suits any hashable element; polynomial_string_hash is a good choice for strings.
+        """
+        Set.__init__(self)
+        self.__hash_function = hash_function
+        self.__table = LinearProbeTable(hash_function=hash_function)
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return len(self.__table)
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return self.__table.is_empty()
+
+    def __contains__(self, item: T) -> bool:
+        """ True if the set contains the item. """
+        return item in self.__table
+
+    def clear(self) -> None:
+        """ Makes the set empty. """
+        self.__table = LinearProbeTable(hash_function=self.__hash_function)
+
+    def add(self, item: T) -> None:
+        """
+        Adds an element to the set, if it is not already there.
+        :complexity: O(1) amortised, the table being rehashed as it fills up.
+        """
+        self.__table[item] = True
+
+    def remove(self, item: T) -> None:
+        """
+        Removes an element from the set.
+        :raises KeyError: if no such element is found.
+        """
+        del self.__table[item]
+
+    def values(self) -> ArrayR[T]:
+        """
+        Returns the elements of the set as an array.
+        :complexity: O(M) where M is the table size.
+        """
+        return self.__table.keys()
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        Lazily yields the elements of the set.
+        :raises RuntimeError: if the set gains or loses an element meanwhile.
+        :complexity: O(M) over the whole iteration where M is the table size.
+        """
+        return self.__table.iter_keys()
+
+    def union(self, other: Set[T]) -> HashSet[T]:
+        """
+        Creates a new set equal to the union of this set and the other one.
+        :complexity: O(N + M) where N and M are the sizes of the two sets.
+        """
+        res = HashSet(self.__hash_function)
+        for item in self:
+            res.add(item)
+        for item in other.values():
+            res.add(item)
+        return res
+
+    def intersection(self, other: Set[T]) -> HashSet[T]:
+        """
+        The intersection of this set with the other one.
+        When the other set is a HashSet too, the smaller set is scanned and the larger one probed.
+        :complexity: O(min(N, M)) for two HashSets, else O(N * contains(other)).
+        """
+        smaller, larger = self, other
+        if isinstance(other, HashSet) and len(other) < len(self):
+            smaller, larger = other, self
+        res = HashSet(self.__hash_function)
+        for item in smaller:
+            if item in larger:
+                res.add(item)
+        return res
+
+    def difference(self, other: Set[T]) -> HashSet[T]:
+        """
+        Creates the result of self - other.
+        :complexity: O(N * contains(other)) where N is the size of this set, O(N) for a HashSet.
+        """
+        res = HashSet(self.__hash_function)
+        for item in self:
+            if item not in other:
+                res.add(item)
+        return res
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set. """
+        elems = []
+        for item in self:
+            elems.append(str(item) if type(item) != str else f"'{item}'")
+        return '{' + ', '.join(elems) + '}'
@@ -8,8 +8,10 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar
+from typing import Iterator, TypeVar
 
+from data_structures.hash_functions import polynomial_string_hash
+from data_structures.hash_table_sizes import HASH_TABLE_SIZES, next_table_size
 from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
@@ -20,33 +22,64 @@ class FullError(Exception):
     pass
 
 
+# Marks a slot whose item was deleted in tombstone mode.
+# Probing continues past it, but inserting may reuse it.
+DELETED = object()
+
+
 class LinearProbeTable:
     """
     Linear Probe Table.
 
     Type Arguments:
         - K:    Key Type. In most cases should be string.
-                Otherwise `hash` should be overwritten.
+                Otherwise `hash_code` should be overwritten.
         - V:    Value Type.
 
+    Each slot stores a (key, value, hash code) triple. The hash code does not depend on the
+    table size, so it is only reduced modulo the current size when probing, compared before
+    the keys themselves, and reused as-is when the table is rehashed.
+
+    Deletion strategies:
+        - DELETE_REINSERT:  remove the item and reinsert the rest of its cluster (default).
+        - DELETE_TOMBSTONE: leave a tombstone behind, which later inserts can reuse.
+                            The table is compacted once tombstones exceed MAX_TOMBSTONE_RATIO of it.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
-    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151,
-                   12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
+    TABLE_SIZES = HASH_TABLE_SIZES
 
-    HASH_BASE = 31
+    DELETE_REINSERT = 'reinsert'
+    DELETE_TOMBSTONE = 'tombstone'
+    MAX_TOMBSTONE_RATIO = 0.25
 
-    def __init__(self, sizes=None) -> None:
+    def __init__(self, sizes=None, deletion: str = DELETE_REINSERT) -> None:
         """
         Initialise the Hash Table.
+
+        :param sizes: overrides TABLE_SIZES.
+        :param deletion: the deletion strategy, DELETE_REINSERT or DELETE_TOMBSTONE.
+        :raises ValueError: if the deletion strategy is unknown.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
-        self.size_index = 0
-        self.array: ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        if deletion not in (self.DELETE_REINSERT, self.DELETE_TOMBSTONE):
+            raise ValueError(f"Unknown deletion strategy: {deletion}")
+        self.deletion = deletion
+        self.array: ArrayR[tuple[K, V, int]] = ArrayR(self.TABLE_SIZES[0])
         self.count = 0
+        self.tombstones = 0
+        # Number of keys added or removed so far, so iterations can detect them.
+        self.modifications = 0
+
+    def hash_code(self, key: K) -> int:
+        """
+        Full hash code of a key, independent of the table size, see polynomial_string_hash.
+
+        :complexity: O(len(key))
+        """
+        return polynomial_string_hash(key)
 
     def hash(self, key: K) -> int:
         """
@@ -54,13 +87,7 @@ class LinearProbeTable:
 
         :complexity: O(len(key))
         """
-
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.hash_code(key) % self.table_size
 
     @property
     def table_size(self) -> int:
@@ -72,32 +99,40 @@ class LinearProbeTable:
         """
         return self.count
 
-    def _linear_probe(self, key: K, is_insert: bool) -> int:
+    def _linear_probe(self, key: K, code: int, is_insert: bool) -> int:
         """
         Find the correct position for this key in the hash table using linear probing.
-        :complexity best: O(hash(key)) first position is empty
-        :complexity worst: O(hash(key) + N*comp(K)) when we've searched the entire table
+        :param code: the hash code of the key, keys are only compared when the codes match.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
                         where N is the tablesize
+        When inserting a new key, the first tombstone found along the way is reused.
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
         # Initial position
-        position = self.hash(key)
+        position = code % self.table_size
+        first_deleted = None
 
         for _ in range(self.table_size):
             if self.array[position] is None:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
-                    return position
+                    return position if first_deleted is None else first_deleted
                 else:
                     raise KeyError(key)
-            elif self.array[position][0] == key:
+            elif self.array[position] is DELETED:
+                # The key may still be further along, keep probing.
+                if first_deleted is None:
+                    first_deleted = position
+            elif self.array[position][2] == code and self.array[position][0] == key:
                 return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+            # Taken by something else. Time to linear probe.
+            position = (position + 1) % self.table_size
 
-        if is_insert:
+        if is_insert and first_deleted is not None:
+            return first_deleted
+        elif is_insert:
             raise FullError("Table is full!")
         else:
             raise KeyError(key)
@@ -110,7 +145,7 @@ class LinearProbeTable:
         """
         res = []
         for x in range(self.table_size):
-            if self.array[x] is not None:
+            if self.array[x] is not None and self.array[x] is not DELETED:
                 res.append(self.array[x][0])
         return res
 
@@ -122,10 +157,24 @@ class LinearProbeTable:
         """
         res = []
         for x in range(self.table_size):
-            if self.array[x] is not None:
+            if self.array[x] is not None and self.array[x] is not DELETED:
                 res.append(self.array[x][1])
         return res
 
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs, reading the array directly.
+
+        :raises RuntimeError: if a key is added or removed while iterating.
+        :complexity: O(N) over the whole iteration where N is self.table_size.
+        """
+        modifications = self.modifications
+        for x in range(self.table_size):
+            if self.array[x] is not None and self.array[x] is not DELETED:
+                yield self.array[x][0], self.array[x][1]
+                if self.modifications != modifications:
+                    raise RuntimeError("Hash table changed size during iteration.")
+
     def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
@@ -146,7 +195,7 @@ class LinearProbeTable:
         :complexity: See linear probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        position = self._linear_probe(key, self.hash_code(key), False)
         return self.array[position][1]
 
     def __setitem__(self, key: K, data: V) -> None:
@@ -157,12 +206,18 @@ class LinearProbeTable:
         :raises FullError: when the table cannot be resized further.
         """
 
-        position = self._linear_probe(key, True)
+        code = self.hash_code(key)
+        position = self._linear_probe(key, code, True)
 
         if self.array[position] is None:
             self.count += 1
+            self.modifications += 1
+        elif self.array[position] is DELETED:
+            self.count += 1
+            self.modifications += 1
+            self.tombstones -= 1
 
-        self.array[position] = (key, data)
+        self.array[position] = (key, data, code)
 
         if len(self) > self.table_size / 2:
             self._rehash()
@@ -173,20 +228,30 @@ class LinearProbeTable:
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
         :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+            With DELETE_TOMBSTONE the worst case is that of linear probe (plus an amortised compaction).
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
+        position = self._linear_probe(key, self.hash_code(key), False)
+        self.count -= 1
+        self.modifications += 1
+        if self.deletion == self.DELETE_TOMBSTONE:
+            self.array[position] = DELETED
+            self.tombstones += 1
+            if self.tombstones > self.table_size * self.MAX_TOMBSTONE_RATIO:
+                # Too many tombstones make probing slow, rebuild without them.
+                self._resize(self.table_size)
+            return
+
         # Remove the element
         self.array[position] = None
-        self.count -= 1
         # Start moving over the cluster
         position = (position + 1) % self.table_size
         while self.array[position] is not None:
-            key2, value = self.array[position]
+            item = self.array[position]
             self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            # Reinsert, reusing the stored hash code.
+            newpos = self._linear_probe(item[0], item[2], True)
+            self.array[newpos] = item
             position = (position + 1) % self.table_size
 
     def is_empty(self) -> bool:
@@ -197,23 +262,31 @@ class LinearProbeTable:
 
     def _rehash(self) -> None:
         """
-        Need to resize table and reinsert all values
+        Need to resize table and reinsert all values.
+        TABLE_SIZES gives the first sizes, after which the table size keeps roughly doubling.
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
         Where N is len(self)
         """
+        self._resize(next_table_size(self.table_size, self.TABLE_SIZES))
+
+    def _resize(self, new_size: int) -> None:
+        """
+        Reinsert all values into a new array of the given size, dropping any tombstones.
+        Keys are known to be unique and their hash codes are stored, so neither
+        hashing nor key comparisons are needed.
+        :complexity: See _rehash.
+        """
         old_array = self.array
-        self.size_index += 1
-        if self.size_index >= len(self.TABLE_SIZES):
-            # Cannot be resized further.
-            return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
+        self.array = ArrayR(new_size)
+        self.tombstones = 0
         for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+            if item is not None and item is not DELETED:
+                position = item[2] % new_size
+                while self.array[position] is not None:
+                    position = (position + 1) % new_size
+                self.array[position] = item
 
     def __str__(self) -> str:
         """
@@ -223,7 +296,7 @@ class LinearProbeTable:
         """
         result = ""
         for item in self.array:
-            if item is not None:
-                (key, value) = item
+            if item is not None and item is not DELETED:
+                (key, value, _) = item
                 result += "(" + str(key) + "," + str(value) + ")\n"
         return result
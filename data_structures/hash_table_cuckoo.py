@@ -0,0 +1,347 @@
+from __future__ import annotations
+from typing import Callable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.array_list import ArrayList
+from data_structures.hash_functions import HASH_MODULUS, integer_hash, polynomial_string_hash
+from data_structures.hash_table_sizes import HASH_TABLE_SIZES, next_table_size
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class CuckooTable(HashTable[K, V]):
+    """
+    Cuckoo Table.
+    Defines a Hash Table using cuckoo hashing: every key may only live in one of
+    `ways` slots, one per sub-table, so a lookup checks at most ways + stash size slots.
+
+    The hash code of a key (from the hash function chosen per instance, see hash_functions)
+    is computed once and stored. Each sub-table derives its own position from that code with
+    a universal hash (a * code + b) mod p, drawing a and b from the current seed, which
+    gives `ways` independent hash functions.
+
+    An insert whose slots are all taken evicts the item in one of them, which moves to its
+    slot in the next sub-table, possibly evicting another item, and so on for at most
+    MAX_KICKS moves. An item still homeless after that goes to a small stash. When the stash
+    is full as well, the table is rebuilt with new seeds, growing once reseeding keeps failing.
+    Growing also doubles the stash, so that keys sharing a whole hash code (which no seed
+    can separate) make lookups slower instead of making the table grow forever.
+
+    Keys, values and hash codes are kept in parallel arrays: the slots of sub-table i
+    are [i * size, (i + 1) * size), followed by the stash slots.
+
+    Type Arguments:
+        - K:    Key Type. Must suit the hash function, str for the default one.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Initial size sequence (of each sub-table), larger sizes are generated on demand.
+    TABLE_SIZES = HASH_TABLE_SIZES
+    DEFAULT_WAYS = 2
+    # Two-way cuckoo hashing stops working reliably above a load factor of 1/2.
+    DEFAULT_MAX_LOAD_FACTOR = 0.45
+    MAX_KICKS = 64
+    STASH_SIZE = 4
+    # Number of failed reseeds at one size before the table (and stash) grows instead.
+    MAX_RESEEDS = 4
+
+    def __init__(self, sizes = None, ways: int = DEFAULT_WAYS,
+                 max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR,
+                 hash_function: Callable[[K], int] = polynomial_string_hash) -> None:
+        """
+        :param sizes: overrides TABLE_SIZES.
+        :param ways: number of sub-tables, and so of hash functions and candidate slots per key.
+        :param max_load_factor: the table grows once len(self) / table_size would exceed this.
+            Up to about 0.85 works well with 3 ways.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :raises ValueError: if there are fewer than 2 ways or the max load factor is not between 0 and 1.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        if ways < 2:
+            raise ValueError("Cuckoo hashing needs at least 2 ways.")
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Max load factor should be between 0 and 1.")
+
+        self.__ways = ways
+        self.__max_load_factor = max_load_factor
+        self.__hash_function = hash_function
+        self.__length = 0
+        self.__modifications = 0
+        self.__seed = 0
+        self.__stash_size = self.STASH_SIZE
+        self.__allocate(self.TABLE_SIZES[0])
+
+    def __allocate(self, size: int) -> None:
+        """
+        Creates empty sub-tables of the given size, an empty stash and the hash parameters for the current seed.
+        :complexity: O(ways * size)
+        """
+        self.__size = size
+        self.__keys: ArrayR[K] = ArrayR(self.__ways * size + self.__stash_size)
+        self.__values: ArrayR[V] = ArrayR(self.__ways * size + self.__stash_size)
+        self.__codes: ArrayR[int] = ArrayR(self.__ways * size + self.__stash_size)
+        self.__stash_length = 0
+        # (a, b) for each sub-table; a tuple as it is read on every lookup and never changes.
+        self.__parameters = tuple((integer_hash(2 * (self.__seed * self.__ways + way)) % (HASH_MODULUS - 1) + 1,
+                                   integer_hash(2 * (self.__seed * self.__ways + way) + 1) % HASH_MODULUS)
+                                  for way in range(self.__ways))
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def hash_code(self, key: K) -> int:
+        """
+        Full hash code of a key, independent of the table size and seeds.
+        :complexity: that of the hash function, O(len(key)) for the default polynomial string hash.
+        """
+        return self.__hash_function(key)
+
+    def __position(self, code: int, way: int) -> int:
+        """
+        Slot of a hash code in the given sub-table.
+        """
+        a, b = self.__parameters[way]
+        return way * self.__size + (a * code + b) % HASH_MODULUS % self.__size
+
+    @property
+    def table_size(self) -> int:
+        """ Number of slots in all sub-tables, not counting the stash. """
+        return self.__ways * self.__size
+
+    @property
+    def stash_length(self) -> int:
+        return self.__stash_length
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def __find(self, key: K, code: int) -> int:
+        """
+        Find the slot of this key, or -1 if it is not in the table.
+        :complexity: O((ways + S) * comp(K)) where S is the number of stashed items.
+        """
+        size = self.__size
+        start = 0
+        for a, b in self.__parameters:
+            position = start + (a * code + b) % HASH_MODULUS % size
+            if self.__codes[position] == code and self.__keys[position] == key:
+                return position
+            start += size
+        stash_start = self.table_size
+        for position in range(stash_start, stash_start + self.__stash_length):
+            if self.__codes[position] == code and self.__keys[position] == key:
+                return position
+        return -1
+
+    def __place(self, key: K, data: V, code: int) -> tuple[K, V, int] | None:
+        """
+        Insert an item known not to be in the table, kicking out other items as needed.
+        :returns: None if every item found a slot, otherwise the item left homeless,
+            which is not necessarily the one being inserted.
+        :complexity: O(ways + MAX_KICKS)
+        """
+        for way in range(self.__ways):
+            position = self.__position(code, way)
+            if self.__codes[position] is None:
+                self.__store(position, key, data, code)
+                return None
+
+        way = 0
+        for _ in range(self.MAX_KICKS):
+            position = self.__position(code, way)
+            # Swap the item in with the occupant, which moves on to its slot in the next sub-table.
+            key, self.__keys[position] = self.__keys[position], key
+            data, self.__values[position] = self.__values[position], data
+            code, self.__codes[position] = self.__codes[position], code
+            way = (position // self.__size + 1) % self.__ways
+            for _ in range(self.__ways - 1):
+                position = self.__position(code, way)
+                if self.__codes[position] is None:
+                    self.__store(position, key, data, code)
+                    return None
+                way = (way + 1) % self.__ways
+            way = (way + 1) % self.__ways
+
+        if self.__stash_length < self.__stash_size:
+            self.__store(self.table_size + self.__stash_length, key, data, code)
+            self.__stash_length += 1
+            return None
+        return key, data, code
+
+    def __store(self, position: int, key: K, data: V, code: int) -> None:
+        self.__keys[position] = key
+        self.__values[position] = data
+        self.__codes[position] = code
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                res[i] = self.__keys[x]
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                res[i] = self.__values[x]
+                i += 1
+        return res
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs, reading the arrays directly.
+        :raises RuntimeError: if a key is added or removed while iterating.
+        :complexity: O(N) over the whole iteration where N is the table size.
+        """
+        modifications = self.__modifications
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                yield self.__keys[x], self.__values[x]
+                if self.__modifications != modifications:
+                    raise RuntimeError("Hash table changed size during iteration.")
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See find.
+        """
+        return self.__find(key, self.hash_code(key)) >= 0
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :complexity: See find.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_code(key))
+        if position < 0:
+            raise KeyError(key)
+        return self.__values[position]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+        :complexity: O(ways + MAX_KICKS) expected, plus an amortised rebuild.
+        """
+        code = self.hash_code(key)
+        position = self.__find(key, code)
+        if position >= 0:
+            self.__values[position] = data
+            return
+
+        if self.__length + 1 > self.table_size * self.__max_load_factor:
+            self.__rebuild(next_table_size(self.__size, self.TABLE_SIZES))
+        homeless = self.__place(key, data, code)
+        self.__length += 1
+        self.__modifications += 1
+        if homeless is not None:
+            self.__rebuild(self.__size, homeless)
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+        Freeing a slot may let a stashed item move back into the sub-tables.
+        :complexity: O(S * ways) plus that of find, where S is the number of stashed items.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_code(key))
+        if position < 0:
+            raise KeyError(key)
+
+        self.__store(position, None, None, None)
+        self.__length -= 1
+        self.__modifications += 1
+        stash_start = self.table_size
+        if position >= stash_start:
+            # Keep the stash packed at its start.
+            last = stash_start + self.__stash_length - 1
+            self.__store(position, self.__keys[last], self.__values[last], self.__codes[last])
+            self.__store(last, None, None, None)
+            self.__stash_length -= 1
+        else:
+            self.__unstash()
+
+    def __unstash(self) -> None:
+        """
+        Move stashed items whose slots have been freed back into the sub-tables.
+        :complexity: O(S * ways) where S is the number of stashed items.
+        """
+        stash_start = self.table_size
+        i = stash_start
+        while i < stash_start + self.__stash_length:
+            code = self.__codes[i]
+            for way in range(self.__ways):
+                position = self.__position(code, way)
+                if self.__codes[position] is None:
+                    self.__store(position, self.__keys[i], self.__values[i], code)
+                    last = stash_start + self.__stash_length - 1
+                    self.__store(i, self.__keys[last], self.__values[last], self.__codes[last])
+                    self.__store(last, None, None, None)
+                    self.__stash_length -= 1
+                    break
+            else:
+                i += 1
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __rebuild(self, size: int, extra: tuple[K, V, int] = None) -> None:
+        """
+        Reinsert all items (and the extra homeless one, if any) using their stored
+        hash codes into sub-tables of the given size with new seeds.
+        Grows the table and the stash whenever MAX_RESEEDS seeds in a row fail to place every item.
+        :complexity: O(N) expected where N is len(self).
+        """
+        items = ArrayList(self.__length)
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                items.append((self.__keys[x], self.__values[x], self.__codes[x]))
+        if extra is not None:
+            items.append(extra)
+
+        attempts = 0
+        while True:
+            self.__seed += 1
+            self.__allocate(size)
+            for key, data, code in items:
+                if self.__place(key, data, code) is not None:
+                    break
+            else:
+                return
+            attempts += 1
+            if attempts == self.MAX_RESEEDS:
+                size = next_table_size(size, self.TABLE_SIZES)
+                self.__stash_size *= 2
+                attempts = 0
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                result += "(" + str(self.__keys[x]) + "," + str(self.__values[x]) + ")\n"
+        return result
@@ -1,50 +1,272 @@
 from __future__ import annotations
-from typing import TypeVar
+import time
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
 from data_structures.abstract_hash_table import HashTable
+from data_structures.array_list import ArrayList
+from data_structures.hash_functions import polynomial_string_hash
+from data_structures.hash_table_sizes import HASH_TABLE_SIZES, next_table_size
+from data_structures.hash_table_stats import HashTableStats, ProbeCounter, histogram
 from data_structures.referential_array import ArrayR
 
+K = TypeVar('K')
 V = TypeVar('V')
 
+# Marks a slot whose item was deleted in tombstone mode.
+# Probing continues past it, but inserting may reuse it.
+_DELETED = object()
 
-class LinearProbeTable(HashTable[str, V]):
+
+def _is_occupied(slots: _TupleSlots | _ParallelSlots, position: int) -> bool:
+    """ True if the slot at position holds an item (it is neither empty nor a tombstone). """
+    code = slots.code(position)
+    return code is not None and code is not _DELETED
+
+
+class _TupleSlots:
+    """
+    Tuple layout: every slot of a single array holds a (key, value, hash code) tuple.
+    Updating a value allocates a new tuple.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.__array = ArrayR(size)
+
+    def __len__(self) -> int:
+        return len(self.__array)
+
+    def code(self, position: int) -> int | None:
+        """
+        Returns the hash code stored at position,
+        None if the slot is empty or _DELETED if it holds a tombstone.
+        """
+        item = self.__array[position]
+        if item is None or item is _DELETED:
+            return item
+        return item[2]
+
+    def key(self, position: int) -> K:
+        return self.__array[position][0]
+
+    def value(self, position: int) -> V:
+        return self.__array[position][1]
+
+    def store(self, position: int, key: K, value: V, code: int) -> None:
+        self.__array[position] = (key, value, code)
+
+    def set_value(self, position: int, value: V) -> None:
+        item = self.__array[position]
+        self.__array[position] = (item[0], value, item[2])
+
+    def clear(self, position: int) -> None:
+        self.__array[position] = None
+
+    def mark_deleted(self, position: int) -> None:
+        self.__array[position] = _DELETED
+
+    def move(self, position: int, other: _TupleSlots, other_position: int) -> None:
+        """ Copies the entry at position into other_position of other, reusing its tuple. """
+        other.__array[other_position] = self.__array[position]
+
+
+class _ParallelSlots:
+    """
+    Parallel-array layout: keys, values and hash codes live in three separate arrays.
+    Updating a value is a single write and no tuple is allocated per entry.
+    The codes array doubles as the slot marker (None when empty, _DELETED for a tombstone).
+    """
+
+    def __init__(self, size: int) -> None:
+        self.__keys = ArrayR(size)
+        self.__values = ArrayR(size)
+        self.__codes = ArrayR(size)
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+    def code(self, position: int) -> int | None:
+        """
+        Returns the hash code stored at position,
+        None if the slot is empty or _DELETED if it holds a tombstone.
+        """
+        return self.__codes[position]
+
+    def key(self, position: int) -> K:
+        return self.__keys[position]
+
+    def value(self, position: int) -> V:
+        return self.__values[position]
+
+    def store(self, position: int, key: K, value: V, code: int) -> None:
+        self.__keys[position] = key
+        self.__values[position] = value
+        self.__codes[position] = code
+
+    def set_value(self, position: int, value: V) -> None:
+        self.__values[position] = value
+
+    def clear(self, position: int) -> None:
+        self.__keys[position] = None
+        self.__values[position] = None
+        self.__codes[position] = None
+
+    def mark_deleted(self, position: int) -> None:
+        self.__keys[position] = None
+        self.__values[position] = None
+        self.__codes[position] = _DELETED
+
+    def move(self, position: int, other: _ParallelSlots, other_position: int) -> None:
+        """ Copies the entry at position into other_position of other. """
+        other.__keys[other_position] = self.__keys[position]
+        other.__values[other_position] = self.__values[position]
+        other.__codes[other_position] = self.__codes[position]
+
+
+class LinearProbeTable(HashTable[K, V]):
     """
     Linear Probe Table.
-    Defines a Hash Table using Linear Probing for conflict resolution.
-    If you want to use this with a different key type, you should override the hash function.
-    
+    Defines a Hash Table using open addressing for conflict resolution, with linear probing by default.
+    Keys are hashed by a hash function chosen per instance (see hash_functions),
+    the polynomial string hash by default. Subclasses may also override hash_code.
+
+    Each slot stores a key, its value and its hash code. The hash code does not depend on the
+    table size, so it is only reduced modulo the current size when probing, compared before
+    the keys themselves, and reused as-is when the table is rehashed.
+
+    Two storage layouts are available:
+        - LAYOUT_TUPLE:     one array of (key, value, hash code) tuples (default).
+        - LAYOUT_PARALLEL:  separate arrays of keys, values and hash codes.
+
+    Three probe sequences are available, starting from the home slot h = code % size:
+        - PROBE_LINEAR:     h, h + 1, h + 2, ... (default).
+        - PROBE_QUADRATIC:  h, h + 1, h + 4, h + 9, ... which breaks up primary clusters.
+                            The table is kept at most half full, so with a prime table size
+                            an insert always reaches a free slot.
+        - PROBE_DOUBLE:     h, h + s, h + 2s, ... with a step s in [1, size) taken from the rest of the
+                            hash code, so keys sharing a home slot follow different sequences.
+                            Reaches every slot when the table size is prime.
+
+    Two deletion strategies are available:
+        - DELETE_REINSERT:  remove the item and reinsert the rest of its cluster.
+                            The default for linear probing, which it requires.
+        - DELETE_TOMBSTONE: leave a tombstone behind, which later inserts can reuse.
+                            The table is compacted once tombstones exceed MAX_TOMBSTONE_RATIO of it.
+                            The default, and only choice, for the other probe sequences.
+
+    With incremental resizing, growing the table does not move every item at once.
+    The old slots are kept next to the new ones and every following insert or delete
+    migrates MIGRATION_STEP old slots, while lookups consult both until migration is done.
+    This bounds the cost of any single insert instead of stalling for O(N) on a rehash.
+
+    stats() reports the load factor, probe lengths, cluster sizes and rehash costs.
+    With track_stats, the table also counts the probes made by every get, set and delete.
+
     Type Arguments:
+        - K:    Key Type. Must suit the hash function, str for the default one.
         - V:    Value Type.
 
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
-    # No test case should exceed 1 million entries.
-    TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
-    HASH_BASE = 31
+    # Initial size sequence, larger sizes are generated on demand.
+    TABLE_SIZES = HASH_TABLE_SIZES
+
+    PROBE_LINEAR = 'linear'
+    PROBE_QUADRATIC = 'quadratic'
+    PROBE_DOUBLE = 'double'
 
-    def __init__(self, sizes = None) -> None:
+    DELETE_REINSERT = 'reinsert'
+    DELETE_TOMBSTONE = 'tombstone'
+    MAX_TOMBSTONE_RATIO = 0.25
+
+    LAYOUT_TUPLE = 'tuple'
+    LAYOUT_PARALLEL = 'parallel'
+
+    # Old slots migrated per insert/delete while resizing incrementally.
+    # Sizes roughly double, so 2 per operation would only just finish before the next resize is due; 4 leaves a margin.
+    MIGRATION_STEP = 4
+
+    def __init__(self, sizes = None, deletion: str = None, layout: str = LAYOUT_TUPLE,
+                 hash_function: Callable[[K], int] = polynomial_string_hash, incremental: bool = False,
+                 track_stats: bool = False, probing: str = PROBE_LINEAR) -> None:
+        """
+        :param sizes: overrides TABLE_SIZES.
+        :param deletion: the deletion strategy, DELETE_REINSERT or DELETE_TOMBSTONE.
+            None picks DELETE_REINSERT for linear probing and DELETE_TOMBSTONE otherwise.
+        :param layout: the storage layout, LAYOUT_TUPLE or LAYOUT_PARALLEL.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :param incremental: whether to migrate items to a resized table a few at a time.
+        :param track_stats: whether to count the probes made by each get, set and delete.
+        :param probing: the probe sequence, PROBE_LINEAR, PROBE_QUADRATIC or PROBE_DOUBLE.
+            The last two rely on prime table sizes, as in TABLE_SIZES.
+        :raises ValueError: if the probe sequence, deletion strategy or layout is unknown,
+            or DELETE_REINSERT is asked for without linear probing.
+        """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        if probing not in (self.PROBE_LINEAR, self.PROBE_QUADRATIC, self.PROBE_DOUBLE):
+            raise ValueError(f"Unknown probe sequence: {probing}")
+        if deletion is None:
+            deletion = self.DELETE_REINSERT if probing == self.PROBE_LINEAR else self.DELETE_TOMBSTONE
+        if deletion not in (self.DELETE_REINSERT, self.DELETE_TOMBSTONE):
+            raise ValueError(f"Unknown deletion strategy: {deletion}")
+        if deletion == self.DELETE_REINSERT and probing != self.PROBE_LINEAR:
+            # Reinserting the rest of a run of consecutive slots only works if probing walks that run.
+            raise ValueError("Only linear probing supports DELETE_REINSERT.")
+        if layout == self.LAYOUT_TUPLE:
+            self.__slot_class = _TupleSlots
+        elif layout == self.LAYOUT_PARALLEL:
+            self.__slot_class = _ParallelSlots
+        else:
+            raise ValueError(f"Unknown storage layout: {layout}")
 
-        self.__size_index = 0
-        self.__array: ArrayR[tuple[str, V]] = ArrayR(self.TABLE_SIZES[self.__size_index])
+        self.__deletion = deletion
+        self.__probing = probing
+        self.__hash_function = hash_function
+        self.__incremental = incremental
+        self.__slots = self.__slot_class(self.TABLE_SIZES[0])
         self.__length = 0
+        self.__modifications = 0
+        self.__tombstones = 0
+
+        # Slots still being migrated when resizing incrementally, None otherwise.
+        # Migrated and deleted items leave tombstones behind so the remaining items stay reachable.
+        self.__old_slots = None
+        self.__old_length = 0
+        self.__migrate_position = 0
+
+        self.__rehash_count = 0
+        self.__rehash_time = 0.0
+        # Probe counters stay None unless tracked, so counting costs a single check per operation.
+        self.__get_probes = ProbeCounter() if track_stats else None
+        self.__set_probes = ProbeCounter() if track_stats else None
+        self.__delete_probes = ProbeCounter() if track_stats else None
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def hash_code(self, key: K) -> int:
+        """
+        Full hash code of a key, independent of the table size.
+        :complexity: that of the hash function, O(len(key)) for the default polynomial string hash.
+        """
+        return self.__hash_function(key)
 
-    def hash(self, key: str) -> int:
+    def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
-        :complexity: O(len(key))
+        :complexity: See hash_code.
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
-        return value
+        return self.hash_code(key) % self.table_size
 
     @property
     def table_size(self) -> int:
-        return len(self.__array)
+        return len(self.__slots)
+
+    @property
+    def is_migrating(self) -> bool:
+        """ Whether an incremental resize is in progress. """
+        return self.__old_slots is not None
 
     def __len__(self) -> int:
         """
@@ -52,47 +274,116 @@ class LinearProbeTable(HashTable[str, V]):
         """
         return self.__length
 
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+    def __probe_step(self, code: int, size: int) -> tuple[int, int]:
         """
-        Find the correct position for this key in the hash table using linear probing.
-        :complexity best: O(hash(key)) first position is empty
-        :complexity worst: O(hash(key) + N*comp(str)) when we've searched the entire table
+        The first step of the probe sequence of a hash code, and how much the step grows by after each probe.
+        """
+        if self.__probing == self.PROBE_LINEAR:
+            return 1, 0
+        if self.__probing == self.PROBE_QUADRATIC:
+            # Steps 1, 3, 5, ... add up to the squares.
+            return 1, 2
+        return 1 + (code // size) % max(size - 1, 1), 0
+
+    def __free_position(self, slots: _TupleSlots | _ParallelSlots, code: int) -> int:
+        """
+        First position along the probe sequence of a hash code that holds no item (it may hold a tombstone).
+        :complexity: O(P) where P is the number of probes.
+        :raises RuntimeError: if the probe sequence never reaches such a slot.
+        """
+        size = len(slots)
+        position = code % size
+        step, growth = self.__probe_step(code, size)
+        for _ in range(size):
+            if not _is_occupied(slots, position):
+                return position
+            position = (position + step) % size
+            step += growth
+        raise RuntimeError("Table is full!")
+
+    def __probe_length(self, code: int, target: int, size: int) -> int:
+        """
+        Number of probes the probe sequence of a hash code takes to reach the target position.
+        :complexity: O(P) where P is the result.
+        """
+        position = code % size
+        step, growth = self.__probe_step(code, size)
+        probes = 1
+        while position != target:
+            position = (position + step) % size
+            step += growth
+            probes += 1
+        return probes
+
+    def __probe(self, slots: _TupleSlots | _ParallelSlots, key: K, code: int, is_insert: bool,
+                counter: ProbeCounter = None) -> int:
+        """
+        Find the correct position for this key in the given slots, following its probe sequence.
+        :param code: the hash code of the key, keys are only compared when the codes match.
+        :param counter: if given, the number of slots looked at is added to its probes.
+        :returns: the position of the key. If the key is not there, the position to insert it
+            at when is_insert is True, or -1 otherwise.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
                         where N is the tablesize
-        :raises KeyError: When the key is not in the table, but is_insert is False.
+        When inserting a new key, the first tombstone found along the way is reused.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        size = len(slots)
         # Initial position
-        position = self.hash(key)
-
-        for _ in range(self.table_size):
-            if self.__array[position] is None:
+        position = code % size
+        step, growth = self.__probe_step(code, size)
+        first_deleted = None
+
+        for probes in range(1, size + 1):
+            slot_code = slots.code(position)
+            if slot_code is None:
+                if counter is not None:
+                    counter.probes += probes
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
-                    return position
+                    return position if first_deleted is None else first_deleted
                 else:
-                    raise KeyError(key)
-            elif self.__array[position][0] == key:
+                    return -1
+            elif slot_code is _DELETED:
+                # The key may still be further along, keep probing.
+                if first_deleted is None:
+                    first_deleted = position
+            elif slot_code == code and slots.key(position) == key:
+                if counter is not None:
+                    counter.probes += probes
                 return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
-
-        if is_insert:
+            # Taken by something else. Time to probe the next slot in the sequence.
+            position = (position + step) % size
+            step += growth
+
+        if counter is not None:
+            counter.probes += size
+        if is_insert and first_deleted is not None:
+            return first_deleted
+        elif is_insert:
             raise RuntimeError("Table is full!")
         else:
-            raise KeyError(key)
+            return -1
+
+    def __active_slots(self) -> tuple:
+        """ The slots currently holding items: the current ones, plus the old ones while migrating. """
+        if self.__old_slots is None:
+            return (self.__slots,)
+        return (self.__slots, self.__old_slots)
 
-    def keys(self) -> ArrayR[str]:
+    def keys(self) -> ArrayR[K]:
         """
         Returns all keys in the hash table.
         :complexity: O(N) where N is the number of items in the table.
         """
         res = ArrayR(self.__length)
         i = 0
-        for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][0]
-                i += 1
+        for slots in self.__active_slots():
+            for x in range(len(slots)):
+                if _is_occupied(slots, x):
+                    res[i] = slots.key(x)
+                    i += 1
         return res
 
     def values(self) -> ArrayR[V]:
@@ -103,17 +394,32 @@ class LinearProbeTable(HashTable[str, V]):
         """
         res = ArrayR(self.__length)
         i = 0
-        for x in range(self.table_size):
-            if self.__array[x] is not None:
-                res[i] = self.__array[x][1]
-                i += 1
+        for slots in self.__active_slots():
+            for x in range(len(slots)):
+                if _is_occupied(slots, x):
+                    res[i] = slots.value(x)
+                    i += 1
         return res
 
-    def __contains__(self, key: str) -> bool:
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs, reading the slots directly.
+        :raises RuntimeError: if a key is added or removed, or items are moved, while iterating.
+        :complexity: O(M) over the whole iteration where M is the table size.
+        """
+        modifications = self.__modifications
+        for slots in self.__active_slots():
+            for x in range(len(slots)):
+                if _is_occupied(slots, x):
+                    yield slots.key(x), slots.value(x)
+                    if self.__modifications != modifications:
+                        raise RuntimeError("Hash table changed size during iteration.")
+
+    def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
 
-        :complexity: See linear probe.
+        :complexity: See probe.
         """
         try:
             _ = self[key]
@@ -122,54 +428,120 @@ class LinearProbeTable(HashTable[str, V]):
         else:
             return True
 
-    def __getitem__(self, key: str) -> V:
+    def __getitem__(self, key: K) -> V:
         """
         Get the value at a certain key
 
-        :complexity: See linear probe.
+        :complexity: See probe.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        return self.__array[position][1]
-
-    def __setitem__(self, key: str, data: V) -> None:
+        code = self.hash_code(key)
+        if self.__get_probes is not None:
+            self.__get_probes.operations += 1
+        position = self.__probe(self.__slots, key, code, False, self.__get_probes)
+        if position >= 0:
+            return self.__slots.value(position)
+        if self.__old_slots is not None:
+            position = self.__probe(self.__old_slots, key, code, False, self.__get_probes)
+            if position >= 0:
+                return self.__old_slots.value(position)
+        raise KeyError(key)
+
+    def __setitem__(self, key: K, data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
 
-        :complexity: See linear probe.
+        :complexity: See probe.
         :raises FullError: when the table cannot be resized further.
         """
 
-        position = self.__linear_probe(key, True)
+        code = self.hash_code(key)
+        if self.__set_probes is not None:
+            self.__set_probes.operations += 1
+        position = self.__probe(self.__slots, key, code, True, self.__set_probes)
+        slot_code = self.__slots.code(position)
 
-        if self.__array[position] is None:
-            self.__length += 1
-
-        self.__array[position] = (key, data)
+        if slot_code is not None and slot_code is not _DELETED:
+            # Existing key, only the value changes.
+            self.__slots.set_value(position, data)
+            return
 
-        if len(self) > self.table_size / 2:
+        if self.__old_slots is not None:
+            old_position = self.__probe(self.__old_slots, key, code, False, self.__set_probes)
+            if old_position >= 0:
+                # Not migrated yet, update it where it is. No migration step either,
+                # so that updating values never moves items under an iteration.
+                self.__old_slots.set_value(old_position, data)
+                return
+
+        if slot_code is _DELETED:
+            self.__tombstones -= 1
+        self.__slots.store(position, key, data, code)
+        self.__length += 1
+        self.__modifications += 1
+
+        if self.__old_slots is not None:
+            self.__migrate(self.MIGRATION_STEP)
+        if len(self) - self.__old_length > self.table_size / 2:
             self.__rehash()
 
-    def __delitem__(self, key: str) -> None:
+    def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(str)) deleting item is midway through large chain.
+        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+            With DELETE_TOMBSTONE the worst case is that of probe (plus an amortised compaction).
         :raises KeyError: when the key doesn't exist.
         """
-        position = self.__linear_probe(key, False)
-        # Remove the element
-        self.__array[position] = None
+        code = self.hash_code(key)
+        if self.__delete_probes is not None:
+            self.__delete_probes.operations += 1
+        position = self.__probe(self.__slots, key, code, False, self.__delete_probes)
+        if position < 0 and self.__old_slots is not None:
+            old_position = self.__probe(self.__old_slots, key, code, False, self.__delete_probes)
+            if old_position >= 0:
+                self.__old_slots.mark_deleted(old_position)
+                self.__old_length -= 1
+                self.__length -= 1
+                self.__modifications += 1
+                self.__migrate(self.MIGRATION_STEP)
+                return
+        if position < 0:
+            raise KeyError(key)
+
         self.__length -= 1
+        self.__modifications += 1
+        if self.__deletion == self.DELETE_TOMBSTONE:
+            self.__slots.mark_deleted(position)
+            self.__tombstones += 1
+            if self.__tombstones > self.table_size * self.MAX_TOMBSTONE_RATIO:
+                # Too many tombstones make probing slow, rebuild without them.
+                self.__resize(self.table_size)
+        else:
+            self.__delete_and_reinsert_cluster(position)
+
+        if self.__old_slots is not None:
+            self.__migrate(self.MIGRATION_STEP)
+
+    def __delete_and_reinsert_cluster(self, position: int) -> None:
+        """
+        Empties the slot at position and moves the rest of its cluster back where needed.
+        :complexity best: O(1) the next slot is empty.
+        :complexity worst: O(N^2*comp(K)) deleting item is midway through large chain.
+        """
+        # Remove the element
+        self.__slots.clear(position)
         # Start moving over the cluster
         position = (position + 1) % self.table_size
-        while self.__array[position] is not None:
-            key2, value = self.__array[position]
-            self.__array[position] = None
-            # Reinsert.
-            newpos = self.__linear_probe(key2, True)
-            self.__array[newpos] = (key2, value)
+        while self.__slots.code(position) is not None:
+            # Reinsert, reusing the stored hash code.
+            # The probe stops at the item itself unless an earlier slot has been freed.
+            newpos = self.__probe(self.__slots, self.__slots.key(position), self.__slots.code(position), True,
+                                         self.__delete_probes)
+            if newpos != position:
+                self.__slots.move(position, self.__slots, newpos)
+                self.__slots.clear(position)
             position = (position + 1) % self.table_size
 
     def is_empty(self) -> bool:
@@ -177,23 +549,238 @@ class LinearProbeTable(HashTable[str, V]):
 
     def __rehash(self) -> None:
         """
-        Need to resize table and reinsert all values
+        Need to resize table and reinsert all values.
+        TABLE_SIZES gives the first sizes, after which the table size keeps roughly doubling.
+        In incremental mode the items are only moved by later operations, see migrate.
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
+        :complexity best: O(N) No probing.
+        :complexity worst: O(N^2) Lots of probing.
         Where N is len(self)
         """
-        old_array = self.__array
-        self.__size_index += 1
-        if self.__size_index == len(self.TABLE_SIZES):
-            # Cannot be resized further.
+        new_size = next_table_size(self.table_size, self.TABLE_SIZES)
+        if not self.__incremental:
+            self.__resize(new_size)
             return
-        self.__array = ArrayR(self.TABLE_SIZES[self.__size_index])
-        self.__length = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+
+        if self.__old_slots is not None:
+            # The previous resize has not finished, complete it first.
+            self.__migrate(len(self.__old_slots))
+        start = time.perf_counter()
+        self.__old_slots = self.__slots
+        self.__old_length = self.__length
+        self.__migrate_position = 0
+        self.__slots = self.__slot_class(new_size)
+        self.__tombstones = 0
+        self.__rehash_count += 1
+        self.__rehash_time += time.perf_counter() - start
+
+    def __presize(self, capacity: int) -> None:
+        """
+        Makes room for capacity items in one go: finishes any incremental resize,
+        then resizes once to the first size that holds them within the load factor.
+        :complexity: O(N + M) where N is len(self) and M the new table size, O(1) when there is room already.
+        """
+        if self.__old_slots is not None:
+            self.__migrate(len(self.__old_slots))
+        new_size = self.table_size
+        while capacity > new_size / 2:
+            new_size = next_table_size(new_size, self.TABLE_SIZES)
+        if new_size != self.table_size:
+            self.__resize(new_size)
+
+    def get_many(self, keys: Sequence[K], default: V = None) -> ArrayR[V]:
+        """
+        Looks up several keys at once, without raising for the missing ones.
+        :returns: an array with the value of each key, or default for the missing ones.
+        :complexity: See probe, once per key.
+        """
+        res = ArrayR(len(keys))
+        for i in range(len(keys)):
+            key = keys[i]
+            code = self.hash_code(key)
+            if self.__get_probes is not None:
+                self.__get_probes.operations += 1
+            value = default
+            position = self.__probe(self.__slots, key, code, False, self.__get_probes)
+            if position >= 0:
+                value = self.__slots.value(position)
+            elif self.__old_slots is not None:
+                position = self.__probe(self.__old_slots, key, code, False, self.__get_probes)
+                if position >= 0:
+                    value = self.__old_slots.value(position)
+            res[i] = value
+        return res
+
+    def set_many(self, pairs: Sequence[tuple[K, V]]) -> None:
+        """
+        Sets several (key, value) pairs at once. The table is resized (at most) once,
+        at the first new key, for the case where every remaining key is new; the inserts
+        themselves never resize. A batch that only updates values never moves items,
+        as for setitem, so an iteration in progress carries on.
+        :complexity: O(N + M) for the resize (see presize), then see probe, once per pair.
+        """
+        presized = False
+        for i, (key, data) in enumerate(pairs):
+            code = self.hash_code(key)
+            if self.__set_probes is not None:
+                self.__set_probes.operations += 1
+            position = self.__probe(self.__slots, key, code, True, self.__set_probes)
+            slot_code = self.__slots.code(position)
+            if slot_code is not None and slot_code is not _DELETED:
+                self.__slots.set_value(position, data)
+                continue
+            if not presized:
+                if self.__old_slots is not None:
+                    old_position = self.__probe(self.__old_slots, key, code, False, self.__set_probes)
+                    if old_position >= 0:
+                        self.__old_slots.set_value(old_position, data)
+                        continue
+                self.__presize(self.__length + len(pairs) - i)
+                presized = True
+                # The slots may have been rebuilt, probe again.
+                position = self.__probe(self.__slots, key, code, True, self.__set_probes)
+                slot_code = self.__slots.code(position)
+            if slot_code is _DELETED:
+                self.__tombstones -= 1
+            self.__slots.store(position, key, data, code)
+            self.__length += 1
+            self.__modifications += 1
+
+    def delete_many(self, keys: Iterable[K]) -> int:
+        """
+        Deletes several keys at once, skipping the ones that are missing.
+        Any incremental resize is finished at the first key found, so a batch of
+        missing keys leaves the table (and any iteration in progress) alone.
+        With DELETE_TOMBSTONE, the table is compacted (at most) once, at the end.
+        :returns: the number of keys deleted.
+        :complexity: See delitem, once per key.
+        """
+        deleted = 0
+        for key in keys:
+            if self.__delete_probes is not None:
+                self.__delete_probes.operations += 1
+            code = self.hash_code(key)
+            position = self.__probe(self.__slots, key, code, False, self.__delete_probes)
+            if self.__old_slots is not None:
+                if position < 0 and self.__probe(self.__old_slots, key, code, False, self.__delete_probes) < 0:
+                    continue
+                # A key to delete: finish the incremental resize, so that every key is in the current slots.
+                self.__migrate(len(self.__old_slots))
+                position = self.__probe(self.__slots, key, code, False, self.__delete_probes)
+            if position < 0:
+                continue
+            if self.__deletion == self.DELETE_TOMBSTONE:
+                self.__slots.mark_deleted(position)
+                self.__tombstones += 1
+            else:
+                self.__delete_and_reinsert_cluster(position)
+            self.__length -= 1
+            self.__modifications += 1
+            deleted += 1
+
+        if deleted > 0 and self.__tombstones > self.table_size * self.MAX_TOMBSTONE_RATIO:
+            self.__resize(self.table_size)
+        return deleted
+
+    def __resize(self, new_size: int) -> None:
+        """
+        Reinsert all values into new slots of the given size, dropping any tombstones.
+        Keys are known to be unique and their hash codes are stored, so neither
+        hashing nor key comparisons are needed.
+        Items still in the old slots of an incremental resize are left where they are.
+        :complexity: See rehash.
+        """
+        start = time.perf_counter()
+        # Items move, so any iteration in progress must stop.
+        self.__modifications += 1
+        old_slots = self.__slots
+        self.__slots = self.__slot_class(new_size)
+        self.__tombstones = 0
+        for old_position in range(len(old_slots)):
+            code = old_slots.code(old_position)
+            if code is not None and code is not _DELETED:
+                position = self.__free_position(self.__slots, code)
+                old_slots.move(old_position, self.__slots, position)
+        self.__rehash_count += 1
+        self.__rehash_time += time.perf_counter() - start
+
+    def __migrate(self, steps: int) -> None:
+        """
+        Move the items in the next `steps` old slots into the current slots.
+        Each moved item leaves a tombstone so the items after it can still be found.
+        Once every old slot has been visited, the old slots are dropped.
+        :complexity: O(steps) on average, each item lands after a short probe.
+        """
+        start = time.perf_counter()
+        # Items move, so any iteration in progress must stop.
+        self.__modifications += 1
+        old_slots = self.__old_slots
+        end = min(len(old_slots), self.__migrate_position + steps)
+        for old_position in range(self.__migrate_position, end):
+            code = old_slots.code(old_position)
+            if code is not None and code is not _DELETED:
+                position = self.__free_position(self.__slots, code)
+                if self.__slots.code(position) is _DELETED:
+                    self.__tombstones -= 1
+                old_slots.move(old_position, self.__slots, position)
+                old_slots.mark_deleted(old_position)
+                self.__old_length -= 1
+        self.__migrate_position = end
+
+        if end == len(old_slots):
+            self.__old_slots = None
+            self.__old_length = 0
+        self.__rehash_time += time.perf_counter() - start
+
+    def stats(self) -> HashTableStats:
+        """
+        Returns a snapshot of the load factor, probe lengths, cluster sizes and rehash costs.
+        Probe lengths cover the items of both slot arrays while migrating,
+        clusters (runs of consecutive used slots) only the current slots.
+        Tombstones count as part of a cluster, since probing has to step over them.
+        :complexity: O(M + P) where M is the table size and P the total probe length.
+        """
+        total_probe_length = 0
+        max_probe_length = 0
+        for slots in self.__active_slots():
+            size = len(slots)
+            for x in range(size):
+                if _is_occupied(slots, x):
+                    probe_length = self.__probe_length(slots.code(x), x, size)
+                    total_probe_length += probe_length
+                    max_probe_length = max(max_probe_length, probe_length)
+
+        return HashTableStats(self.__length, self.table_size, total_probe_length, max_probe_length,
+                              self.__rehash_count, self.__rehash_time,
+                              cluster_histogram=histogram(self.__cluster_sizes()),
+                              get_probes=self.__get_probes, set_probes=self.__set_probes,
+                              delete_probes=self.__delete_probes)
+
+    def __cluster_sizes(self) -> ArrayList[int]:
+        """
+        Sizes of the runs of consecutive non-empty slots, wrapping around the end of the table.
+        :complexity: O(M) where M is the table size.
+        """
+        sizes = ArrayList()
+        size = self.table_size
+        # Start right after an empty slot so that no cluster is split by the wrap around.
+        start = 0
+        while start < size and self.__slots.code(start) is not None:
+            start += 1
+        if start == size:
+            # No empty slot at all, the whole table is one cluster.
+            sizes.append(size)
+            return sizes
+
+        run = 0
+        for i in range(1, size + 1):
+            if self.__slots.code((start + i) % size) is None:
+                if run > 0:
+                    sizes.append(run)
+                run = 0
+            else:
+                run += 1
+        return sizes
 
     def __str__(self) -> str:
         """
@@ -202,8 +789,8 @@ class LinearProbeTable(HashTable[str, V]):
         :complexity: O(N * (str(key) + str(value))) where N is the table size
         """
         result = ""
-        for item in self.__array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for slots in self.__active_slots():
+            for x in range(len(slots)):
+                if _is_occupied(slots, x):
+                    result += "(" + str(slots.key(x)) + "," + str(slots.value(x)) + ")\n"
         return result
@@ -0,0 +1,269 @@
+from __future__ import annotations
+from typing import Callable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import polynomial_string_hash
+from data_structures.hash_table_sizes import HASH_TABLE_SIZES, next_table_size
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class RobinHoodTable(HashTable[K, V]):
+    """
+    Robin Hood Table.
+    Defines a Hash Table using linear probing with Robin Hood displacement for conflict resolution.
+    Keys are hashed by a hash function chosen per instance (see hash_functions),
+    the polynomial string hash by default. Subclasses may also override hash_code.
+
+    Every slot remembers how far it is from its home position (its probe distance).
+    An insert that reaches a slot whose item is closer to home ("richer") than the
+    item being inserted takes that slot and carries on inserting the displaced item.
+    This keeps probe distances short and even, which means:
+        - an unsuccessful search stops as soon as it meets an item richer than the key would be,
+        - the table can run at a much higher load factor than LinearProbeTable,
+        - deletion shifts the following items back one slot instead of leaving tombstones.
+
+    Keys, values, hash codes and probe distances are kept in parallel arrays.
+    An empty slot has a probe distance of None.
+
+    Type Arguments:
+        - K:    Key Type. Must suit the hash function, str for the default one.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    TABLE_SIZES = HASH_TABLE_SIZES
+    DEFAULT_MAX_LOAD_FACTOR = 0.85
+
+    def __init__(self, sizes = None, max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR,
+                 hash_function: Callable[[K], int] = polynomial_string_hash) -> None:
+        """
+        :param sizes: overrides TABLE_SIZES.
+        :param max_load_factor: the table grows once len(self) / table_size would exceed this.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :raises ValueError: if the max load factor is not between 0 and 1.
+        """
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Max load factor should be between 0 and 1.")
+
+        self.__max_load_factor = max_load_factor
+        self.__hash_function = hash_function
+        self.__length = 0
+        self.__modifications = 0
+        self.__allocate(self.TABLE_SIZES[0])
+
+    def __allocate(self, size: int) -> None:
+        """
+        Creates empty arrays of the given size.
+        :complexity: O(size)
+        """
+        self.__keys: ArrayR[K] = ArrayR(size)
+        self.__values: ArrayR[V] = ArrayR(size)
+        self.__codes: ArrayR[int] = ArrayR(size)
+        self.__distances: ArrayR[int] = ArrayR(size)
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def hash_code(self, key: K) -> int:
+        """
+        Full hash code of a key, independent of the table size.
+        :complexity: that of the hash function, O(len(key)) for the default polynomial string hash.
+        """
+        return self.__hash_function(key)
+
+    def hash(self, key: K) -> int:
+        """
+        Home position of a key in the hash table.
+        :complexity: See hash_code.
+        """
+        return self.hash_code(key) % self.table_size
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__distances)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def __find(self, key: K, code: int) -> int:
+        """
+        Find the position of this key, or -1 if it is not in the table.
+        The search stops early at an empty slot or at an item closer to its home
+        than the key would be, as the key would have displaced that item.
+        :complexity best: O(1) the home position is empty or holds the key.
+        :complexity worst: O(D*comp(K)) where D is the largest probe distance in the table.
+        """
+        position = code % self.table_size
+        distance = 0
+        while True:
+            slot_distance = self.__distances[position]
+            if slot_distance is None or slot_distance < distance:
+                return -1
+            if self.__codes[position] == code and self.__keys[position] == key:
+                return position
+            position = (position + 1) % self.table_size
+            distance += 1
+
+    def __insert_new(self, key: K, data: V, code: int) -> None:
+        """
+        Insert a key known not to be in the table, displacing richer items along the way.
+        There must be at least one empty slot.
+        :complexity: O(D) where D is the largest probe distance in the table.
+        """
+        position = code % self.table_size
+        distance = 0
+        while self.__distances[position] is not None:
+            if self.__distances[position] < distance:
+                # Take from the rich: swap in the current item and carry on with the displaced one.
+                key, self.__keys[position] = self.__keys[position], key
+                data, self.__values[position] = self.__values[position], data
+                code, self.__codes[position] = self.__codes[position], code
+                distance, self.__distances[position] = self.__distances[position], distance
+            position = (position + 1) % self.table_size
+            distance += 1
+
+        self.__keys[position] = key
+        self.__values[position] = data
+        self.__codes[position] = code
+        self.__distances[position] = distance
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(self.table_size):
+            if self.__distances[x] is not None:
+                res[i] = self.__keys[x]
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(self.table_size):
+            if self.__distances[x] is not None:
+                res[i] = self.__values[x]
+                i += 1
+        return res
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs, reading the arrays directly.
+        :raises RuntimeError: if a key is added or removed while iterating.
+        :complexity: O(N) over the whole iteration where N is the table size.
+        """
+        modifications = self.__modifications
+        for x in range(self.table_size):
+            if self.__distances[x] is not None:
+                yield self.__keys[x], self.__values[x]
+                if self.__modifications != modifications:
+                    raise RuntimeError("Hash table changed size during iteration.")
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See find.
+        """
+        return self.__find(key, self.hash_code(key)) >= 0
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :complexity: See find.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_code(key))
+        if position < 0:
+            raise KeyError(key)
+        return self.__values[position]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+        :complexity: See find and insert_new, plus an amortised rehash.
+        """
+        code = self.hash_code(key)
+        position = self.__find(key, code)
+        if position >= 0:
+            self.__values[position] = data
+            return
+
+        if self.__length + 1 > self.table_size * self.__max_load_factor:
+            self.__rehash()
+        self.__insert_new(key, data, code)
+        self.__length += 1
+        self.__modifications += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+        The items following it are shifted back one slot until an empty slot
+        or an item already at its home position is reached.
+        :complexity: O(D*comp(K)) where D is the largest probe distance in the table.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash_code(key))
+        if position < 0:
+            raise KeyError(key)
+
+        following = (position + 1) % self.table_size
+        while self.__distances[following] is not None and self.__distances[following] > 0:
+            self.__keys[position] = self.__keys[following]
+            self.__values[position] = self.__values[following]
+            self.__codes[position] = self.__codes[following]
+            self.__distances[position] = self.__distances[following] - 1
+            position = following
+            following = (following + 1) % self.table_size
+
+        self.__keys[position] = None
+        self.__values[position] = None
+        self.__codes[position] = None
+        self.__distances[position] = None
+        self.__length -= 1
+        self.__modifications += 1
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __rehash(self) -> None:
+        """
+        Resize the table and reinsert all items using their stored hash codes.
+        TABLE_SIZES gives the first sizes, after which the table size keeps roughly doubling.
+        :complexity: O(N*D) where N is len(self) and D the largest probe distance.
+        """
+        old_keys, old_values, old_codes = self.__keys, self.__values, self.__codes
+        old_distances = self.__distances
+
+        self.__allocate(next_table_size(self.table_size, self.TABLE_SIZES))
+
+        for x in range(len(old_distances)):
+            if old_distances[x] is not None:
+                self.__insert_new(old_keys[x], old_values[x], old_codes[x])
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        """
+        result = ""
+        for x in range(self.table_size):
+            if self.__distances[x] is not None:
+                result += "(" + str(self.__keys[x]) + "," + str(self.__values[x]) + ")\n"
+        return result
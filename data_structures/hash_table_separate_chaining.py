@@ -1,18 +1,61 @@
+import time
+
 from data_structures.abstract_hash_table import HashTable
+from data_structures.avl_tree import AVLTree
+from data_structures.hash_functions import polynomial_string_hash
+from data_structures.hash_table_sizes import next_table_size, previous_table_size
+from data_structures.hash_table_stats import HashTableStats, ProbeCounter, histogram
+from data_structures.array_list import ArrayList
 from data_structures.referential_array import ArrayR
 from data_structures.linked_list import LinkedList
-from typing import TypeVar
+from typing import Callable, Iterator, Sequence, TypeVar
 
+K = TypeVar('K')
 V = TypeVar('V')
 
-class HashTableSeparateChaining(HashTable[str, V]):
+
+def _bucket_entries(bucket: LinkedList | AVLTree):
+    """
+    Yields the (key, value) pairs of a bucket, whether it is a chain or a tree.
+    :complexity: O(B) where B is the size of the bucket.
+    """
+    if isinstance(bucket, AVLTree):
+        for node in bucket:
+            yield node.key, node.item
+    else:
+        yield from bucket
+
+
+class HashTableSeparateChaining(HashTable[K, V]):
     """
     Separate Chaining Hash Table Implementation using a Linked List.
     It currently rehashes the primary cluster to handle deletion.
 
+    The table keeps track of its load factor and rehashes into the next
+    (prime) size of TABLE_SIZES once it exceeds max_load_factor, so chains
+    stay O(1) long on average. If min_load_factor is given, the table also
+    shrinks back down the size sequence when it drains.
+
+    Keys are hashed by a hash function chosen per instance (see hash_functions),
+    the polynomial string hash by default.
+
+    Chains hold (key, value) tuples, replaced as a whole when a value is updated.
+    A chain longer than the treeify threshold is converted into an AVL tree ordered by key,
+    so skewed or adversarial key sets cost O(log n) instead of O(n) per operation.
+    A tree that shrinks below UNTREEIFY_THRESHOLD goes back to being a chain.
+    Treeified buckets need the keys that collide in them to be mutually comparable;
+    if they are not, the bucket stays (or goes back to being) a chain.
+
+    stats() reports the load factor, chain lengths and rehash costs. With track_stats,
+    the table also counts the entries looked at by every get, set and delete
+    (the height of the tree for treeified buckets).
+
     constants:
         DEFAULT_TABLE_SIZE: default table size used in the __init__
-        DEFAULT_HASH_TABLE: default hash base used for the hash function
+        DEFAULT_MAX_LOAD_FACTOR: default load factor that triggers growth
+        TABLE_SIZES: growth policy, the (prime) table sizes to grow through
+        DEFAULT_TREEIFY_THRESHOLD: chain length above which a bucket becomes a tree
+        UNTREEIFY_THRESHOLD: tree size below which a bucket goes back to a chain
 
     attributes:
         length: number of elements in the hash table
@@ -20,66 +63,204 @@ class HashTableSeparateChaining(HashTable[str, V]):
     """
 
     DEFAULT_TABLE_SIZE = 17
-    DEFAULT_HASH_BASE = 31
+    DEFAULT_MAX_LOAD_FACTOR = 1.0
+    DEFAULT_TREEIFY_THRESHOLD = 8
+    UNTREEIFY_THRESHOLD = 6
+
+    # Roughly doubling primes, starting at the default table size. Larger sizes are generated on demand.
+    TABLE_SIZES = (17, 37, 79, 163, 331, 673, 1361, 2729, 5471, 10949, 21911, 43853,
+                   87719, 175447, 350899, 701819, 1403641, 2807303)
 
-    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE,
+                 max_load_factor: float = DEFAULT_MAX_LOAD_FACTOR,
+                 min_load_factor: float = None,
+                 sizes: Sequence[int] = None,
+                 hash_function: Callable[[K], int] = polynomial_string_hash,
+                 treeify_threshold: int = DEFAULT_TREEIFY_THRESHOLD,
+                 track_stats: bool = False) -> None:
         """
+        :param table_size: initial number of buckets, also the smallest size the table shrinks to.
+        :param max_load_factor: the table grows once len(self) / table_size exceeds this.
+        :param min_load_factor: if given, the table shrinks once len(self) / table_size drops below this.
+        :param sizes: overrides TABLE_SIZES, the sequence of sizes to grow (and shrink) through.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :param treeify_threshold: chains longer than this become trees, None to never treeify.
+        :param track_stats: whether to count the entries looked at by each get, set and delete.
+        :raises ValueError: if the table size, load factors or treeify threshold are invalid.
         :complexity: O(N) where N is the table size.
         """
         if table_size <= 0:
             raise ValueError("Table size should be larger than 0.")
-        
+        if max_load_factor <= 0:
+            raise ValueError("Max load factor should be larger than 0.")
+        if min_load_factor is not None and not 0 < min_load_factor < max_load_factor / 4:
+            # Shrinking roughly halves the table, so leave enough slack to avoid thrashing.
+            raise ValueError("Min load factor should be between 0 and a quarter of the max load factor.")
+        if treeify_threshold is not None and treeify_threshold <= self.UNTREEIFY_THRESHOLD:
+            raise ValueError("Treeify threshold should be larger than the untreeify threshold.")
+        if sizes is not None:
+            self.TABLE_SIZES = sizes
+
+        self.__treeify_threshold = treeify_threshold
+        self.__hash_function = hash_function
+        self.__max_load_factor = max_load_factor
+        self.__min_load_factor = min_load_factor
+        self.__min_table_size = table_size
         self.__length = 0
+        self.__modifications = 0
         self.__table = ArrayR(table_size)
 
+        self.__rehash_count = 0
+        self.__rehash_time = 0.0
+        # Probe counters stay None unless tracked, so counting costs a single check per operation.
+        self.__get_probes = ProbeCounter() if track_stats else None
+        self.__set_probes = ProbeCounter() if track_stats else None
+        self.__delete_probes = ProbeCounter() if track_stats else None
+
     def __len__(self) -> int:
         """
         Returns number of elements in the hash table
         """
         return self.__length
 
-    def __delitem__(self, key: str) -> None:
+    @property
+    def table_size(self) -> int:
+        return len(self.__table)
+
+    @property
+    def load_factor(self) -> float:
+        return self.__length / len(self.__table)
+
+    def __delitem__(self, key: K) -> None:
         """
         Deletes an item from our hash table
+        :complexity: O(B) where B is the chain length, O(log B) for a treeified bucket.
         :raises KeyError: when the key doesn't exist
         """
         position = self.hash(key)
-        if self.__table[position] is None:
+        bucket = self.__table[position]
+        counter = self.__delete_probes
+        if counter is not None:
+            counter.operations += 1
+        if bucket is None:
             raise KeyError(key)
 
-        for index, item in enumerate(self.__table[position]):
-            if item[0] == key:
-                if len(self.__table[position]) <= 1:
-                    self.__table[position] = None
-                else:
-                    self.__table[position].delete_at_index(index)
-
-                self.__length -= 1
-                return
+        if isinstance(bucket, AVLTree):
+            if counter is not None:
+                counter.probes += bucket.root.height
+            try:
+                del bucket[key]
+            except (ValueError, TypeError):
+                raise KeyError(key)
+            if len(bucket) < self.UNTREEIFY_THRESHOLD:
+                self.__table[position] = self.__untreeify(bucket)
+        else:
+            for index, item in enumerate(bucket):
+                if item[0] == key:
+                    if counter is not None:
+                        counter.probes += index + 1
+                    if len(bucket) <= 1:
+                        self.__table[position] = None
+                    else:
+                        bucket.delete_at_index(index)
+                    break
+            else:
+                if counter is not None:
+                    counter.probes += len(bucket)
+                raise KeyError(key)
 
-        raise KeyError(key)
+        self.__length -= 1
+        self.__modifications += 1
+        if self.__min_load_factor is not None and self.load_factor < self.__min_load_factor:
+            self.__shrink()
 
-    def __setitem__(self, key: str, data: V) -> None:
+    def __setitem__(self, key: K, data: V) -> None:
         """
         Set a (key, data) pair in our hash table
+        :complexity: O(B) where B is the chain length, O(log B) for a treeified bucket.
         """
         position = self.hash(key)
-        if self.__table[position] is None:
-            self.__table[position] = LinkedList()
+        bucket = self.__table[position]
+        counter = self.__set_probes
+        if counter is not None:
+            counter.operations += 1
 
-        # Attempt to find the key in our linked list
-        if len(self.__table[position]) > 0:
-            for index, item in enumerate(self.__table[position]):
-                if item[0] == key:
-                    # If found update the data
-                    self.__table[position][index] = (key, data)
+        if isinstance(bucket, AVLTree):
+            if counter is not None:
+                counter.probes += bucket.root.height
+            size_before = len(bucket)
+            try:
+                bucket[key] = data
+            except TypeError:
+                # The key cannot be ordered against the others, so it cannot be in the tree either.
+                self.__table[position] = self.__untreeify(bucket)
+                self.__add_to_chain(position, (key, data))
+            else:
+                if len(bucket) == size_before:
+                    # The key was already there and has been updated
                     return
-                
-        # Insert at the beginning for better time complexity
-        self.__table[position].insert(0, (key, data))
+        else:
+            # Attempt to find the key in our linked list
+            if bucket is not None:
+                for index, item in enumerate(bucket):
+                    if item[0] == key:
+                        if counter is not None:
+                            counter.probes += index + 1
+                        # If found update the data
+                        bucket[index] = (key, data)
+                        return
+                if counter is not None:
+                    counter.probes += len(bucket)
+            self.__add_to_chain(position, (key, data))
+
         self.__length += 1
+        self.__modifications += 1
+        if self.load_factor > self.__max_load_factor:
+            self.__grow()
+
+    def __add_to_chain(self, position: int, entry: tuple[K, V]) -> None:
+        """
+        Adds an entry for a new key to the chain at position, treeifying the chain once it gets too long.
+        Treeifying is only tried as the chain crosses the threshold, so a chain whose keys
+        cannot be ordered is not retried on every insert.
+        The bucket must not be a tree.
+        :complexity: O(1), O(B * log(B)) when the chain of length B is treeified.
+        """
+        if self.__table[position] is None:
+            self.__table[position] = LinkedList()
+        # Insert at the beginning for better time complexity
+        self.__table[position].insert(0, entry)
+        if self.__treeify_threshold is not None and len(self.__table[position]) == self.__treeify_threshold + 1:
+            self.__table[position] = self.__treeify(self.__table[position])
 
-    def __contains__(self, key: str) -> bool:
+    @staticmethod
+    def __treeify(chain: LinkedList) -> LinkedList | AVLTree:
+        """
+        Converts a chain into an AVL tree, or keeps the chain if its keys cannot be ordered.
+        :complexity: O(B * log(B)) where B is the chain length.
+        """
+        tree = AVLTree()
+        try:
+            for key, value in chain:
+                tree[key] = value
+        except TypeError:
+            return chain
+        return tree
+
+    @staticmethod
+    def __untreeify(tree: AVLTree) -> LinkedList | None:
+        """
+        Converts a tree back into a chain, or None if it is empty.
+        :complexity: O(B) where B is the size of the tree.
+        """
+        if tree.is_empty():
+            return None
+        chain = LinkedList()
+        for node in tree:
+            chain.insert(0, (node.key, node.item))
+        return chain
+
+    def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
         """
@@ -90,18 +271,33 @@ class HashTableSeparateChaining(HashTable[str, V]):
         else:
             return True
 
-    def __getitem__(self, key: str) -> V:
+    def __getitem__(self, key: K) -> V:
         """
         Get the data associated with a key
         :raises KeyError: when the key doesn't exist
         """
         position = self.hash(key)
-        if self.__table[position] is None:
+        bucket = self.__table[position]
+        counter = self.__get_probes
+        if counter is not None:
+            counter.operations += 1
+        if bucket is None:
             raise KeyError(key)
-        for item in self.__table[position]:
+        if isinstance(bucket, AVLTree):
+            if counter is not None:
+                counter.probes += bucket.root.height
+            try:
+                return bucket[key]
+            except TypeError:
+                raise KeyError(key)
+        for index, item in enumerate(bucket):
             if item[0] == key:
+                if counter is not None:
+                    counter.probes += index + 1
                 return item[1]
 
+        if counter is not None:
+            counter.probes += len(bucket)
         raise KeyError(key)
 
     def is_empty(self):
@@ -111,20 +307,134 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         return self.__length == 0
 
-    def hash(self, key: str) -> int:
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def hash(self, key: K) -> int:
         """
-        Universal Hash function
+        Reduces the hash code of the key to a bucket.
         :returns: a valid position (0 <= value < table_size) in the hash table
-        :complexity: O(K) where K is the size of the key
+        :complexity: that of the hash function, O(K) where K is the size of the key for the default one
+        """
+        return self.__hash_function(key) % len(self.__table)
+
+    def __grow(self) -> None:
+        """
+        Rehash into the first size of TABLE_SIZES larger than the current one.
+        Past the largest size, the table size roughly doubles into the next prime.
+        :complexity: O(N + M) where N is the number of items and M the new table size.
+        """
+        self.__rehash(next_table_size(len(self.__table), self.TABLE_SIZES))
+
+    def set_many(self, pairs: Sequence[tuple[K, V]]) -> None:
+        """
+        Sets several (key, value) pairs at once. The table is rehashed (at most) once,
+        at the first new key, for the case where every remaining key is new; the inserts
+        themselves never rehash. A batch that only updates values never moves items,
+        as for setitem, so an iteration in progress carries on.
+        :complexity: O(N + M) for the rehash (see presize), then see setitem, once per pair.
+        """
+        presized = False
+        for i, (key, data) in enumerate(pairs):
+            if not presized and key not in self:
+                self.__presize(self.__length + len(pairs) - i)
+                presized = True
+            self[key] = data
+
+    def __presize(self, capacity: int) -> None:
+        """
+        Rehash into the first size along the growth sequence that holds capacity items
+        within the max load factor, unless the table is already large enough.
+        :complexity: O(N + M) where N is the number of items and M the new table size, O(1) if no rehash is needed.
         """
-        value = 0
-        a = 31415
-        for char in key:
-            value = (ord(char) + a * value) % len(self.__table)
-            a = a * HashTableSeparateChaining.DEFAULT_HASH_BASE % (len(self.__table) - 1)
-        return value
+        needed = capacity / self.__max_load_factor
+        if needed > len(self.__table):
+            size = len(self.__table)
+            while size < needed:
+                size = next_table_size(size, self.TABLE_SIZES)
+            self.__rehash(size)
 
-    def insert(self, key: str, data: V) -> None:
+    def __shrink(self) -> None:
+        """
+        Rehash into the size before the current one in the growth sequence (see __grow),
+        never going below the table size the hash table was created with.
+        :complexity: O(N + M) where N is the number of items and M the old table size.
+        """
+        new_size = previous_table_size(len(self.__table), self.TABLE_SIZES)
+        if new_size is not None and new_size >= self.__min_table_size:
+            self.__rehash(new_size)
+
+    def __rehash(self, new_size: int) -> None:
+        """
+        Move every (key, data) pair into a new table of the given size.
+        Keys are known to be unique, so no chain needs to be searched.
+        Every pair goes into a plain chain first, and chains past the treeify threshold
+        are treeified once all pairs have moved, so keys that cannot be ordered
+        against each other just leave their chain untreeified.
+        :complexity: O(N * hash(K) + M) where N is the number of items and M is the new table size,
+            plus O(B * log(B)) for each chain of length B that is treeified.
+        """
+        start = time.perf_counter()
+        # Items move to other buckets, so an iteration in progress cannot carry on.
+        self.__modifications += 1
+        old_table = self.__table
+        self.__table = ArrayR(new_size)
+        for bucket in old_table:
+            if bucket is not None:
+                for key, value in _bucket_entries(bucket):
+                    position = self.hash(key)
+                    if self.__table[position] is None:
+                        self.__table[position] = LinkedList()
+                    self.__table[position].insert(0, (key, value))
+        if self.__treeify_threshold is not None:
+            for position in range(new_size):
+                chain = self.__table[position]
+                if chain is not None and len(chain) > self.__treeify_threshold:
+                    self.__table[position] = self.__treeify(chain)
+        self.__rehash_count += 1
+        self.__rehash_time += time.perf_counter() - start
+
+    def stats(self) -> HashTableStats:
+        """
+        Returns a snapshot of the load factor, chain lengths and rehash costs.
+        The probe length of an item is its position in its chain (or its depth in its tree) plus one.
+        :complexity: O(N + M) where N is the number of items and M the table size.
+        """
+        total_probe_length = 0
+        max_probe_length = 0
+        bucket_sizes = ArrayList(len(self.__table))
+        for bucket in self.__table:
+            if bucket is None:
+                bucket_sizes.append(0)
+                continue
+            bucket_sizes.append(len(bucket))
+            if isinstance(bucket, AVLTree):
+                total, deepest = self.__tree_probe_lengths(bucket.root, 1)
+            else:
+                total = len(bucket) * (len(bucket) + 1) // 2
+                deepest = len(bucket)
+            total_probe_length += total
+            max_probe_length = max(max_probe_length, deepest)
+
+        return HashTableStats(self.__length, len(self.__table), total_probe_length, max_probe_length,
+                              self.__rehash_count, self.__rehash_time,
+                              chain_histogram=histogram(bucket_sizes),
+                              get_probes=self.__get_probes, set_probes=self.__set_probes,
+                              delete_probes=self.__delete_probes)
+
+    def __tree_probe_lengths(self, current, depth: int) -> tuple[int, int]:
+        """
+        Sum and maximum of the probe lengths (depth + 1) of the nodes in a subtree.
+        :complexity: O(B) where B is the size of the subtree.
+        """
+        if current is None:
+            return 0, 0
+        left_total, left_max = self.__tree_probe_lengths(current.left, depth + 1)
+        right_total, right_max = self.__tree_probe_lengths(current.right, depth + 1)
+        return depth + left_total + right_total, max(depth, left_max, right_max)
+
+    def insert(self, key: K, data: V) -> None:
         """
         Utility method to call our setitem method
         """
@@ -135,21 +445,21 @@ class HashTableSeparateChaining(HashTable[str, V]):
         Returns an iterator for the hash table
         :complexity: O(N) where N n is the number of items in our hash table
         """
-        for list in self.__table:
-            if list is not None:
-                for item in list:
+        for bucket in self.__table:
+            if bucket is not None:
+                for item in _bucket_entries(bucket):
                     yield item[1]
 
-    def keys(self) -> ArrayR[str]:
+    def keys(self) -> ArrayR[K]:
         """
         Returns all keys in the hash table
         :complexity: O(N) where N is the number of items in our hash table
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
+        for bucket in self.__table:
+            if bucket is not None:
+                for item in _bucket_entries(bucket):
                     res[i] = item[0]
                     i += 1
         return res
@@ -161,23 +471,37 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         res = ArrayR(self.__length)
         i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
+        for bucket in self.__table:
+            if bucket is not None:
+                for item in _bucket_entries(bucket):
                     res[i] = item[1]
                     i += 1
         return res
 
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs, walking the buckets directly.
+        :raises RuntimeError: if a key is added or removed, or the table is rehashed, while iterating.
+        :complexity: O(N + M) over the whole iteration where M is the table size.
+        """
+        modifications = self.__modifications
+        for bucket in self.__table:
+            if bucket is not None:
+                for key, value in _bucket_entries(bucket):
+                    yield key, value
+                    if self.__modifications != modifications:
+                        raise RuntimeError("Hash table changed size during iteration.")
+
     def __str__(self) -> str:
         """
         Returns all they key/value pairs in our hash table (no particular order)
         :complexity: O(N) where N is the number of items in our hash table
         """
         result = ""
-        for list in self.__table:
-            if list is not None:
+        for bucket in self.__table:
+            if bucket is not None:
                 first = True
-                for item in list:
+                for item in _bucket_entries(bucket):
                     if not first:
                         result += ' -> '
                     (key, value) = item
@@ -0,0 +1,223 @@
+from __future__ import annotations
+import threading
+from typing import Callable, Iterator, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import integer_hash, polynomial_string_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Marks a missing default, as None is a valid value.
+_MISSING = object()
+
+
+class ShardedHashTable(HashTable[K, V]):
+    """
+    Sharded Hash Table.
+    Defines a Hash Table that can be shared between threads. Keys are partitioned
+    across a fixed number of independent hash tables (shards), each guarded by its
+    own lock (lock striping), so threads working on different shards do not wait
+    for each other.
+
+    Every single-key operation, including get_or_insert and update, is atomic.
+    snapshot(), keys(), values() and __str__ hold every lock at once and so see a
+    consistent state; len() adds up the shard lengths one shard at a time and may
+    be out of date by the time it returns under concurrent writes.
+
+    Type Arguments:
+        - K:    Key Type. Must suit the hash function, str for the default one.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have the complexity of the same method on a shard.
+    """
+
+    DEFAULT_SHARD_COUNT = 16
+
+    def __init__(self, shard_count: int = DEFAULT_SHARD_COUNT,
+                 hash_function: Callable[[K], int] = polynomial_string_hash,
+                 table_factory: Callable[[], HashTable[K, V]] = None) -> None:
+        """
+        :param shard_count: number of shards (and locks).
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+            Picks the shard, and is used by the shards unless table_factory is given.
+        :param table_factory: creates an empty shard, a LinearProbeTable by default.
+        :raises ValueError: if shard_count is not positive.
+        :complexity: O(shard_count) plus the cost of creating the shards.
+        """
+        if shard_count <= 0:
+            raise ValueError("Shard count should be positive.")
+        if table_factory is None:
+            table_factory = lambda: LinearProbeTable(hash_function=hash_function)
+
+        self.__hash_function = hash_function
+        self.__table_factory = table_factory
+        self.__shards: ArrayR[HashTable[K, V]] = ArrayR(shard_count)
+        self.__locks: ArrayR[threading.Lock] = ArrayR(shard_count)
+        for i in range(shard_count):
+            self.__shards[i] = table_factory()
+            self.__locks[i] = threading.Lock()
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.__shards)
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def shard_index(self, key: K) -> int:
+        """
+        Index of the shard holding a key.
+        The hash code is mixed first, as the shards reduce the same code modulo their own size.
+        :complexity: that of the hash function.
+        """
+        return integer_hash(self.__hash_function(key)) % len(self.__shards)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        :complexity: O(S) where S is the number of shards.
+        """
+        length = 0
+        for i in range(len(self.__shards)):
+            with self.__locks[i]:
+                length += len(self.__shards[i])
+        return length
+
+    def __contains__(self, key: K) -> bool:
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            return key in self.__shards[i]
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            return self.__shards[i][key]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            self.__shards[i][key] = data
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Deletes a (key, value) pair in our hash table.
+        :raises KeyError: when the key doesn't exist.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            del self.__shards[i][key]
+
+    def get_or_insert(self, key: K, data: V) -> V:
+        """
+        Returns the value at key, first setting it to data if the key is missing.
+        :complexity: that of a lookup plus, for a missing key, an insert.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            shard = self.__shards[i]
+            try:
+                return shard[key]
+            except KeyError:
+                shard[key] = data
+                return data
+
+    def update(self, key: K, function: Callable[[V], V], default: V = _MISSING) -> V:
+        """
+        Replaces the value at key with function(value) and returns the new value.
+        No other thread can change the key in between. The shard stays locked while
+        function runs, so it should be quick and must not use this table.
+        :param default: value passed to function when the key is missing.
+        :raises KeyError: when the key doesn't exist and no default is given.
+        :complexity: that of a lookup and an insert plus that of function.
+        """
+        i = self.shard_index(key)
+        with self.__locks[i]:
+            shard = self.__shards[i]
+            try:
+                old = shard[key]
+            except KeyError:
+                if default is _MISSING:
+                    raise
+                old = default
+            data = function(old)
+            shard[key] = data
+            return data
+
+    def __acquire_all(self) -> None:
+        """
+        Locks every shard, always in the same order so that two threads doing this cannot deadlock.
+        :complexity: O(S) where S is the number of shards.
+        """
+        for i in range(len(self.__locks)):
+            self.__locks[i].acquire()
+
+    def __release_all(self) -> None:
+        for i in range(len(self.__locks) - 1, -1, -1):
+            self.__locks[i].release()
+
+    def snapshot(self) -> HashTable[K, V]:
+        """
+        Returns a copy of the table as it was at a single point in time,
+        as one table made by the table factory. Writers only wait while the
+        items of each shard are copied out, not while the copy is built.
+        :complexity: O(N) inserts where N is len(self), plus O(S) for the S shards.
+        """
+        shard_keys = ArrayR(len(self.__shards))
+        shard_values = ArrayR(len(self.__shards))
+        self.__acquire_all()
+        try:
+            for i in range(len(self.__shards)):
+                # keys() and values() list the items of a table in the same order.
+                shard_keys[i] = self.__shards[i].keys()
+                shard_values[i] = self.__shards[i].values()
+        finally:
+            self.__release_all()
+
+        res = self.__table_factory()
+        for i in range(len(shard_keys)):
+            for j in range(len(shard_keys[i])):
+                res[shard_keys[i][j]] = shard_values[i][j]
+        return res
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table, from a consistent state.
+        :complexity: O(N) where N is the total size of the shards.
+        """
+        return self.snapshot().keys()
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table, from a consistent state.
+        :complexity: O(N) where N is the total size of the shards.
+        """
+        return self.snapshot().values()
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs of a snapshot, so other threads may keep
+        changing the table meanwhile; the snapshot itself is taken eagerly.
+        :complexity: that of snapshot, then O(N) over the whole iteration.
+        """
+        return self.snapshot().items()
+
+    def is_empty(self) -> bool:
+        """
+        :complexity: O(S) where S is the number of shards.
+        """
+        return len(self) == 0
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the total size of the shards.
+        """
+        return str(self.snapshot())
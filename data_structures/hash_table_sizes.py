@@ -0,0 +1,43 @@
+""" Table sizes for the hash tables.
+
+Tables grow through an increasing sequence of prime sizes: a fixed list to start
+with (their TABLE_SIZES class constant), then, past its end, the first prime from
+twice the current size, so there is no largest size.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Sequence
+
+from algorithms.primes import next_prime
+
+# Default growth sequence of the open addressing tables: primes that roughly double.
+HASH_TABLE_SIZES = (5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157,
+                    98317, 196613, 393241, 786433, 1572869)
+
+
+def next_table_size(size: int, sizes: Sequence[int] = HASH_TABLE_SIZES) -> int:
+    """
+    The size to grow into from the given one: the first of sizes that is larger,
+    or past the end of sizes, the first prime from 2 * size.
+    :complexity: O(len(sizes)) within the sequence, see next_prime past its end.
+    """
+    for candidate in sizes:
+        if candidate > size:
+            return candidate
+    return next_prime(2 * size)
+
+
+def previous_table_size(size: int, sizes: Sequence[int] = HASH_TABLE_SIZES) -> int | None:
+    """
+    The size to shrink into from the given one: the largest size below it in the sequence
+    that next_table_size grows through from sizes[0], None if there is none.
+    :complexity: O(len(sizes) * S) where S is the number of sizes below size, see next_prime past the end of sizes.
+    """
+    previous = None
+    candidate = sizes[0]
+    while candidate < size:
+        previous = candidate
+        candidate = next_table_size(candidate, sizes)
+    return previous
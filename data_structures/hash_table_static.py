@@ -0,0 +1,350 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, TypeVar
+from algorithms.primes import next_prime
+from data_structures.abstract_hash_table import HashTable
+from data_structures.array_list import ArrayList
+from data_structures.hash_functions import HASH_MODULUS, integer_hash, polynomial_string_hash
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class StaticHashTable(HashTable[K, V]):
+    """
+    Static Hash Table.
+    Defines a read-only Hash Table built once over a fixed set of keys with a perfect hash
+    (CHD, "compress, hash and displace"): every key has a single slot to look at, and the
+    N items fill P slots, P being the first prime from N on. P is prime so that the
+    displacements below reach every slot; primes are O(log N) apart, so only a handful
+    of slots stay empty. Any attempt to change the table raises a TypeError.
+
+    Building it:
+        - the keys are split into about N / BUCKET_LOAD buckets by a first hash,
+        - buckets are placed largest first; for each one, displacements d = 0, 1, 2, ... are
+          tried until the slots (f1 + (d % P) * f2 + d // P) % P of all its keys are free,
+          where f1 and f2 (never 0) are two more hashes of each key, and d is recorded for the bucket,
+        - buckets holding a single key are placed last, straight into any free slot,
+          by picking the displacement that lands there.
+    A lookup hashes the key, reads its bucket's displacement, and checks the one slot it leads to.
+
+    The hash code of each key is computed once and reduced modulo HASH_MODULUS, and the three
+    hashes are derived from that with seeded universal hashes. Different keys whose reduced codes
+    are equal cannot be told apart by any seed or displacement, so building fails on them.
+
+    Type Arguments:
+        - K:    Key Type. Must suit the hash function, str for the default one.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Average number of keys per bucket: fewer buckets take less space, more buckets are quicker to place.
+    BUCKET_LOAD = 2
+    # Displacements tried for one bucket before starting again with new seeds.
+    MAX_DISPLACEMENT_TRIES = 1 << 16
+    # Seeds tried before giving up on building the table.
+    MAX_SEEDS = 64
+
+    def __init__(self, pairs: Iterable[tuple[K, V]] = (),
+                 hash_function: Callable[[K], int] = polynomial_string_hash) -> None:
+        """
+        Builds the table from (key, value) pairs, the last value winning for repeated keys.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :raises ValueError: if two different keys have the same hash code modulo HASH_MODULUS,
+            or no seed within MAX_SEEDS gives a perfect hash.
+        :complexity: O(N) expected, where N is the number of pairs.
+        """
+        self.__hash_function = hash_function
+        items = ArrayList()
+        for key, data in pairs:
+            items.append((key, data, hash_function(key) % HASH_MODULUS))
+
+        for seed in range(self.MAX_SEEDS):
+            self.__seed = seed
+            if self.__build(items):
+                return
+        raise ValueError(f"No perfect hash found within {self.MAX_SEEDS} seeds.")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[K, V]], *args, **kwargs) -> StaticHashTable[K, V]:
+        return cls(pairs, *args, **kwargs)
+
+    def __choose_parameters(self) -> None:
+        """
+        Draws (a, c) for the bucket hash and the f1 and f2 slot hashes from the current seed.
+        Each hash is (a * code + c) mod p, reduced to the number of buckets or slots.
+        """
+        parameters = ArrayR(3)
+        for i in range(3):
+            base = 2 * (3 * self.__seed + i)
+            parameters[i] = (integer_hash(base) % (HASH_MODULUS - 1) + 1, integer_hash(base + 1) % HASH_MODULUS)
+        self.__bucket_parameters, self.__first_parameters, self.__step_parameters = parameters
+
+    def __build(self, items: ArrayList[tuple[K, V, int]]) -> bool:
+        """
+        Tries to build the perfect hash with the current seed.
+        :returns: False if some bucket could not be placed, in which case another seed should be tried.
+        :raises ValueError: if two different keys have the same (reduced) hash code.
+        :complexity: O(N) expected where N is the number of items.
+        """
+        self.__choose_parameters()
+        count = len(items)
+        bucket_count = max(1, (count + self.BUCKET_LOAD - 1) // self.BUCKET_LOAD)
+        self.__bucket_count = bucket_count
+        self.__displacements: ArrayR[int] = ArrayR(bucket_count)
+
+        # Counting sort of the items by bucket: bucket b gets order[starts[b]:ends[b]].
+        bucket_of = ArrayR(count)
+        starts = ArrayR(bucket_count + 1)
+        for b in range(bucket_count + 1):
+            starts[b] = 0
+        a, c = self.__bucket_parameters
+        for i in range(count):
+            b = (a * items[i][2] + c) % HASH_MODULUS % bucket_count
+            bucket_of[i] = b
+            starts[b + 1] += 1
+        ends = ArrayR(bucket_count)
+        for b in range(bucket_count):
+            starts[b + 1] += starts[b]
+            ends[b] = starts[b]
+        order = ArrayR(count)
+        for i in range(count):
+            item = items[i]
+            b = bucket_of[i]
+            end = ends[b]
+            for j in range(starts[b], end):
+                if order[j][2] == item[2]:
+                    if order[j][0] != item[0]:
+                        raise ValueError(f"Keys {order[j][0]!r} and {item[0]!r} have the same hash code modulo HASH_MODULUS.")
+                    # A repeated key, the later value wins.
+                    order[j] = item
+                    break
+            else:
+                order[end] = item
+                ends[b] = end + 1
+
+        # Counting sort of the buckets by size, so that they can be placed largest first.
+        # ends[b] now holds the size of bucket b, which starts at order[starts[b]].
+        length = 0
+        largest = 0
+        for b in range(bucket_count):
+            bucket_size = ends[b] - starts[b]
+            ends[b] = bucket_size
+            length += bucket_size
+            largest = max(largest, bucket_size)
+        by_size = ArrayR(largest + 2)
+        for bucket_size in range(largest + 2):
+            by_size[bucket_size] = 0
+        for b in range(bucket_count):
+            by_size[largest - ends[b] + 1] += 1
+        for bucket_size in range(largest + 1):
+            by_size[bucket_size + 1] += by_size[bucket_size]
+        sorted_buckets = ArrayR(bucket_count)
+        for b in range(bucket_count):
+            index = largest - ends[b]
+            sorted_buckets[by_size[index]] = b
+            by_size[index] += 1
+
+        self.__length = length
+        size = next_prime(length)
+        self.__size = size
+        self.__keys: ArrayR[K] = ArrayR(size)
+        self.__values: ArrayR[V] = ArrayR(size)
+        self.__codes: ArrayR[int] = ArrayR(size)
+
+        # Scratch space for placing one bucket.
+        firsts = ArrayR(largest)
+        steps = ArrayR(largest)
+        slots = ArrayR(largest)
+        first_a, first_c = self.__first_parameters
+        step_a, step_c = self.__step_parameters
+        free = 0
+        for i in range(bucket_count):
+            b = sorted_buckets[i]
+            bucket_size = ends[b]
+            start = starts[b]
+            if bucket_size > 1:
+                for j in range(bucket_size):
+                    code = order[start + j][2]
+                    firsts[j] = (first_a * code + first_c) % HASH_MODULUS % size
+                    steps[j] = (step_a * code + step_c) % HASH_MODULUS % (size - 1) + 1
+                displacement = self.__find_displacement(bucket_size, firsts, steps, slots)
+                if displacement < 0:
+                    return False
+                self.__displacements[b] = displacement
+                for j in range(bucket_size):
+                    key, data, code = order[start + j]
+                    self.__store(slots[j], key, data, code)
+            elif bucket_size == 1:
+                while self.__codes[free] is not None:
+                    free += 1
+                key, data, code = order[start]
+                # A multiple of size adds nothing to f1 but displacement // size.
+                self.__displacements[b] = (free - (first_a * code + first_c) % HASH_MODULUS % size) % size * size
+                self.__store(free, key, data, code)
+            else:
+                self.__displacements[b] = 0
+        return True
+
+    def __find_displacement(self, bucket_size: int, firsts: ArrayR[int], steps: ArrayR[int], slots: ArrayR[int]) -> int:
+        """
+        Finds the first displacement sending every item of a bucket (given by the
+        f1 and f2 hashes of its items) to distinct free slots, which are left in slots.
+        Past size * size displacements the slots repeat, so small tables give up sooner.
+        :returns: the displacement, or -1 if there is none within MAX_DISPLACEMENT_TRIES.
+        :complexity: O(B^2 * D) where B is the bucket size and D the number of displacements tried.
+        """
+        size = len(self.__codes)
+        for displacement in range(min(self.MAX_DISPLACEMENT_TRIES, size * size)):
+            shift = displacement // size
+            multiplier = displacement % size
+            for i in range(bucket_size):
+                slot = (firsts[i] + multiplier * steps[i] + shift) % size
+                if self.__codes[slot] is not None:
+                    break
+                for j in range(i):
+                    if slots[j] == slot:
+                        break
+                else:
+                    slots[i] = slot
+                    continue
+                break
+            else:
+                return displacement
+        return -1
+
+    def __store(self, position: int, key: K, data: V, code: int) -> None:
+        self.__keys[position] = key
+        self.__values[position] = data
+        self.__codes[position] = code
+
+    @property
+    def hash_function(self) -> Callable[[K], int]:
+        return self.__hash_function
+
+    def hash_code(self, key: K) -> int:
+        """
+        Full hash code of a key.
+        :complexity: that of the hash function, O(len(key)) for the default polynomial string hash.
+        """
+        return self.__hash_function(key)
+
+    def __find(self, key: K) -> int:
+        """
+        The slot of the key, or -1 if it is not in the table. Looks at a single slot.
+        :complexity: that of hash_code, plus O(comp(K)).
+        """
+        code = self.hash_code(key) % HASH_MODULUS
+        a, c = self.__bucket_parameters
+        displacement = self.__displacements[(a * code + c) % HASH_MODULUS % self.__bucket_count]
+        size = self.__size
+        multiplier, shift = displacement % size, displacement // size
+        a, c = self.__first_parameters
+        position = (a * code + c) % HASH_MODULUS % size + shift
+        if multiplier:
+            a, c = self.__step_parameters
+            position += multiplier * ((a * code + c) % HASH_MODULUS % (size - 1) + 1)
+        position %= size
+        if self.__codes[position] == code and self.__keys[position] == key:
+            return position
+        return -1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def keys(self) -> ArrayR[K]:
+        """
+        Returns all keys in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                res[i] = self.__keys[x]
+                i += 1
+        return res
+
+    def values(self) -> ArrayR[V]:
+        """
+        Returns all values in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                res[i] = self.__values[x]
+                i += 1
+        return res
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        """
+        Lazily yields the (key, value) pairs. The table never changes, so this never raises.
+        :complexity: O(N) over the whole iteration where N is the table size.
+        """
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                yield self.__keys[x], self.__values[x]
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :complexity: See find.
+        """
+        return self.__find(key) >= 0
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Get the value at a certain key
+        :complexity: See find.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key)
+        if position < 0:
+            raise KeyError(key)
+        return self.__values[position]
+
+    def __setitem__(self, key: K, data: V) -> None:
+        """
+        :raises TypeError: always, the table is read-only.
+        """
+        raise TypeError("StaticHashTable is read-only.")
+
+    def __delitem__(self, key: K) -> None:
+        """
+        :raises TypeError: always, the table is read-only.
+        """
+        raise TypeError("StaticHashTable is read-only.")
+
+    def freeze(self, hash_function: Callable[[K], int] = None) -> StaticHashTable[K, V]:
+        """
+        Already frozen, returns the table itself unless a different hash function is asked for.
+        :complexity: O(1), or see HashTable.freeze.
+        """
+        if hash_function is None or hash_function is self.__hash_function:
+            return self
+        return StaticHashTable(self.items(), hash_function)
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__codes)
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        :complexity: O(N * (str(key) + str(value))) where N is the table size.
+        """
+        result = ""
+        for x in range(len(self.__codes)):
+            if self.__codes[x] is not None:
+                result += "(" + str(self.__keys[x]) + "," + str(self.__values[x]) + ")\n"
+        return result
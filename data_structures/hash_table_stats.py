@@ -0,0 +1,109 @@
+""" Introspection for the hash tables.
+
+HashTableStats is a snapshot returned by a table's stats() method.
+ProbeCounter accumulates the number of slots (or chain entries) looked at
+by one kind of operation; tables only keep counters when created with
+track_stats=True, otherwise the counting code is skipped entirely.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from data_structures.array_list import ArrayList
+from data_structures.referential_array import ArrayR
+
+
+class ProbeCounter:
+    """ Number of operations of one kind and the total number of probes they made. """
+
+    def __init__(self) -> None:
+        self.operations = 0
+        self.probes = 0
+
+    @property
+    def mean(self) -> float:
+        """ Average probes per operation, 0 if there were no operations. """
+        if self.operations == 0:
+            return 0.0
+        return self.probes / self.operations
+
+    def copy(self) -> ProbeCounter:
+        """ A new counter with the same counts, which later operations do not change. """
+        res = ProbeCounter()
+        res.operations = self.operations
+        res.probes = self.probes
+        return res
+
+    def __str__(self) -> str:
+        return f"{self.operations} ops, {self.mean:.2f} probes/op"
+
+
+class HashTableStats:
+    """
+    Snapshot of the state of a hash table.
+
+    attributes:
+        length: number of items in the table
+        table_size: number of slots (or buckets) in the table
+        load_factor: length / table_size
+        mean_probe_length: average number of probes a successful lookup of each item takes
+        max_probe_length: largest number of probes a successful lookup takes
+        rehash_count: number of times the table has been rebuilt (including compactions)
+        rehash_time: total time spent rebuilding the table, in seconds
+        cluster_histogram: for open addressing, entry i is the number of runs of i consecutive used slots
+        chain_histogram: for separate chaining, entry i is the number of buckets holding i items
+        get_probes, set_probes, delete_probes: copies of the table's ProbeCounters,
+            or None when the table does not track stats
+    """
+
+    def __init__(self, length: int, table_size: int, total_probe_length: int, max_probe_length: int,
+                 rehash_count: int, rehash_time: float,
+                 cluster_histogram: ArrayR[int] = None, chain_histogram: ArrayR[int] = None,
+                 get_probes: ProbeCounter = None, set_probes: ProbeCounter = None,
+                 delete_probes: ProbeCounter = None) -> None:
+        self.length = length
+        self.table_size = table_size
+        self.load_factor = length / table_size
+        self.mean_probe_length = total_probe_length / length if length else 0.0
+        self.max_probe_length = max_probe_length
+        self.rehash_count = rehash_count
+        self.rehash_time = rehash_time
+        self.cluster_histogram = cluster_histogram
+        self.chain_histogram = chain_histogram
+        # Copied, so that the snapshot does not follow the table's live counters.
+        self.get_probes = get_probes.copy() if get_probes is not None else None
+        self.set_probes = set_probes.copy() if set_probes is not None else None
+        self.delete_probes = delete_probes.copy() if delete_probes is not None else None
+
+    def __str__(self) -> str:
+        result = (f"length={self.length}, table_size={self.table_size}, load_factor={self.load_factor:.3f}\n"
+                  f"probe length: mean={self.mean_probe_length:.2f}, max={self.max_probe_length}\n"
+                  f"rehashes: {self.rehash_count} in {self.rehash_time:.6f}s\n")
+        if self.cluster_histogram is not None:
+            result += "cluster sizes: " + _format_histogram(self.cluster_histogram) + "\n"
+        if self.chain_histogram is not None:
+            result += "chain lengths: " + _format_histogram(self.chain_histogram) + "\n"
+        if self.get_probes is not None:
+            result += f"get: {self.get_probes}, set: {self.set_probes}, delete: {self.delete_probes}\n"
+        return result
+
+
+def histogram(lengths: ArrayList[int]) -> ArrayR[int]:
+    """
+    Counts how many times each (non-negative) length appears.
+    :returns: an array whose entry i is the number of times i appears in lengths.
+    :complexity: O(N + M) where N is the number of lengths and M the largest one.
+    """
+    max_length = 0
+    for i in range(len(lengths)):
+        max_length = max(max_length, lengths[i])
+    res = ArrayR(max_length + 1)
+    for i in range(max_length + 1):
+        res[i] = 0
+    for i in range(len(lengths)):
+        res[lengths[i]] += 1
+    return res
+
+
+def _format_histogram(counts: ArrayR[int]) -> str:
+    return ", ".join(f"{i}: {counts[i]}" for i in range(len(counts)) if counts[i])
@@ -4,7 +4,8 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+import operator
+from typing import Any, Callable, Generic
 
 from data_structures import ArrayList
 from data_structures.abstract_list import List
@@ -12,25 +13,80 @@ from data_structures.referential_array import ArrayR, T
 
 
 class MaxHeap(Generic[T]):
+    """
+    A heap either has a fixed capacity, and add raises an IndexError once it is full,
+    or is growable: its array doubles when full and, if shrink is set, halves once
+    it is down to a quarter full, so add and get_max stay O(log n) amortised.
+
+    Elements are ordered by key(element) if a key function is given, computed once
+    when the element is added and kept in the_keys, an array parallel to the_array.
+    With min_heap set the smallest key comes out first, so get_max returns the minimum.
+    Without a key function the_keys is the_array itself and elements are compared directly.
+    """
     MIN_CAPACITY = 1
 
-    def __init__(self, max_size: int) -> None:
+    def __init__(self, max_size: int = None, initial_capacity: int = MIN_CAPACITY, shrink: bool = False,
+                 key: Callable[[T], Any] = None, min_heap: bool = False) -> None:
         """
         Args:
-            max_size(int): The capacity of the heap
+            max_size(int): The capacity of the heap, None for a growable heap
+            initial_capacity(int): The starting capacity of a growable heap
+            shrink(bool): Whether a growable heap gives memory back as it empties
+            key(Callable): Maps an element to the value it is ordered by, None to order the elements themselves
+            min_heap(bool): Whether the smallest key comes out first instead of the largest
 
         Complexity:
-            Best case complexity: O(n) where n is the size of the heap.
-            Worst case complexity: O(n) where n is the size of the heap.
+            Best case complexity: O(n) where n is the capacity of the heap.
+            Worst case complexity: O(n) where n is the capacity of the heap.
         """
         self.length: int = 0
-        self.the_array: ArrayR[T] = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.growable: bool = max_size is None
+        self.shrink: bool = shrink and self.growable
+        capacity = initial_capacity if self.growable else max_size
+        self.min_capacity: int = max(self.MIN_CAPACITY, capacity)
+        self.the_array: ArrayR[T] = ArrayR(self.min_capacity + 1)
+        self.key = key
+        self.the_keys: ArrayR = ArrayR(self.min_capacity + 1) if key is not None else self.the_array
+        # comes_before(a, b) is True if key a should be nearer the root than key b.
+        self.comes_before: Callable[[Any, Any], bool] = operator.lt if min_heap else operator.gt
 
     def __len__(self) -> int:
         return self.length
 
+    @property
+    def capacity(self) -> int:
+        return len(self.the_array) - 1
+
     def is_full(self) -> bool:
-        return self.length + 1 == len(self.the_array)
+        """
+        True if add would fail, which never happens to a growable heap.
+        """
+        return not self.growable and self.length + 1 == len(self.the_array)
+
+    def __resize(self, capacity: int) -> None:
+        """
+        Moves the elements into an array with room for capacity elements.
+
+        Complexity:
+            O(n) where n is the number of elements currently in the heap
+        """
+        new_array: ArrayR[T] = ArrayR(capacity + 1)
+        for i in range(1, self.length + 1):
+            new_array[i] = self.the_array[i]
+        if self.key is not None:
+            new_keys: ArrayR = ArrayR(capacity + 1)
+            for i in range(1, self.length + 1):
+                new_keys[i] = self.the_keys[i]
+            self.the_keys = new_keys
+        else:
+            self.the_keys = new_array
+        self.the_array = new_array
+
+    def __move(self, source: int, target: int) -> None:
+        """ Copies the element at index source, and its key, to index target. """
+        self.the_array[target] = self.the_array[source]
+        if self.key is not None:
+            self.the_keys[target] = self.the_keys[source]
 
     def rise(self, k: int) -> None:
         """
@@ -45,10 +101,12 @@ class MaxHeap(Generic[T]):
             n is the number of elements currently in the heap
         """
         item: T = self.the_array[k]
-        while k > 1 and item > self.the_array[k // 2]:
-            self.the_array[k] = self.the_array[k // 2]
+        item_key = self.the_keys[k]
+        while k > 1 and self.comes_before(item_key, self.the_keys[k // 2]):
+            self.__move(k // 2, k)
             k = k // 2
         self.the_array[k] = item
+        self.the_keys[k] = item_key
 
     def add(self, element: T) -> None:
         """
@@ -58,17 +116,25 @@ class MaxHeap(Generic[T]):
             Best case complexity: O(1) - No rising required
             Worst case complexity: O(logn) - New largest element (rises to the root)
             n is the number of elements currently in the heap
+            A growable heap that is full first doubles its array, O(n), which is O(1) amortised.
+
+        Raises:
+            IndexError: if a fixed-capacity heap is full
         """
-        if self.is_full():
-            raise IndexError
+        if self.length == self.capacity:
+            if not self.growable:
+                raise IndexError("Heap is full.")
+            self.__resize(2 * self.capacity)
 
         self.length += 1
         self.the_array[self.length] = element
+        if self.key is not None:
+            self.the_keys[self.length] = self.key(element)
         self.rise(self.length)
 
     def largest_child(self, k: int) -> int:
         """
-        Returns the index of k's child with greatest value.
+        Returns the index of k's child that should be nearer the root (the greatest key, or the smallest for a min heap).
 
         Pre-condition:
             1 <= k <= self.length // 2
@@ -77,7 +143,7 @@ class MaxHeap(Generic[T]):
             O(comp) where comp is the cost of comparing two elements in the heap
         """
         if 2 * k == self.length or \
-                self.the_array[2 * k] > self.the_array[2 * k + 1]:
+                self.comes_before(self.the_keys[2 * k], self.the_keys[2 * k + 1]):
             return 2 * k
         else:
             return 2 * k + 1
@@ -95,47 +161,69 @@ class MaxHeap(Generic[T]):
             n is the number of elements currently in the heap
         """
         item: T = self.the_array[k]
+        item_key = self.the_keys[k]
 
         while 2 * k <= self.length:
             max_child: int = self.largest_child(k)
-            if self.the_array[max_child] <= item:
+            if not self.comes_before(self.the_keys[max_child], item_key):
                 break
-            self.the_array[k] = self.the_array[max_child]
+            self.__move(max_child, k)
             k = max_child
 
         self.the_array[k] = item
+        self.the_keys[k] = item_key
 
     def get_max(self) -> T:
         """
-            Remove (and return) the maximum element from the heap.
+            Remove (and return) the maximum element from the heap,
+            the one with the largest key (or the smallest key for a min heap).
 
             Complexity:
                 Best case complexity: O(1)
                 Worst case complexity: O(logn)
                 n is the number of elements currently in the heap
+                A shrinking heap down to a quarter full halves its array, O(n), which is O(1) amortised.
+
+            Raises:
+                IndexError: if the heap is empty
         """
         if self.length == 0:
-            raise IndexError
+            raise IndexError("Heap is empty.")
 
         max_elt = self.the_array[1]
         self.length -= 1
         if self.length > 0:
-            self.the_array[1] = self.the_array[self.length + 1]
+            self.__move(self.length + 1, 1)
             self.sink(1)
+        # Drop the reference to the moved element, so that the array does not keep it alive.
+        self.the_array[self.length + 1] = None
+        self.the_keys[self.length + 1] = None
+        if self.shrink and self.length <= self.capacity // 4 and self.capacity // 2 >= self.min_capacity:
+            self.__resize(self.capacity // 2)
         return max_elt
 
     @staticmethod
-    def heapify(points: ArrayR[T] | ArrayList[T], overwrite_size: int = 0) -> MaxHeap[T]:
+    def heapify(points: ArrayR[T] | ArrayList[T], overwrite_size: int = 0,
+                key: Callable[[T], Any] = None, min_heap: bool = False) -> MaxHeap[T]:
         """
+        Builds a heap of the points: growable and sized to fit them exactly,
+        or with a fixed capacity of overwrite_size if it is given.
+        See __init__ for key and min_heap; each key is computed once.
+
         Complexity:
             Best case complexity: O(n)
             Worst case complexity: O(n)
             n is the number of elements inside points.
         """
-        new_heap = MaxHeap(overwrite_size or (2 * len(points) + 2))
+        if overwrite_size:
+            new_heap = MaxHeap(overwrite_size, key=key, min_heap=min_heap)
+        else:
+            new_heap = MaxHeap(initial_capacity=len(points), key=key, min_heap=min_heap)
         new_heap.length = len(points)
         for i in range(len(points)):
             new_heap.the_array[i + 1] = points[i]
+            if key is not None:
+                new_heap.the_keys[i + 1] = key(points[i])
         for k in range(len(points), 0, -1):
             new_heap.sink(k)
         return new_heap
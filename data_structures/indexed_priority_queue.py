@@ -0,0 +1,238 @@
+"""Indexed priority queue: a binary heap that knows where each of its items is"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import operator
+from typing import Any, Callable, Generic
+
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import builtin_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.referential_array import ArrayR, T
+
+
+class IndexedPriorityQueue(Generic[T]):
+    """
+    A priority queue of distinct (hashable) items, each with a priority.
+    Like MaxHeap it is an array-based binary heap, with a parallel array of priorities,
+    but it also keeps a hash table from each item to its index in the heap, updated
+    on every move, so that a queued item can have its priority changed or be removed
+    without searching for it and without queueing duplicates.
+
+    The largest priority comes out first, or the smallest with min_heap set (as for
+    shortest paths). The array doubles when full, as in a growable MaxHeap.
+
+    Unless stated otherwise, all methods have O(1) average complexity,
+    on top of that of hashing the item.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, min_heap: bool = False, hash_function: Callable[[T], int] = builtin_hash) -> None:
+        """
+        Args:
+            min_heap(bool): Whether the smallest priority comes out first instead of the largest
+            hash_function(Callable): Maps an item to a non-negative hash code, see hash_functions
+        """
+        self.length: int = 0
+        self.the_array: ArrayR[T] = ArrayR(self.MIN_CAPACITY + 1)
+        self.the_priorities: ArrayR = ArrayR(self.MIN_CAPACITY + 1)
+        self.positions: HashTable[T, int] = LinearProbeTable(hash_function=hash_function)
+        # comes_before(a, b) is True if priority a should be nearer the root than priority b.
+        self.comes_before: Callable[[Any, Any], bool] = operator.lt if min_heap else operator.gt
+
+    def __len__(self) -> int:
+        return self.length
+
+    def is_empty(self) -> bool:
+        return self.length == 0
+
+    def __contains__(self, item: T) -> bool:
+        """ True if the item is queued. """
+        return item in self.positions
+
+    def priority(self, item: T) -> Any:
+        """
+        Returns the priority of a queued item.
+
+        Raises:
+            KeyError: if the item is not queued
+        """
+        return self.the_priorities[self.positions[item]]
+
+    def __resize(self, capacity: int) -> None:
+        """
+        Moves the items and priorities into arrays with room for capacity items.
+
+        Complexity:
+            O(n) where n is the number of items currently in the queue
+        """
+        new_array: ArrayR[T] = ArrayR(capacity + 1)
+        new_priorities: ArrayR = ArrayR(capacity + 1)
+        for i in range(1, self.length + 1):
+            new_array[i] = self.the_array[i]
+            new_priorities[i] = self.the_priorities[i]
+        self.the_array = new_array
+        self.the_priorities = new_priorities
+
+    def __place(self, k: int, item: T, priority: Any) -> None:
+        """ Stores an item and its priority at index k, and records that index. """
+        self.the_array[k] = item
+        self.the_priorities[k] = priority
+        self.positions[item] = k
+
+    def rise(self, k: int) -> None:
+        """
+        Rise the item at index k to its correct position
+
+        Pre-condition:
+            1 <= k <= self.length
+
+        Complexity:
+            Best case complexity: O(1) - Rising the root item
+            Worst case complexity: O(logn) - Rising a leaf item
+            n is the number of items currently in the queue
+        """
+        item: T = self.the_array[k]
+        priority = self.the_priorities[k]
+        while k > 1 and self.comes_before(priority, self.the_priorities[k // 2]):
+            self.__place(k, self.the_array[k // 2], self.the_priorities[k // 2])
+            k = k // 2
+        self.__place(k, item, priority)
+
+    def first_child(self, k: int) -> int:
+        """
+        Returns the index of k's child that should be nearer the root.
+
+        Pre-condition:
+            1 <= k <= self.length // 2
+        """
+        if 2 * k == self.length or \
+                self.comes_before(self.the_priorities[2 * k], self.the_priorities[2 * k + 1]):
+            return 2 * k
+        else:
+            return 2 * k + 1
+
+    def sink(self, k: int) -> None:
+        """
+        Make the item at index k sink to the correct position.
+
+        Pre-condition:
+            1 <= k <= self.length
+
+        Complexity:
+            Best case complexity: O(1) - No sinking required
+            Worst case complexity: O(logn) - Sinking the root item to the bottom
+            n is the number of items currently in the queue
+        """
+        item: T = self.the_array[k]
+        priority = self.the_priorities[k]
+
+        while 2 * k <= self.length:
+            child: int = self.first_child(k)
+            if not self.comes_before(self.the_priorities[child], priority):
+                break
+            self.__place(k, self.the_array[child], self.the_priorities[child])
+            k = child
+
+        self.__place(k, item, priority)
+
+    def add(self, item: T, priority: Any) -> None:
+        """
+        Queues an item with the given priority.
+
+        Complexity:
+            O(logn) amortised, where n is the number of items currently in the queue
+
+        Raises:
+            ValueError: if the item is already queued, see update_priority
+        """
+        if item in self.positions:
+            raise ValueError(f"{item!r} is already queued.")
+        if self.length + 1 == len(self.the_array):
+            self.__resize(2 * (len(self.the_array) - 1))
+
+        self.length += 1
+        self.__place(self.length, item, priority)
+        self.rise(self.length)
+
+    def update_priority(self, item: T, priority: Any) -> None:
+        """
+        Changes the priority of a queued item (a decrease-key, or an increase-key),
+        moving it up or down the heap as needed.
+
+        Complexity:
+            O(logn) where n is the number of items currently in the queue
+
+        Raises:
+            KeyError: if the item is not queued
+        """
+        k = self.positions[item]
+        self.the_priorities[k] = priority
+        self.rise(k)
+        self.sink(self.positions[item])
+
+    def add_or_update(self, item: T, priority: Any) -> None:
+        """
+        Queues the item, or changes its priority if it is already queued.
+
+        Complexity:
+            O(logn) amortised, where n is the number of items currently in the queue
+        """
+        if item in self.positions:
+            self.update_priority(item, priority)
+        else:
+            self.add(item, priority)
+
+    def remove(self, item: T) -> Any:
+        """
+        Removes a queued item, wherever it is in the heap, and returns its priority.
+        The last item of the heap takes its place and rises or sinks from there.
+
+        Complexity:
+            O(logn) where n is the number of items currently in the queue
+
+        Raises:
+            KeyError: if the item is not queued
+        """
+        k = self.positions[item]
+        priority = self.the_priorities[k]
+        del self.positions[item]
+        last = self.length
+        self.length -= 1
+        if k != last:
+            moved = self.the_array[last]
+            self.__place(k, moved, self.the_priorities[last])
+            self.rise(k)
+            self.sink(self.positions[moved])
+        self.the_array[last] = None
+        self.the_priorities[last] = None
+        return priority
+
+    def peek(self) -> tuple[T, Any]:
+        """
+        Returns the first item (the one with the largest priority, or the smallest
+        for a min heap) and its priority, without removing it.
+
+        Raises:
+            IndexError: if the queue is empty
+        """
+        if self.length == 0:
+            raise IndexError("Priority queue is empty.")
+        return self.the_array[1], self.the_priorities[1]
+
+    def pop(self) -> tuple[T, Any]:
+        """
+        Removes the first item and returns it with its priority.
+
+        Complexity:
+            Best case complexity: O(1)
+            Worst case complexity: O(logn)
+            n is the number of items currently in the queue
+
+        Raises:
+            IndexError: if the queue is empty
+        """
+        item, priority = self.peek()
+        self.remove(item)
+        return item, priority
@@ -0,0 +1,253 @@
+""" Bounded cache that evicts the least recently used entries.
+
+LRUCache keeps its entries in a doubly linked list ordered from most to least
+recently used, and a hash table from each key to its node, so lookups,
+moving an entry to the front and evicting from the back are all O(1).
+
+lru_cache is the decorator form, memoising a function with an LRUCache.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import sys
+from typing import Callable, Generic, TypeVar
+
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import builtin_hash
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.node import DoublyLinkedNode
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+# Separates the positional from the keyword arguments in the keys of lru_cache,
+# so that no tuple of positional arguments alone can look like a call with keywords.
+_KWARGS_MARK = object()
+
+
+def estimate_size(key: object, value: object) -> int:
+    """
+    Shallow estimate of the bytes used by an entry: the objects themselves, not what they refer to.
+    :complexity: O(1)
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class _CacheNode(DoublyLinkedNode, Generic[K, V]):
+    """ Node of the recency list, holding one entry and its estimated size. """
+
+    def __init__(self, key: K, value: V, size: int) -> None:
+        DoublyLinkedNode.__init__(self)
+        self.key = key
+        self.value = value
+        self.size = size
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Least Recently Used cache.
+    Maps keys to values like a HashTable, but holds at most max_entries entries
+    and/or about max_bytes bytes, as estimated by the size function. Storing an
+    entry that breaks a limit evicts the least recently used entries first.
+    Reading or writing an entry makes it the most recently used; `in` does not.
+
+    Type Arguments:
+        - K:    Key Type. Must suit the hash function, any hashable key for the default one.
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity,
+    on top of that of the hash function and the table lookups.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None,
+                 size_function: Callable[[K, V], int] = estimate_size,
+                 hash_function: Callable[[K], int] = builtin_hash) -> None:
+        """
+        :param max_entries: largest number of entries, None for no limit.
+        :param max_bytes: largest total estimated size of the entries, None for no limit.
+        :param size_function: estimates the size of an entry in bytes, only used with max_bytes.
+        :param hash_function: maps a key to a non-negative hash code, see hash_functions.
+        :raises ValueError: if neither limit is given or a limit is not positive.
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("LRUCache needs max_entries, max_bytes or both.")
+        if (max_entries is not None and max_entries <= 0) or (max_bytes is not None and max_bytes <= 0):
+            raise ValueError("Cache limits should be positive.")
+
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__size_function = size_function
+        self.__hash_function = hash_function
+        self.__table: HashTable[K, _CacheNode[K, V]] = LinearProbeTable(hash_function=hash_function)
+        # Most recently used at the front, least recently used at the rear.
+        self.__front = None
+        self.__rear = None
+        self.__bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    def is_empty(self) -> bool:
+        return len(self.__table) == 0
+
+    @property
+    def bytes(self) -> int:
+        """ Estimated size of the entries, 0 unless max_bytes is set. """
+        return self.__bytes
+
+    def __contains__(self, key: K) -> bool:
+        """
+        Checks whether a key is cached, without counting a hit or miss or changing its recency.
+        """
+        return key in self.__table
+
+    def __getitem__(self, key: K) -> V:
+        """
+        Returns the value at key and makes it the most recently used entry.
+        :raises KeyError: when the key is not cached.
+        """
+        try:
+            node = self.__table[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self.__unlink(node)
+        self.__push_front(node)
+        return node.value
+
+    def get(self, key: K, default: V = None) -> V:
+        """
+        Returns the value at key, or default if it is not cached. See __getitem__.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        """
+        Stores value at key as the most recently used entry, then evicts the least
+        recently used entries until the cache is within its limits.
+        A value whose size alone is over max_bytes is not cached (and any old value at key is dropped).
+        :complexity: O(E) where E is the number of entries evicted.
+        """
+        size = self.__size_function(key, value) if self.__max_bytes is not None else 0
+        try:
+            node = self.__table[key]
+        except KeyError:
+            node = _CacheNode(key, value, size)
+            self.__table[key] = node
+        else:
+            self.__unlink(node)
+            self.__bytes -= node.size
+            node.value = value
+            node.size = size
+        self.__push_front(node)
+        self.__bytes += size
+
+        if self.__max_bytes is not None and size > self.__max_bytes:
+            del self[key]
+        while self.__over_limit():
+            self.__evict()
+
+    def __delitem__(self, key: K) -> None:
+        """
+        Removes the entry at key.
+        :raises KeyError: when the key is not cached.
+        """
+        node = self.__table[key]
+        del self.__table[key]
+        self.__unlink(node)
+        self.__bytes -= node.size
+
+    def clear(self) -> None:
+        """
+        Removes every entry. The hit and miss counters are kept.
+        """
+        self.__table = LinearProbeTable(hash_function=self.__hash_function)
+        self.__front = None
+        self.__rear = None
+        self.__bytes = 0
+
+    def __over_limit(self) -> bool:
+        return ((self.__max_entries is not None and len(self.__table) > self.__max_entries) or
+                (self.__max_bytes is not None and self.__bytes > self.__max_bytes))
+
+    def __evict(self) -> None:
+        """
+        Removes the least recently used entry.
+        """
+        del self[self.__rear.key]
+
+    def __unlink(self, node: _CacheNode[K, V]) -> None:
+        """
+        Takes a node out of the recency list.
+        """
+        if node.previous is None:
+            self.__front = node.link
+        else:
+            node.previous.link = node.link
+        if node.link is None:
+            self.__rear = node.previous
+        else:
+            node.link.previous = node.previous
+        node.previous = None
+        node.link = None
+
+    def __push_front(self, node: _CacheNode[K, V]) -> None:
+        """
+        Puts an unlinked node at the front of the recency list.
+        """
+        node.link = self.__front
+        if self.__front is None:
+            self.__rear = node
+        else:
+            self.__front.previous = node
+        self.__front = node
+
+    def __str__(self) -> str:
+        """
+        Returns the key/value pairs from the most to the least recently used.
+        :complexity: O(N * (str(key) + str(value))) where N is the number of entries.
+        """
+        result = ""
+        current = self.__front
+        while current is not None:
+            result += "(" + str(current.key) + "," + str(current.value) + ")\n"
+            current = current.link
+        return result
+
+
+def lru_cache(max_entries: int = None, max_bytes: int = None,
+              size_function: Callable[[object, object], int] = estimate_size) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching the results of a function in an LRUCache, see LRUCache for the arguments.
+    The arguments of each call must be hashable; keyword arguments are part of the key.
+    The cache is available as the `cache` attribute of the decorated function.
+
+    Usage:
+        @lru_cache(max_entries=1000)
+        def path_cost(start, end): ...
+    """
+    def decorator(function: Callable) -> Callable:
+        cache = LRUCache(max_entries, max_bytes, size_function)
+
+        def wrapper(*args, **kwargs):
+            key = args if not kwargs else args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            try:
+                return cache[key]
+            except KeyError:
+                result = function(*args, **kwargs)
+                cache[key] = result
+                return result
+
+        wrapper.cache = cache
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    return decorator
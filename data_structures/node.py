@@ -1,4 +1,4 @@
-""" Implementation of a node in linked lists and binary search trees. """
+""" Implementation of the nodes in (singly and doubly) linked lists and binary search trees. """
 
 from typing import Generic, TypeVar
 
@@ -44,6 +44,18 @@ class TreeNode(Generic[K, I]):
         return str(self)
 
 
+class AVLTreeNode(TreeNode[K, I]):
+    """ BST node that also records the height of its subtree, for self-balancing trees. """
+
+    def __init__(self, key: K, item: I = None, depth: int = 0) -> None:
+        """
+            Initialises a leaf node, whose subtree has height 1.
+            :complexity: O(1)
+        """
+        TreeNode.__init__(self, key, item, depth)
+        self.height = 1
+
+
 class Node(Generic[T]):
     """ Simple linked node. It contains an item and has a reference to next node. """
 
@@ -51,3 +63,13 @@ class Node(Generic[T]):
         """ Node initialiser. """
         self.item = item
         self.link = None
+
+
+class DoublyLinkedNode(Generic[T]):
+    """ Linked node with references to both the previous and the next node. """
+
+    def __init__(self, item: T = None) -> None:
+        """ Node initialiser. """
+        self.item = item
+        self.previous = None
+        self.link = None
@@ -0,0 +1,614 @@
+""" Compressed bitmap set of non-negative integers, in the style of Roaring bitmaps.
+
+The id space is split into chunks of 2^16 ids, keyed by the high bits of an id.
+Each non-empty chunk keeps the low 16 bits of its members in a container:
+    - an array container, a sorted list of the lows, while the chunk holds at most ARRAY_MAX members,
+    - a bitmap container, a 2^16-bit integer mask, once it holds more.
+Sparse ids therefore cost a few bytes each, dense runs one bit each, and set
+operations only combine the chunks that both sets (or either set) actually use.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Iterator
+
+from data_structures.abstract_set import Set
+from data_structures.array_list import ArrayList
+from data_structures.referential_array import ArrayR
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+LOW_MASK = CHUNK_SIZE - 1
+# Beyond this many members an array container would take more space than a bitmap (2 bytes per member vs 8KB).
+ARRAY_MAX = 4096
+# Bytes of a serialised bitmap container.
+BITMAP_BYTES = CHUNK_SIZE // 8
+# Bytes of a serialised chunk key, which bounds the ids to below 2^(CHUNK_BITS + 8 * KEY_BYTES).
+KEY_BYTES = 4
+MAX_ID = (1 << (CHUNK_BITS + 8 * KEY_BYTES)) - 1
+
+# Container kinds in the serialised form.
+_ARRAY_KIND = 0
+_BITMAP_KIND = 1
+
+
+def _search(values: ArrayList[int], item: int) -> int:
+    """
+    Binary search for item among sorted values.
+    :returns: the position of item, or of the first larger value if item is missing.
+    :complexity: O(log N) where N is the number of values.
+    """
+    low = 0
+    high = len(values)
+    while low < high:
+        mid = (low + high) // 2
+        if values[mid] < item:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class _ArrayContainer:
+    """
+    The members of a sparse chunk, as their lows in increasing order.
+    """
+
+    def __init__(self, values: ArrayList[int] = None) -> None:
+        """
+        :param values: the lows, already sorted and distinct.
+        """
+        self.__values = values if values is not None else ArrayList()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __iter__(self) -> Iterator[int]:
+        for i in range(len(self.__values)):
+            yield self.__values[i]
+
+    def __contains__(self, low: int) -> bool:
+        """
+        :complexity: O(log N) where N is the number of members.
+        """
+        position = _search(self.__values, low)
+        return position < len(self.__values) and self.__values[position] == low
+
+    def add(self, low: int) -> bool:
+        """
+        Adds a low, returning whether it was missing.
+        :complexity: O(N) for the shift, O(log N) when appending in increasing order.
+        """
+        position = _search(self.__values, low)
+        if position < len(self.__values) and self.__values[position] == low:
+            return False
+        self.__values.insert(position, low)
+        return True
+
+    def remove(self, low: int) -> bool:
+        """
+        Removes a low, returning whether it was there.
+        :complexity: O(N) for the shift.
+        """
+        position = _search(self.__values, low)
+        if position < len(self.__values) and self.__values[position] == low:
+            self.__values.delete_at_index(position)
+            return True
+        return False
+
+    def rank(self, low: int) -> int:
+        """
+        Number of members no larger than low.
+        :complexity: O(log N)
+        """
+        return _search(self.__values, low + 1)
+
+    def select(self, index: int) -> int:
+        """ The member at index in increasing order. """
+        return self.__values[index]
+
+    def mask(self) -> int:
+        """
+        The members as a bitmask.
+        :complexity: O(N + CHUNK_SIZE / 8)
+        """
+        data = bytearray(BITMAP_BYTES)
+        for i in range(len(self.__values)):
+            low = self.__values[i]
+            data[low >> 3] |= 1 << (low & 7)
+        return int.from_bytes(data, 'little')
+
+    def union(self, other: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | _BitmapContainer:
+        """
+        :complexity: O(N + M) as a merge of two small arrays, else that of converting to bitmaps.
+        """
+        if not isinstance(other, _ArrayContainer) or len(self) + len(other) > ARRAY_MAX:
+            return _from_mask(self.mask() | other.mask())
+        mine, theirs = self.__values, other.__values
+        res = ArrayList(len(mine) + len(theirs))
+        i = j = 0
+        while i < len(mine) and j < len(theirs):
+            if mine[i] < theirs[j]:
+                res.append(mine[i])
+                i += 1
+            elif mine[i] > theirs[j]:
+                res.append(theirs[j])
+                j += 1
+            else:
+                res.append(mine[i])
+                i += 1
+                j += 1
+        for k in range(i, len(mine)):
+            res.append(mine[k])
+        for k in range(j, len(theirs)):
+            res.append(theirs[k])
+        return _ArrayContainer(res)
+
+    def intersection(self, other: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | None:
+        """
+        :complexity: O(N * contains(other)) where N is the number of members.
+        """
+        return self.__filter(other, True)
+
+    def difference(self, other: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | None:
+        """
+        :complexity: O(N * contains(other)) where N is the number of members.
+        """
+        return self.__filter(other, False)
+
+    def __filter(self, other: _ArrayContainer | _BitmapContainer, keep_common: bool) -> _ArrayContainer | None:
+        """
+        The members that are (keep_common) or are not (not keep_common) in other, None if there are none.
+        """
+        res = ArrayList(len(self.__values))
+        for i in range(len(self.__values)):
+            low = self.__values[i]
+            if (low in other) == keep_common:
+                res.append(low)
+        return _ArrayContainer(res) if len(res) > 0 else None
+
+    def serialise(self, data: bytearray) -> None:
+        """ Appends the number of members less one, then each low, as 2-byte little-endian integers. """
+        data += (len(self.__values) - 1).to_bytes(2, 'little')
+        for i in range(len(self.__values)):
+            data += self.__values[i].to_bytes(2, 'little')
+
+
+class _BitmapContainer:
+    """
+    The members of a dense chunk, as a CHUNK_SIZE-bit mask and a count of its set bits.
+    """
+
+    def __init__(self, mask: int, cardinality: int) -> None:
+        self.__mask = mask
+        self.__cardinality = cardinality
+
+    def __len__(self) -> int:
+        return self.__cardinality
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yields the lows in increasing order, a 64-bit word at a time.
+        :complexity: O(CHUNK_SIZE / 64 + N) where N is the number of members.
+        """
+        data = self.__mask.to_bytes(BITMAP_BYTES, 'little')
+        for start in range(0, BITMAP_BYTES, 8):
+            word = int.from_bytes(data[start:start + 8], 'little')
+            while word:
+                lowest = word & -word
+                yield start * 8 + lowest.bit_length() - 1
+                word ^= lowest
+
+    def __contains__(self, low: int) -> bool:
+        return (self.__mask >> low) & 1 == 1
+
+    def add(self, low: int) -> bool:
+        """
+        Adds a low, returning whether it was missing.
+        :complexity: O(CHUNK_SIZE / 64) to rebuild the mask, done in C.
+        """
+        if low in self:
+            return False
+        self.__mask |= 1 << low
+        self.__cardinality += 1
+        return True
+
+    def remove(self, low: int) -> bool:
+        """
+        Removes a low, returning whether it was there.
+        :complexity: O(CHUNK_SIZE / 64) to rebuild the mask, done in C.
+        """
+        if low not in self:
+            return False
+        self.__mask ^= 1 << low
+        self.__cardinality -= 1
+        return True
+
+    def rank(self, low: int) -> int:
+        """
+        Number of members no larger than low, a population count of the bits up to it.
+        :complexity: O(CHUNK_SIZE / 64), done in C.
+        """
+        return (self.__mask & ((2 << low) - 1)).bit_count()
+
+    def select(self, index: int) -> int:
+        """
+        The member at index in increasing order, found by counting whole words first.
+        :complexity: O(CHUNK_SIZE / 64)
+        """
+        data = self.__mask.to_bytes(BITMAP_BYTES, 'little')
+        for start in range(0, BITMAP_BYTES, 8):
+            word = int.from_bytes(data[start:start + 8], 'little')
+            count = word.bit_count()
+            if index < count:
+                for _ in range(index):
+                    word &= word - 1
+                return start * 8 + (word & -word).bit_length() - 1
+            index -= count
+        raise IndexError("Select index out of range.")
+
+    def mask(self) -> int:
+        return self.__mask
+
+    def union(self, other: _ArrayContainer | _BitmapContainer) -> _BitmapContainer:
+        """
+        :complexity: O(CHUNK_SIZE / 64), plus that of other.mask().
+        """
+        mask = self.__mask | other.mask()
+        return _BitmapContainer(mask, mask.bit_count())
+
+    def intersection(self, other: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | _BitmapContainer | None:
+        """
+        :complexity: O(CHUNK_SIZE / 64) for two bitmaps, see _ArrayContainer.intersection otherwise.
+        """
+        if isinstance(other, _ArrayContainer):
+            return other.intersection(self)
+        return _from_mask(self.__mask & other.__mask)
+
+    def difference(self, other: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | _BitmapContainer | None:
+        """
+        :complexity: O(CHUNK_SIZE / 64), plus that of other.mask().
+        """
+        return _from_mask(self.__mask & ~other.mask())
+
+    def serialise(self, data: bytearray) -> None:
+        """ Appends the mask as BITMAP_BYTES little-endian bytes. """
+        data += self.__mask.to_bytes(BITMAP_BYTES, 'little')
+
+
+def _from_mask(mask: int) -> _ArrayContainer | _BitmapContainer | None:
+    """
+    The best container for the members of a mask, None if it is empty.
+    :complexity: O(CHUNK_SIZE / 64 + N) where N is the number of members.
+    """
+    cardinality = mask.bit_count()
+    if cardinality == 0:
+        return None
+    if cardinality > ARRAY_MAX:
+        return _BitmapContainer(mask, cardinality)
+    values = ArrayList(cardinality)
+    for low in _BitmapContainer(mask, cardinality):
+        values.append(low)
+    return _ArrayContainer(values)
+
+
+class RoaringBitmapSet(Set[int]):
+    """
+    A compressed bitmap implementation of the set ADT, for integers from 0 to MAX_ID (2^48 - 1).
+    The chunk keys (the ids shifted right by CHUNK_BITS) are kept sorted, next to
+    their containers, so chunks are found by binary search and set operations
+    merge the two lists of chunks.
+
+    Unless stated otherwise, all methods have O(log C) complexity for the C
+    non-empty chunks, plus that of the container operation.
+    """
+
+    def __init__(self) -> None:
+        Set.__init__(self)
+        self.__keys: ArrayList[int] = ArrayList()
+        self.__containers: ArrayList[_ArrayContainer | _BitmapContainer] = ArrayList()
+        self.__length = 0
+
+    @staticmethod
+    def __check(item: int) -> None:
+        if not isinstance(item, int) or item < 0 or item > MAX_ID:
+            raise TypeError(f'Set elements should be integers from 0 to {MAX_ID}.')
+
+    def __find(self, key: int) -> int:
+        """
+        Position of the container for a chunk key, or -1 if that chunk is empty.
+        """
+        position = _search(self.__keys, key)
+        if position < len(self.__keys) and self.__keys[position] == key:
+            return position
+        return -1
+
+    def clear(self) -> None:
+        """ Makes the set empty. """
+        self.__keys = ArrayList()
+        self.__containers = ArrayList()
+        self.__length = 0
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return self.__length == 0
+
+    def __len__(self) -> int:
+        """
+        Number of elements, kept up to date by every change.
+        :complexity: O(1)
+        """
+        return self.__length
+
+    def __contains__(self, item: int) -> bool:
+        """
+        True if the set contains the item. False otherwise.
+        :raises TypeError: if the item is not an integer from 0 to MAX_ID.
+        """
+        self.__check(item)
+        position = self.__find(item >> CHUNK_BITS)
+        return position >= 0 and (item & LOW_MASK) in self.__containers[position]
+
+    def add(self, item: int) -> None:
+        """
+        Adds an element to the set, turning its array container into a bitmap past ARRAY_MAX members.
+        :raises TypeError: if the item is not an integer from 0 to MAX_ID.
+        :complexity: O(C) to insert a new chunk, else see _ArrayContainer.add and _BitmapContainer.add.
+        """
+        self.__check(item)
+        key = item >> CHUNK_BITS
+        position = _search(self.__keys, key)
+        if position == len(self.__keys) or self.__keys[position] != key:
+            self.__keys.insert(position, key)
+            self.__containers.insert(position, _ArrayContainer())
+        container = self.__containers[position]
+        if container.add(item & LOW_MASK):
+            self.__length += 1
+            if isinstance(container, _ArrayContainer) and len(container) > ARRAY_MAX:
+                self.__containers[position] = _BitmapContainer(container.mask(), len(container))
+
+    def remove(self, item: int) -> None:
+        """
+        Removes an element from the set, turning its bitmap container back into
+        an array at ARRAY_MAX members and dropping the chunk once it is empty.
+        :raises TypeError: if the item is not an integer from 0 to MAX_ID.
+        :raises KeyError: if the item is not in the set.
+        :complexity: O(C) to drop a chunk, else see _ArrayContainer.remove and _BitmapContainer.remove.
+        """
+        self.__check(item)
+        position = self.__find(item >> CHUNK_BITS)
+        if position < 0 or not self.__containers[position].remove(item & LOW_MASK):
+            raise KeyError(item)
+        self.__length -= 1
+        container = self.__containers[position]
+        if len(container) == 0:
+            self.__keys.delete_at_index(position)
+            self.__containers.delete_at_index(position)
+        elif isinstance(container, _BitmapContainer) and len(container) <= ARRAY_MAX:
+            self.__containers[position] = _from_mask(container.mask())
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yields the elements in increasing order. The set should not be changed meanwhile.
+        :complexity: O(N + C * CHUNK_SIZE / 64) where N is the number of elements.
+        """
+        for i in range(len(self.__keys)):
+            base = self.__keys[i] << CHUNK_BITS
+            for low in self.__containers[i]:
+                yield base | low
+
+    def values(self) -> ArrayR[int]:
+        """
+        Returns the elements of the set as an array, in increasing order.
+        :complexity: see __iter__.
+        """
+        res = ArrayR(self.__length)
+        count = 0
+        for item in self:
+            res[count] = item
+            count += 1
+        return res
+
+    def rank(self, item: int) -> int:
+        """
+        Number of elements no larger than item (which need not be in the set).
+        :raises TypeError: if the item is not an integer from 0 to MAX_ID.
+        :complexity: O(C) plus that of the container rank.
+        """
+        self.__check(item)
+        key = item >> CHUNK_BITS
+        res = 0
+        for i in range(len(self.__keys)):
+            if self.__keys[i] < key:
+                res += len(self.__containers[i])
+            else:
+                if self.__keys[i] == key:
+                    res += self.__containers[i].rank(item & LOW_MASK)
+                break
+        return res
+
+    def select(self, index: int) -> int:
+        """
+        The element at index in increasing order, so that select(rank(x) - 1) == x for every element x.
+        :raises IndexError: if index is not in [0, len(self)).
+        :complexity: O(C) plus that of the container select.
+        """
+        if index < 0 or index >= self.__length:
+            raise IndexError("Select index out of range.")
+        for i in range(len(self.__keys)):
+            container = self.__containers[i]
+            if index < len(container):
+                return (self.__keys[i] << CHUNK_BITS) | container.select(index)
+            index -= len(container)
+
+    def __build(self, keys: ArrayList[int], containers: ArrayList[_ArrayContainer | _BitmapContainer]) -> None:
+        """ Fills an empty set from sorted chunk keys and their (non-empty) containers. """
+        self.__keys = keys
+        self.__containers = containers
+        self.__length = 0
+        for i in range(len(containers)):
+            self.__length += len(containers[i])
+
+    def union(self, other: RoaringBitmapSet) -> RoaringBitmapSet:
+        """
+        Creates the union of the set with another one.
+        Chunks in only one of the sets are copied, so that later changes to either set leave the result alone.
+        :complexity: O(C1 + C2) for the merge, plus the container unions of the common chunks.
+        """
+        keys = ArrayList(len(self.__keys) + len(other.__keys))
+        containers = ArrayList(len(self.__keys) + len(other.__keys))
+        i = j = 0
+        while i < len(self.__keys) or j < len(other.__keys):
+            if j == len(other.__keys) or (i < len(self.__keys) and self.__keys[i] < other.__keys[j]):
+                keys.append(self.__keys[i])
+                containers.append(self.__copy(self.__containers[i]))
+                i += 1
+            elif i == len(self.__keys) or other.__keys[j] < self.__keys[i]:
+                keys.append(other.__keys[j])
+                containers.append(self.__copy(other.__containers[j]))
+                j += 1
+            else:
+                keys.append(self.__keys[i])
+                containers.append(self.__containers[i].union(other.__containers[j]))
+                i += 1
+                j += 1
+        res = RoaringBitmapSet()
+        res.__build(keys, containers)
+        return res
+
+    def intersection(self, other: RoaringBitmapSet) -> RoaringBitmapSet:
+        """
+        Creates the intersection of the set with another one.
+        :complexity: O(C1 + C2) for the merge, plus the container intersections of the common chunks.
+        """
+        keys = ArrayList(min(len(self.__keys), len(other.__keys)) + 1)
+        containers = ArrayList(min(len(self.__keys), len(other.__keys)) + 1)
+        i = j = 0
+        while i < len(self.__keys) and j < len(other.__keys):
+            if self.__keys[i] < other.__keys[j]:
+                i += 1
+            elif self.__keys[i] > other.__keys[j]:
+                j += 1
+            else:
+                container = self.__containers[i].intersection(other.__containers[j])
+                if container is not None:
+                    keys.append(self.__keys[i])
+                    containers.append(container)
+                i += 1
+                j += 1
+        res = RoaringBitmapSet()
+        res.__build(keys, containers)
+        return res
+
+    def difference(self, other: RoaringBitmapSet) -> RoaringBitmapSet:
+        """
+        Creates the difference of the set with another one, i.e. self - other.
+        :complexity: O(C1 + C2) for the merge, plus the container differences of the common chunks.
+        """
+        keys = ArrayList(len(self.__keys) + 1)
+        containers = ArrayList(len(self.__keys) + 1)
+        j = 0
+        for i in range(len(self.__keys)):
+            key = self.__keys[i]
+            while j < len(other.__keys) and other.__keys[j] < key:
+                j += 1
+            if j < len(other.__keys) and other.__keys[j] == key:
+                container = self.__containers[i].difference(other.__containers[j])
+            else:
+                container = self.__copy(self.__containers[i])
+            if container is not None:
+                keys.append(key)
+                containers.append(container)
+        res = RoaringBitmapSet()
+        res.__build(keys, containers)
+        return res
+
+    @staticmethod
+    def __copy(container: _ArrayContainer | _BitmapContainer) -> _ArrayContainer | _BitmapContainer:
+        """
+        A copy of a container, so that later changes to either set do not affect the other.
+        :complexity: O(N) for an array container, O(CHUNK_SIZE / 64) for a bitmap.
+        """
+        if isinstance(container, _BitmapContainer):
+            return _BitmapContainer(container.mask(), len(container))
+        values = ArrayList(len(container))
+        for low in container:
+            values.append(low)
+        return _ArrayContainer(values)
+
+    def serialise(self) -> bytes:
+        """
+        Compact binary form of the set, read back by deserialise. All integers are little-endian:
+            - the number of chunks, 4 bytes,
+            - for each chunk in increasing order: its key (KEY_BYTES = 4 bytes), its kind (1 byte, 0 for an array,
+              1 for a bitmap), then either the number of members less one (2 bytes) followed
+              by each low (2 bytes), or the BITMAP_BYTES bytes of the mask.
+        :complexity: O(N + C * CHUNK_SIZE / 64) where N is the number of elements.
+        """
+        data = bytearray(len(self.__keys).to_bytes(4, 'little'))
+        for i in range(len(self.__keys)):
+            container = self.__containers[i]
+            data += self.__keys[i].to_bytes(KEY_BYTES, 'little')
+            data.append(_BITMAP_KIND if isinstance(container, _BitmapContainer) else _ARRAY_KIND)
+            container.serialise(data)
+        return bytes(data)
+
+    @classmethod
+    def deserialise(cls, data: bytes) -> RoaringBitmapSet:
+        """
+        Rebuilds a set from the output of serialise.
+        :raises ValueError: if data is not a serialised set.
+        :complexity: O(N + C * CHUNK_SIZE / 64) where N is the number of elements.
+        """
+        if len(data) < 4:
+            raise ValueError("Truncated bitmap set data.")
+        count = int.from_bytes(data[0:4], 'little')
+        keys = ArrayList(count + 1)
+        containers = ArrayList(count + 1)
+        offset = 4
+        for _ in range(count):
+            if offset + KEY_BYTES + 1 > len(data):
+                raise ValueError("Truncated bitmap set data.")
+            key = int.from_bytes(data[offset:offset + KEY_BYTES], 'little')
+            kind = data[offset + KEY_BYTES]
+            offset += KEY_BYTES + 1
+            if len(keys) > 0 and key <= keys[-1]:
+                raise ValueError("Bitmap set chunks are out of order.")
+            if kind == _BITMAP_KIND:
+                if offset + BITMAP_BYTES > len(data):
+                    raise ValueError("Truncated bitmap set data.")
+                container = _from_mask(int.from_bytes(data[offset:offset + BITMAP_BYTES], 'little'))
+                offset += BITMAP_BYTES
+            elif kind == _ARRAY_KIND:
+                if offset + 2 > len(data):
+                    raise ValueError("Truncated bitmap set data.")
+                cardinality = int.from_bytes(data[offset:offset + 2], 'little') + 1
+                offset += 2
+                if offset + 2 * cardinality > len(data):
+                    raise ValueError("Truncated bitmap set data.")
+                values = ArrayList(cardinality)
+                for k in range(cardinality):
+                    low = int.from_bytes(data[offset + 2 * k:offset + 2 * k + 2], 'little')
+                    if len(values) > 0 and low <= values[-1]:
+                        raise ValueError("Bitmap set members are out of order.")
+                    values.append(low)
+                offset += 2 * cardinality
+                container = _ArrayContainer(values)
+                if cardinality > ARRAY_MAX:
+                    container = _from_mask(container.mask())
+            else:
+                raise ValueError(f"Unknown bitmap set container kind: {kind}")
+            if container is None:
+                raise ValueError("Empty bitmap set chunk.")
+            keys.append(key)
+            containers.append(container)
+        if offset != len(data):
+            raise ValueError("Trailing bytes after bitmap set data.")
+        res = cls()
+        res.__build(keys, containers)
+        return res
+
+    def __str__(self) -> str:
+        """ Construct a nice string representation. """
+        return '{' + ', '.join(str(item) for item in self) + '}'
@@ -0,0 +1,295 @@
+from __future__ import annotations
+from typing import Iterator
+from data_structures.abstract_set import Set, T
+from data_structures.referential_array import ArrayR
+
+
+def _gallop(array: ArrayR[T], length: int, item: T, start: int) -> int:
+    """
+    Galloping (exponential) search: the first position at or after start whose item is not less than item,
+    length if there is none. Probes start, start + 1, start + 2, start + 4, ... then binary searches the last gap.
+    :complexity: O(log D) where D is the distance from start to the result.
+    """
+    low = start
+    step = 1
+    high = start
+    while high < length and array[high] < item:
+        low = high + 1
+        high = start + step
+        step *= 2
+    high = min(high, length)
+    while low < high:
+        mid = (low + high) // 2
+        if array[mid] < item:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class SortedArraySet(Set[T]):
+    """
+    Sorted array implementation of the set ADT, for read-mostly sets of comparable elements.
+    The elements are kept in increasing order in a single array, as compact as an
+    ArraySet but growing as needed: membership is a binary search, and union,
+    intersection and difference are linear merges.
+
+    When one operand is more than GALLOP_RATIO times larger than the other, intersection
+    and difference gallop through the larger one instead, for each element of the smaller
+    one, so skewed sizes cost O(m log(n / m)) rather than O(n + m).
+    Other kinds of Set are accepted too, through their values and membership tests.
+    """
+
+    GALLOP_RATIO = 8
+
+    def __init__(self, initial_capacity: int = 1) -> None:
+        if initial_capacity < 0:
+            raise ValueError("Capacity cannot be negative.")
+
+        Set.__init__(self)
+        self.__length = 0
+        self.__array = ArrayR(max(initial_capacity, 1))
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return self.__length
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return self.__length == 0
+
+    def clear(self) -> None:
+        """ Makes the set empty. """
+        self.__length = 0
+
+    def __index(self, item: T) -> int:
+        """
+        Position of item, or where it should be inserted if it is missing.
+        :complexity: O(log N * comp) where N is the number of elements.
+        """
+        low = 0
+        high = self.__length
+        while low < high:
+            mid = (low + high) // 2
+            if self.__array[mid] < item:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __contains__(self, item: T) -> bool:
+        """
+        True if the set contains the item, by binary search.
+        :complexity: O(log N * comp) where N is the number of elements.
+        """
+        index = self.__index(item)
+        return index < self.__length and self.__array[index] == item
+
+    def __resize(self, capacity: int) -> None:
+        """
+        Moves the elements into an array of the given capacity.
+        :complexity: O(N) where N is the number of elements.
+        """
+        new_array = ArrayR(capacity)
+        for i in range(self.__length):
+            new_array[i] = self.__array[i]
+        self.__array = new_array
+
+    def add(self, item: T) -> None:
+        """
+        Adds an element to the set, if it is not already there, shuffling the larger elements right.
+        :complexity best: O(log N * comp) the item is already there or is the largest.
+        :complexity worst: O(N) the item is the smallest, or the array has to grow.
+        """
+        index = self.__index(item)
+        if index < self.__length and self.__array[index] == item:
+            return
+        if self.__length == len(self.__array):
+            self.__resize(2 * len(self.__array) + 1)
+        for i in range(self.__length, index, -1):
+            self.__array[i] = self.__array[i - 1]
+        self.__array[index] = item
+        self.__length += 1
+
+    def remove(self, item: T) -> None:
+        """
+        Removes an element from the set, shuffling the larger elements left.
+        :raises KeyError: if no such element is found.
+        :complexity: O(N) where N is the number of elements.
+        """
+        index = self.__index(item)
+        if index == self.__length or self.__array[index] != item:
+            raise KeyError(item)
+        for i in range(index, self.__length - 1):
+            self.__array[i] = self.__array[i + 1]
+        self.__length -= 1
+        self.__array[self.__length] = None
+
+    def values(self) -> ArrayR[T]:
+        """
+        Returns the elements of the set as an array, in increasing order.
+        :complexity: O(N) where N is the number of elements.
+        """
+        res = ArrayR(self.__length)
+        for i in range(self.__length):
+            res[i] = self.__array[i]
+        return res
+
+    def __iter__(self) -> Iterator[T]:
+        """ Yields the elements in increasing order. """
+        for i in range(self.__length):
+            yield self.__array[i]
+
+    def __getitem__(self, index: int) -> T:
+        """
+        The element at index in increasing order.
+        :raises IndexError: if the index is out of bounds.
+        """
+        if index < -self.__length or index >= self.__length:
+            raise IndexError('Out of bounds access in set.')
+        if index < 0:
+            index += self.__length
+        return self.__array[index]
+
+    def __append(self, item: T) -> None:
+        """ Adds an item larger than every element, to a set sized for it. """
+        self.__array[self.__length] = item
+        self.__length += 1
+
+    def union(self, other: Set[T]) -> SortedArraySet[T]:
+        """
+        Creates a new set equal to the union of this set and the other one, by merging them.
+        :complexity: O(N + M) where N and M are the sizes of the two sets,
+            O(M * (N + M)) if the other one is not a SortedArraySet, its elements being added one by one.
+        """
+        if not isinstance(other, SortedArraySet):
+            res = SortedArraySet(self.__length + len(other))
+            for i in range(self.__length):
+                res.__append(self.__array[i])
+            for item in other.values():
+                res.add(item)
+            return res
+
+        res = SortedArraySet(self.__length + other.__length)
+        i = j = 0
+        while i < self.__length and j < other.__length:
+            if self.__array[i] < other.__array[j]:
+                res.__append(self.__array[i])
+                i += 1
+            elif other.__array[j] < self.__array[i]:
+                res.__append(other.__array[j])
+                j += 1
+            else:
+                res.__append(self.__array[i])
+                i += 1
+                j += 1
+        for k in range(i, self.__length):
+            res.__append(self.__array[k])
+        for k in range(j, other.__length):
+            res.__append(other.__array[k])
+        return res
+
+    def __is_skewed(self, other: SortedArraySet[T]) -> bool:
+        """ True if one set is more than GALLOP_RATIO times larger than the other. """
+        return (self.__length > self.GALLOP_RATIO * other.__length or
+                other.__length > self.GALLOP_RATIO * self.__length)
+
+    def intersection(self, other: Set[T]) -> SortedArraySet[T]:
+        """
+        The intersection of this set with the other one.
+        :complexity: O(N + M) by merging, or O(m log(n / m)) by galloping through the
+            larger set (of size n) for each element of the smaller one (of size m) when skewed.
+            O(N * contains(other)) if the other set is not a SortedArraySet.
+        """
+        if not isinstance(other, SortedArraySet):
+            return self.__filter(other, True)
+
+        res = SortedArraySet(min(self.__length, other.__length))
+        if self.__is_skewed(other):
+            small, large = (self, other) if self.__length < other.__length else (other, self)
+            j = 0
+            for i in range(small.__length):
+                item = small.__array[i]
+                j = _gallop(large.__array, large.__length, item, j)
+                if j == large.__length:
+                    break
+                if large.__array[j] == item:
+                    res.__append(item)
+            return res
+
+        i = j = 0
+        while i < self.__length and j < other.__length:
+            if self.__array[i] < other.__array[j]:
+                i += 1
+            elif other.__array[j] < self.__array[i]:
+                j += 1
+            else:
+                res.__append(self.__array[i])
+                i += 1
+                j += 1
+        return res
+
+    def difference(self, other: Set[T]) -> SortedArraySet[T]:
+        """
+        Creates the result of self - other.
+        :complexity: O(N + M) by merging. When this set is much smaller, it gallops through
+            the other one instead, O(n log(m / n)); when the other set is much smaller, the
+            runs of this set between its elements are found by galloping and copied, O(n + m log(n / m)).
+            O(N * contains(other)) if the other set is not a SortedArraySet.
+        """
+        if not isinstance(other, SortedArraySet):
+            return self.__filter(other, False)
+
+        res = SortedArraySet(self.__length)
+        if self.__is_skewed(other) and self.__length < other.__length:
+            j = 0
+            for i in range(self.__length):
+                item = self.__array[i]
+                j = _gallop(other.__array, other.__length, item, j)
+                if j == other.__length or other.__array[j] != item:
+                    res.__append(item)
+            return res
+
+        if self.__is_skewed(other):
+            i = 0
+            for j in range(other.__length):
+                item = other.__array[j]
+                found = _gallop(self.__array, self.__length, item, i)
+                for k in range(i, found):
+                    res.__append(self.__array[k])
+                i = found
+                if i < self.__length and self.__array[i] == item:
+                    i += 1
+            for k in range(i, self.__length):
+                res.__append(self.__array[k])
+            return res
+
+        i = j = 0
+        while i < self.__length:
+            if j == other.__length or self.__array[i] < other.__array[j]:
+                res.__append(self.__array[i])
+                i += 1
+            elif other.__array[j] < self.__array[i]:
+                j += 1
+            else:
+                i += 1
+                j += 1
+        return res
+
+    def __filter(self, other: Set[T], keep_common: bool) -> SortedArraySet[T]:
+        """
+        The elements of this set that are in the other set (keep_common) or not in it, in order.
+        :complexity: O(N * contains(other)) where N is the size of this set.
+        """
+        res = SortedArraySet(self.__length)
+        for i in range(self.__length):
+            if (self.__array[i] in other) == keep_common:
+                res.__append(self.__array[i])
+        return res
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set. """
+        elems = []
+        for i in range(self.__length):
+            elems.append(str(self.__array[i]) if type(self.__array[i]) != str else f"'{self.__array[i]}'")
+        return '{' + ', '.join(elems) + '}'
@@ -0,0 +1,456 @@
+from __future__ import annotations
+
+import random
+import threading
+from unittest import TestCase
+
+from data_structures import (CuckooTable, HashTableSeparateChaining, LRUCache, LinearProbeTable, RobinHoodTable,
+                             ShardedHashTable, StaticHashTable)
+from data_structures import hash_table as legacy
+from data_structures.abstract_hash_table import HashTable
+from data_structures.hash_functions import HASH_MODULUS, builtin_hash, integer_hash, polynomial_string_hash, tuple_hash
+from data_structures.hash_table_sizes import next_table_size, previous_table_size
+from data_structures.lru_cache import lru_cache
+
+
+def run_random_operations(test: TestCase, table: HashTable, operations: int = 4000, key_range: int = 400,
+                          seed: int = 0, make_key=lambda i: f"k{i}") -> None:
+    """
+    Applies random sets, deletes and lookups to the table and to a dict, checking they always agree.
+    """
+    rng = random.Random(seed)
+    expected = {}
+    for i in range(operations):
+        key = make_key(rng.randrange(key_range))
+        choice = rng.random()
+        if choice < 0.5:
+            table[key] = i
+            expected[key] = i
+        elif choice < 0.8:
+            if key in expected:
+                del table[key]
+                del expected[key]
+            else:
+                with test.assertRaises(KeyError):
+                    del table[key]
+        else:
+            test.assertEqual(key in table, key in expected, f"Membership of {key} differs")
+            if key in expected:
+                test.assertEqual(table[key], expected[key])
+            else:
+                with test.assertRaises(KeyError):
+                    table[key]
+        test.assertEqual(len(table), len(expected))
+
+    test.assertEqual(sorted(table.keys()), sorted(expected))
+    test.assertEqual(sorted(table.values()), sorted(expected.values()))
+    test.assertEqual(dict(table.items()), expected)
+
+
+class TestHashTablesSetup(TestCase):
+    def setUp(self) -> None:
+        """
+        #name(Test Hash Tables Setup)
+        #score(0)
+        """
+        pass
+
+
+class TestSeparateChaining(TestHashTablesSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test separate chaining, growing and shrinking, against a dict)
+        #score(1)
+        """
+        run_random_operations(self, HashTableSeparateChaining())
+        run_random_operations(self, HashTableSeparateChaining(min_load_factor=0.2))
+
+    def test_resizing(self) -> None:
+        """
+        #name(Test separate chaining grows by load factor and shrinks back one size at a time)
+        #score(1)
+        """
+        table = HashTableSeparateChaining(sizes=(17, 37), min_load_factor=0.2)
+        for i in range(400):
+            table[str(i)] = i
+        self.assertLessEqual(table.load_factor, 1.0)
+        sizes = [table.table_size]
+        for i in range(400):
+            del table[str(i)]
+            if table.table_size != sizes[-1]:
+                sizes.append(table.table_size)
+        self.assertEqual(sizes, [673, 331, 163, 79, 37, 17])
+
+    def test_treeified_buckets(self) -> None:
+        """
+        #name(Test buckets of colliding keys become trees and still agree with a dict)
+        #score(1)
+        """
+        run_random_operations(self, HashTableSeparateChaining(hash_function=len))
+
+    def test_treeified_buckets_with_unorderable_keys(self) -> None:
+        """
+        #name(Test long chains of keys that cannot be compared stay intact)
+        #score(1)
+        """
+        table = HashTableSeparateChaining(hash_function=lambda key: 0)
+        keys = list(range(19)) + [str(i) for i in range(19)]
+        for key in keys:
+            table[key] = key
+        for key in keys:
+            table[key] = (key, 1)
+        self.assertEqual(len(table), len(keys))
+        self.assertEqual(len(list(table.items())), len(keys))
+        for key in keys:
+            self.assertEqual(table[key], (key, 1))
+
+    def test_set_many(self) -> None:
+        """
+        #name(Test separate chaining set_many only grows for new keys)
+        #score(1)
+        """
+        table = HashTableSeparateChaining()
+        for i in range(10):
+            table[str(i)] = i
+        table.set_many([(str(i % 10), -i) for i in range(50)])
+        self.assertEqual(table.table_size, 17)
+        self.assertEqual(dict(table.items()), {str(i): -40 - i for i in range(10)})
+
+        iterator = table.items()
+        next(iterator)
+        table.set_many([(str(i), i) for i in range(5, 40)])
+        with self.assertRaises(RuntimeError):
+            list(iterator)
+        self.assertEqual(len(table), 40)
+
+
+class TestLinearProbeTable(TestHashTablesSetup):
+    def test_tombstone_deletion(self) -> None:
+        """
+        #name(Test tombstone deletion against a dict)
+        #score(1)
+        """
+        run_random_operations(self, LinearProbeTable(deletion=LinearProbeTable.DELETE_TOMBSTONE))
+
+    def test_parallel_layout(self) -> None:
+        """
+        #name(Test the parallel array layout against a dict)
+        #score(1)
+        """
+        for deletion in (LinearProbeTable.DELETE_REINSERT, LinearProbeTable.DELETE_TOMBSTONE):
+            with self.subTest(deletion=deletion):
+                run_random_operations(self, LinearProbeTable(deletion=deletion,
+                                                             layout=LinearProbeTable.LAYOUT_PARALLEL))
+        with self.assertRaises(ValueError):
+            LinearProbeTable(layout='columns')
+
+    def test_growth_past_table_sizes(self) -> None:
+        """
+        #name(Test tables keep growing past the end of their size sequence)
+        #score(1)
+        """
+        table = LinearProbeTable(sizes=(5, 13))
+        for i in range(100):
+            table[str(i)] = i
+        self.assertGreater(table.table_size, 100)
+        self.assertEqual(sorted(table.values()), list(range(100)))
+
+        self.assertEqual(next_table_size(13, (5, 13)), 29)
+        self.assertEqual(previous_table_size(29, (5, 13)), 13)
+        self.assertIsNone(previous_table_size(5, (5, 13)))
+
+    def test_incremental_resizing(self) -> None:
+        """
+        #name(Test incremental resizing against a dict)
+        #score(1)
+        """
+        for deletion in (LinearProbeTable.DELETE_REINSERT, LinearProbeTable.DELETE_TOMBSTONE):
+            with self.subTest(deletion=deletion):
+                run_random_operations(self, LinearProbeTable(deletion=deletion, incremental=True))
+
+    def test_iteration_fails_fast(self) -> None:
+        """
+        #name(Test items() raises once keys are added or removed, but not on updates)
+        #score(1)
+        """
+        table = LinearProbeTable()
+        for i in range(10):
+            table[str(i)] = i
+        for key, _ in table.items():
+            table[key] = -1
+        self.assertEqual(set(table.values()), {-1})
+        for change in (lambda: table.__setitem__('new', 0), lambda: table.__delitem__('0')):
+            with self.assertRaises(RuntimeError):
+                for _ in table.items():
+                    change()
+
+    def test_batch_operations(self) -> None:
+        """
+        #name(Test get_many, set_many and delete_many against a dict)
+        #score(1)
+        """
+        for incremental in (False, True):
+            with self.subTest(incremental=incremental):
+                rng = random.Random(1)
+                table = LinearProbeTable(incremental=incremental)
+                expected = {}
+                for i in range(50):
+                    pairs = [(f"k{rng.randrange(300)}", i) for _ in range(rng.randrange(20))]
+                    table.set_many(pairs)
+                    expected.update(pairs)
+                    doomed = [f"k{rng.randrange(300)}" for _ in range(rng.randrange(10))]
+                    present = set(doomed) & set(expected)
+                    self.assertEqual(table.delete_many(doomed), len(present))
+                    for key in present:
+                        del expected[key]
+                    self.assertEqual(len(table), len(expected))
+
+                keys = [f"k{i}" for i in range(300)]
+                self.assertEqual(list(table.get_many(keys, -1)), [expected.get(key, -1) for key in keys])
+
+    def test_batch_operations_under_iteration(self) -> None:
+        """
+        #name(Test batch operations only break an iteration when they add, remove or move items)
+        #score(1)
+        """
+        def migrating_table() -> LinearProbeTable:
+            table = LinearProbeTable(sizes=(5, 13, 29), incremental=True)
+            for key in 'abc':
+                table[key] = 1
+            self.assertTrue(table.is_migrating)
+            return table
+
+        harmless = [lambda table: table.set_many([('a', -1)]), lambda table: table.delete_many(['zz'])]
+        for operation in harmless:
+            table = migrating_table()
+            for _ in table.items():
+                operation(table)
+
+        harmful = [lambda table: table.set_many([('q', -1)]), lambda table: table.delete_many(['b'])]
+        for operation in harmful:
+            table = migrating_table()
+            with self.assertRaises(RuntimeError):
+                for _ in table.items():
+                    operation(table)
+
+    MODES = [
+        {'probing': probing, 'deletion': deletion, 'layout': layout, 'incremental': incremental}
+        for probing in (LinearProbeTable.PROBE_LINEAR, LinearProbeTable.PROBE_QUADRATIC, LinearProbeTable.PROBE_DOUBLE)
+        for deletion in (LinearProbeTable.DELETE_REINSERT, LinearProbeTable.DELETE_TOMBSTONE)
+        for layout in (LinearProbeTable.LAYOUT_TUPLE, LinearProbeTable.LAYOUT_PARALLEL)
+        for incremental in (False, True)
+        if deletion == LinearProbeTable.DELETE_TOMBSTONE or probing == LinearProbeTable.PROBE_LINEAR
+    ]
+
+    def test_all_modes(self) -> None:
+        """
+        #name(Test every probing, deletion, layout and migration mode against a dict)
+        #score(1)
+        """
+        for mode in self.MODES:
+            with self.subTest(**mode):
+                run_random_operations(self, LinearProbeTable(**mode))
+
+    def test_invalid_probing(self) -> None:
+        """
+        #name(Test unknown probe sequences and DELETE_REINSERT without linear probing are rejected)
+        #score(1)
+        """
+        with self.assertRaises(ValueError):
+            LinearProbeTable(probing='cubic')
+        with self.assertRaises(ValueError):
+            LinearProbeTable(probing=LinearProbeTable.PROBE_DOUBLE, deletion=LinearProbeTable.DELETE_REINSERT)
+
+
+class TestLegacyLinearProbeTable(TestHashTablesSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test the hash_table module's table, with its cached hash codes, against a dict)
+        #score(1)
+        """
+        for deletion in (legacy.LinearProbeTable.DELETE_REINSERT, legacy.LinearProbeTable.DELETE_TOMBSTONE):
+            with self.subTest(deletion=deletion):
+                run_random_operations(self, legacy.LinearProbeTable(deletion=deletion))
+        self.assertEqual(legacy.LinearProbeTable().hash_code('miner'), polynomial_string_hash('miner'))
+
+
+class TestRobinHoodTable(TestHashTablesSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test Robin Hood hashing against a dict)
+        #score(1)
+        """
+        run_random_operations(self, RobinHoodTable())
+        run_random_operations(self, RobinHoodTable(max_load_factor=0.95), seed=1)
+
+
+class TestHashFunctions(TestHashTablesSetup):
+    def test_non_string_keys(self) -> None:
+        """
+        #name(Test tables with integer and tuple keys against a dict)
+        #score(1)
+        """
+        cases = [(integer_hash, lambda i: i * 64), (tuple_hash, lambda i: (i % 7, str(i))),
+                 (builtin_hash, lambda i: i + 0.5)]
+        for hash_function, make_key in cases:
+            with self.subTest(hash_function.__name__):
+                run_random_operations(self, LinearProbeTable(hash_function=hash_function), make_key=make_key)
+                run_random_operations(self, HashTableSeparateChaining(hash_function=hash_function),
+                                      make_key=make_key)
+
+
+class TestHashTableStats(TestHashTablesSetup):
+    def test_stats(self) -> None:
+        """
+        #name(Test stats() is a snapshot of the table and its probe counters)
+        #score(1)
+        """
+        for table in (LinearProbeTable(track_stats=True), HashTableSeparateChaining(track_stats=True)):
+            with self.subTest(type(table).__name__):
+                for i in range(100):
+                    table[str(i)] = i
+                table['0']
+                stats = table.stats()
+                self.assertEqual(stats.length, 100)
+                self.assertEqual(stats.table_size, table.table_size)
+                self.assertEqual(stats.get_probes.operations, 1)
+                self.assertEqual(stats.set_probes.operations, 100)
+                self.assertGreaterEqual(stats.max_probe_length, 1)
+                table['1']
+                del table['2']
+                self.assertEqual(stats.get_probes.operations, 1)
+                self.assertEqual(stats.delete_probes.operations, 0)
+                self.assertIsNone(type(table)().stats().get_probes)
+
+
+class TestCuckooTable(TestHashTablesSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test cuckoo hashing with 2 and 3 ways against a dict)
+        #score(1)
+        """
+        run_random_operations(self, CuckooTable())
+        run_random_operations(self, CuckooTable(ways=3, max_load_factor=0.85))
+        with self.assertRaises(ValueError):
+            CuckooTable(ways=1)
+
+
+class TestShardedHashTable(TestHashTablesSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test the sharded table against a dict)
+        #score(1)
+        """
+        run_random_operations(self, ShardedHashTable())
+        run_random_operations(self, ShardedHashTable(shard_count=3, table_factory=RobinHoodTable))
+
+    def test_concurrent_updates(self) -> None:
+        """
+        #name(Test update is atomic across threads)
+        #score(1)
+        """
+        table = ShardedHashTable(shard_count=4)
+
+        def work() -> None:
+            for i in range(1000):
+                table.update(f"k{i % 10}", lambda count: count + 1, 0)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(dict(table.items()), {f"k{i}": 400 for i in range(10)})
+        self.assertEqual(table.get_or_insert('k0', -1), 400)
+        self.assertEqual(table.get_or_insert('new', -1), -1)
+
+
+class TestLRUCache(TestHashTablesSetup):
+    def test_eviction_order(self) -> None:
+        """
+        #name(Test LRUCache evicts the least recently used entry)
+        #score(1)
+        """
+        cache = LRUCache(max_entries=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a']
+        cache['c'] = 3
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_byte_limit(self) -> None:
+        """
+        #name(Test LRUCache keeps within max_bytes and skips values too large to cache)
+        #score(1)
+        """
+        cache = LRUCache(max_bytes=1000)
+        for i in range(100):
+            cache[i] = 'x' * 50
+        self.assertLessEqual(cache.bytes, 1000)
+        self.assertIn(99, cache)
+        cache['big'] = 'y' * 5000
+        self.assertNotIn('big', cache)
+        self.assertLessEqual(cache.bytes, 1000)
+
+    def test_decorator_keyword_arguments(self) -> None:
+        """
+        #name(Test lru_cache keeps positional tuples apart from keyword arguments)
+        #score(1)
+        """
+        @lru_cache(max_entries=10)
+        def arguments(*args, **kwargs):
+            return args, kwargs
+
+        self.assertEqual(arguments(('x', 1)), ((('x', 1),), {}))
+        self.assertEqual(arguments(x=1), ((), {'x': 1}))
+        self.assertEqual(arguments(('x', 1)), ((('x', 1),), {}))
+        self.assertEqual(len(arguments.cache), 2)
+
+
+class TestStaticHashTable(TestHashTablesSetup):
+    def test_lookups(self) -> None:
+        """
+        #name(Test StaticHashTable lookups and that it is read-only)
+        #score(1)
+        """
+        for count in (0, 1, 2, 7, 100, 1000):
+            with self.subTest(count=count):
+                pairs = [(f"k{i}", i) for i in range(count)]
+                table = StaticHashTable(pairs)
+                self.assertEqual(len(table), count)
+                self.assertEqual(dict(table.items()), dict(pairs))
+                self.assertNotIn('missing', table)
+                with self.assertRaises(KeyError):
+                    table['missing']
+        with self.assertRaises(TypeError):
+            table['k0'] = 1
+        with self.assertRaises(TypeError):
+            del table['k0']
+
+    def test_congruent_codes(self) -> None:
+        """
+        #name(Test StaticHashTable rejects keys with the same hash code modulo HASH_MODULUS)
+        #score(1)
+        """
+        with self.assertRaises(ValueError):
+            StaticHashTable([(1, 'a'), (1 + HASH_MODULUS, 'b')], hash_function=lambda key: key)
+
+    def test_freeze(self) -> None:
+        """
+        #name(Test freezing each table keeps its hash function and items)
+        #score(1)
+        """
+        factories = [LinearProbeTable, RobinHoodTable, CuckooTable, HashTableSeparateChaining, ShardedHashTable]
+        for factory in factories:
+            with self.subTest(factory.__name__):
+                table = factory(hash_function=integer_hash)
+                for i in range(200):
+                    table[i * 7] = i
+                frozen = table.freeze()
+                self.assertIs(frozen.hash_function, integer_hash)
+                self.assertEqual(dict(frozen.items()), dict(table.items()))
+                self.assertIs(frozen.freeze(), frozen)
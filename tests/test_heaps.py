@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import heapq
+import random
+from unittest import TestCase
+
+from data_structures import ArrayR, IndexedPriorityQueue, MaxHeap
+
+
+def check_against_heapq(test: TestCase, heap: MaxHeap, key=lambda item: item, min_heap: bool = False) -> None:
+    """
+    Applies random adds and get_max calls to the heap and to a heapq list, checking they agree.
+    Elements are compared by key, as equal keys may come out in any order.
+    """
+    rng = random.Random(0)
+    sign = 1 if min_heap else -1
+    expected = []
+    for _ in range(3000):
+        if rng.random() < 0.55 or not expected:
+            item = rng.randrange(1000)
+            heap.add(item)
+            heapq.heappush(expected, sign * key(item))
+        else:
+            test.assertEqual(sign * key(heap.get_max()), heapq.heappop(expected))
+        test.assertEqual(len(heap), len(expected))
+    while expected:
+        test.assertEqual(sign * key(heap.get_max()), heapq.heappop(expected))
+
+
+class TestHeapsSetup(TestCase):
+    def setUp(self) -> None:
+        """
+        #name(Test Heaps Setup)
+        #score(0)
+        """
+        pass
+
+
+class TestMaxHeap(TestHeapsSetup):
+    def test_fixed_capacity(self) -> None:
+        """
+        #name(Test a fixed capacity heap fills up and empties in order)
+        #score(1)
+        """
+        heap = MaxHeap(3)
+        for item in (2, 9, 4):
+            heap.add(item)
+        self.assertTrue(heap.is_full())
+        with self.assertRaises(IndexError):
+            heap.add(1)
+        self.assertEqual([heap.get_max() for _ in range(3)], [9, 4, 2])
+        with self.assertRaises(IndexError):
+            heap.get_max()
+
+    def test_growable(self) -> None:
+        """
+        #name(Test growable and shrinking heaps against heapq)
+        #score(1)
+        """
+        check_against_heapq(self, MaxHeap())
+        heap = MaxHeap(shrink=True)
+        check_against_heapq(self, heap)
+        self.assertEqual(heap.capacity, heap.min_capacity)
+
+    def test_heapify(self) -> None:
+        """
+        #name(Test heapify builds a growable heap, or a fixed one of overwrite_size)
+        #score(1)
+        """
+        items = [5, 3, 17, 10, 84, 19, 6, 22, 9]
+        points = ArrayR(len(items))
+        for i, item in enumerate(items):
+            points[i] = item
+
+        heap = MaxHeap.heapify(points)
+        self.assertEqual(heap.capacity, len(items))
+        heap.add(1)
+        self.assertEqual([heap.get_max() for _ in range(len(items) + 1)], sorted(items + [1], reverse=True))
+
+        heap = MaxHeap.heapify(points, overwrite_size=len(items))
+        self.assertTrue(heap.is_full())
+
+    def test_key_and_min_heap(self) -> None:
+        """
+        #name(Test keyed and min heaps against heapq)
+        #score(1)
+        """
+        check_against_heapq(self, MaxHeap(min_heap=True), min_heap=True)
+        check_against_heapq(self, MaxHeap(key=lambda item: -item), key=lambda item: -item)
+        check_against_heapq(self, MaxHeap(key=lambda item: item % 7, min_heap=True, shrink=True),
+                            key=lambda item: item % 7, min_heap=True)
+
+        items = [5, 3, 17, 10, 84, 19, 6, 22, 9]
+        points = ArrayR(len(items))
+        for i, item in enumerate(items):
+            points[i] = item
+        heap = MaxHeap.heapify(points, min_heap=True)
+        self.assertEqual([heap.get_max() for _ in range(len(items))], sorted(items))
+        heap = MaxHeap.heapify(points, key=lambda item: -item)
+        self.assertEqual([heap.get_max() for _ in range(len(items))], sorted(items))
+
+
+class TestIndexedPriorityQueue(TestHeapsSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test add, update, remove and pop against a dict of priorities)
+        #score(1)
+        """
+        for min_heap in (False, True):
+            with self.subTest(min_heap=min_heap):
+                rng = random.Random(1)
+                queue = IndexedPriorityQueue(min_heap=min_heap)
+                expected = {}
+                for _ in range(3000):
+                    item = f"v{rng.randrange(200)}"
+                    priority = rng.randrange(100)
+                    choice = rng.random()
+                    if choice < 0.4:
+                        queue.add_or_update(item, priority)
+                        expected[item] = priority
+                    elif choice < 0.6:
+                        if item in expected:
+                            self.assertEqual(queue.remove(item), expected.pop(item))
+                        else:
+                            with self.assertRaises(KeyError):
+                                queue.remove(item)
+                    elif choice < 0.8 and expected:
+                        best = (min if min_heap else max)(expected.values())
+                        popped, popped_priority = queue.pop()
+                        self.assertEqual(popped_priority, best)
+                        self.assertEqual(expected.pop(popped), best)
+                    else:
+                        self.assertEqual(item in queue, item in expected)
+                        if item in expected:
+                            self.assertEqual(queue.priority(item), expected[item])
+                    self.assertEqual(len(queue), len(expected))
+
+    def test_errors(self) -> None:
+        """
+        #name(Test duplicate adds, unknown items and empty queues raise)
+        #score(1)
+        """
+        queue = IndexedPriorityQueue()
+        with self.assertRaises(IndexError):
+            queue.peek()
+        with self.assertRaises(IndexError):
+            queue.pop()
+        queue.add('a', 1)
+        with self.assertRaises(ValueError):
+            queue.add('a', 2)
+        with self.assertRaises(KeyError):
+            queue.update_priority('b', 2)
+        queue.update_priority('a', 5)
+        self.assertEqual(queue.peek(), ('a', 5))
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import random
+from unittest import TestCase
+
+from data_structures import ArrayR, BitVectorSet, HashSet, RoaringBitmapSet, SortedArraySet
+from data_structures.abstract_set import Set
+from data_structures.roaring_bitmap_set import MAX_ID
+
+
+def make_set(factory, items) -> Set:
+    res = factory()
+    for item in items:
+        res.add(item)
+    return res
+
+
+def run_random_operations(test: TestCase, factory, largest: int = 200000, seed: int = 0) -> None:
+    """
+    Applies random adds, removes and membership tests to a new set and to a builtin set,
+    checking they always agree, mostly on small elements and sometimes on large ones.
+    """
+    rng = random.Random(seed)
+    res = factory()
+    expected = set()
+    for _ in range(3000):
+        item = rng.randint(1, 300) if rng.random() < 0.9 else rng.randint(1, largest)
+        if rng.random() < 0.6:
+            res.add(item)
+            expected.add(item)
+        elif item in expected:
+            res.remove(item)
+            expected.remove(item)
+        else:
+            with test.assertRaises(KeyError):
+                res.remove(item)
+        test.assertEqual(len(res), len(expected))
+        test.assertEqual(item in res, item in expected)
+    test.assertEqual(sorted(res), sorted(expected))
+    test.assertEqual(sorted(res.values()), sorted(expected))
+    res.clear()
+    test.assertTrue(res.is_empty())
+
+
+def check_set_algebra(test: TestCase, factory, other_factory=None, seed: int = 1) -> None:
+    """
+    Checks union, intersection and difference against builtin sets, including very skewed sizes.
+    """
+    other_factory = other_factory or factory
+    rng = random.Random(seed)
+    for _ in range(50):
+        largest = rng.choice([100, 5000, 300000])
+        first = {rng.randint(1, largest) for _ in range(rng.randrange(200))}
+        if rng.random() < 0.5:
+            second = {rng.randint(1, largest) for _ in range(rng.randrange(200))}
+        else:
+            second = set(list(first)[:3])
+        a, b = make_set(factory, first), make_set(other_factory, second)
+        test.assertEqual(sorted(a.union(b)), sorted(first | second))
+        test.assertEqual(sorted(a.intersection(b)), sorted(first & second))
+        test.assertEqual(sorted(a.difference(b)), sorted(first - second))
+
+
+class TestSetsSetup(TestCase):
+    def setUp(self) -> None:
+        """
+        #name(Test Sets Setup)
+        #score(0)
+        """
+        pass
+
+
+class TestBitVectorSet(TestSetsSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test BitVectorSet against a set, across many iteration chunks)
+        #score(1)
+        """
+        run_random_operations(self, BitVectorSet)
+        check_set_algebra(self, BitVectorSet)
+        res = make_set(BitVectorSet, [1, 1023, 1024, 1025, 5000])
+        self.assertEqual(list(res), [1, 1023, 1024, 1025, 5000])
+
+    def test_base(self) -> None:
+        """
+        #name(Test BitVectorSet bases, and combining sets with different bases)
+        #score(1)
+        """
+        run_random_operations(self, lambda: BitVectorSet(0))
+        negative = make_set(lambda: BitVectorSet(-5), [-5, 0, 3])
+        with self.assertRaises(TypeError):
+            negative.add(-6)
+        with self.assertRaises(TypeError):
+            BitVectorSet().add(0)
+        default = make_set(BitVectorSet, [1, 3, 70])
+        self.assertEqual(list(negative.union(default)), [-5, 0, 1, 3, 70])
+        self.assertEqual(list(default.union(negative)), [-5, 0, 1, 3, 70])
+        self.assertEqual(list(negative.intersection(default)), [3])
+        self.assertEqual(list(default.difference(negative)), [1, 70])
+        self.assertEqual(list(default ^ negative), [-5, 0, 1, 70])
+
+    def test_in_place_operators(self) -> None:
+        """
+        #name(Test BitVectorSet in-place operators against a set)
+        #score(1)
+        """
+        rng = random.Random(2)
+        for _ in range(50):
+            first = {rng.randint(-50, 2000) for _ in range(rng.randrange(100))}
+            second = {rng.randint(0, 2000) for _ in range(rng.randrange(100))}
+            operations = [('|', first | second), ('&', first & second),
+                          ('-', first - second), ('^', first ^ second)]
+            for operation, expected in operations:
+                a = make_set(lambda: BitVectorSet(-50), first)
+                b = make_set(lambda: BitVectorSet(0), second)
+                if operation == '|':
+                    a |= b
+                elif operation == '&':
+                    a &= b
+                elif operation == '-':
+                    a -= b
+                else:
+                    a ^= b
+                self.assertEqual(list(a), sorted(expected), operation)
+
+    def test_add_all_rank_select(self) -> None:
+        """
+        #name(Test BitVectorSet add_all, rank and select)
+        #score(1)
+        """
+        items = [5, 1, 5000, 64, 1023, 1024, 1025, 3000]
+        array = ArrayR(len(items))
+        for i, item in enumerate(items):
+            array[i] = item
+        res = BitVectorSet()
+        res.add_all(array)
+        ordered = sorted(set(items))
+        self.assertEqual(list(res), ordered)
+        for index, item in enumerate(ordered):
+            self.assertEqual(res.select(index), item)
+            self.assertEqual(res.rank(item), index + 1)
+        self.assertEqual(res.rank(0), 0)
+        self.assertEqual(res.rank(10 ** 12), len(ordered))
+        with self.assertRaises(IndexError):
+            res.select(len(ordered))
+
+        invalid = ArrayR(2)
+        invalid[0] = 7
+        invalid[1] = 0
+        with self.assertRaises(TypeError):
+            res.add_all(invalid)
+        self.assertNotIn(7, res)
+
+
+class TestRoaringBitmapSet(TestSetsSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test RoaringBitmapSet against a set)
+        #score(1)
+        """
+        run_random_operations(self, RoaringBitmapSet)
+        check_set_algebra(self, RoaringBitmapSet)
+
+    def test_rank_select(self) -> None:
+        """
+        #name(Test RoaringBitmapSet rank and select across array and bitmap containers)
+        #score(1)
+        """
+        rng = random.Random(3)
+        items = sorted({rng.randrange(1 << 20) for _ in range(3000)} | set(range(70000, 80000)))
+        res = make_set(RoaringBitmapSet, items)
+        for index in range(0, len(items), 97):
+            self.assertEqual(res.select(index), items[index])
+            self.assertEqual(res.rank(items[index]), index + 1)
+        with self.assertRaises(IndexError):
+            res.select(len(items))
+
+    def test_serialise(self) -> None:
+        """
+        #name(Test RoaringBitmapSet serialise round-trips, up to MAX_ID)
+        #score(1)
+        """
+        rng = random.Random(4)
+        items = {0, MAX_ID} | {rng.randrange(MAX_ID) for _ in range(500)} | set(range(1000, 6000))
+        res = make_set(RoaringBitmapSet, items)
+        copy = RoaringBitmapSet.deserialise(res.serialise())
+        self.assertEqual(list(copy), sorted(items))
+        self.assertEqual(len(copy), len(items))
+
+    def test_bounds(self) -> None:
+        """
+        #name(Test RoaringBitmapSet rejects ids it cannot store)
+        #score(1)
+        """
+        res = RoaringBitmapSet()
+        for item in (-1, MAX_ID + 1, 'a'):
+            with self.assertRaises(TypeError):
+                res.add(item)
+        self.assertTrue(res.is_empty())
+
+
+class TestHashSet(TestSetsSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test HashSet against a set, also combined with other kinds of Set)
+        #score(1)
+        """
+        run_random_operations(self, HashSet)
+        check_set_algebra(self, HashSet)
+        check_set_algebra(self, HashSet, BitVectorSet)
+
+
+class TestSortedArraySet(TestSetsSetup):
+    def test_random_operations(self) -> None:
+        """
+        #name(Test SortedArraySet against a set, merging and galloping)
+        #score(1)
+        """
+        run_random_operations(self, SortedArraySet)
+        check_set_algebra(self, SortedArraySet)
+        res = make_set(SortedArraySet, [5, 1, 3])
+        self.assertEqual([res[0], res[-1]], [1, 5])
+
+    def test_other_sets(self) -> None:
+        """
+        #name(Test SortedArraySet combined with other kinds of Set)
+        #score(1)
+        """
+        check_set_algebra(self, SortedArraySet, HashSet)
+        check_set_algebra(self, SortedArraySet, BitVectorSet)